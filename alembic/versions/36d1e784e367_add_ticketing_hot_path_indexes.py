@@ -0,0 +1,80 @@
+"""add ticketing hot path indexes
+
+Revision ID: 36d1e784e367
+Revises: 768f6ea0c73e
+Create Date: 2026-10-17 10:41:05.532917
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision: str = '36d1e784e367'
+down_revision: Union[str, Sequence[str], None] = '768f6ea0c73e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (nama index, tabel, kolom). Kolom pertama selalu FK / kolom filter utama,
+# jadi index implisit FK bawaan InnoDB otomatis di-drop (digantikan index ini).
+INDEXES = [
+    ('ix_orders_event_id_status', 'orders', ['event_id', 'status']),
+    ('ix_orders_buyer_user_id_created_at', 'orders', ['buyer_user_id', 'created_at']),
+    # Covering untuk hitung qty per order / per ticket type tanpa baca row
+    ('ix_order_items_order_id', 'order_items', ['order_id', 'ticket_type_id', 'qty']),
+    ('ix_checkins_ticket_id_scanned_at', 'checkins', ['ticket_id', 'scanned_at']),
+    ('ix_payments_payment_ref', 'payments', ['payment_ref']),
+    ('ix_events_organizer_id_visibility_start_at', 'events', ['organizer_id', 'visibility', 'start_at']),
+    ('ix_organizer_members_user_id_status', 'organizer_members', ['user_id', 'status']),
+]
+
+# Kolom FK yang butuh index pengganti saat downgrade (MySQL error 1553 kalau
+# index terakhir yang dipakai FK di-drop)
+FK_COLUMNS = {
+    'ix_orders_event_id_status': 'event_id',
+    'ix_orders_buyer_user_id_created_at': 'buyer_user_id',
+    'ix_order_items_order_id': 'order_id',
+    'ix_checkins_ticket_id_scanned_at': 'ticket_id',
+    'ix_events_organizer_id_visibility_start_at': 'organizer_id',
+    'ix_organizer_members_user_id_status': 'user_id',
+}
+
+
+def _is_mysql() -> bool:
+    return op.get_bind().dialect.name == 'mysql'
+
+
+def _create_index_online(name: str, table: str, columns: list[str]) -> None:
+    # Online DDL: tabel tetap bisa dibaca & ditulis selama index dibangun
+    if _is_mysql():
+        cols = ', '.join(f'`{c}`' for c in columns)
+        op.execute(
+            f'CREATE INDEX `{name}` ON `{table}` ({cols}) ALGORITHM=INPLACE LOCK=NONE'
+        )
+    else:
+        op.create_index(name, table, columns, unique=False)
+
+
+def _drop_index_online(name: str, table: str) -> None:
+    if _is_mysql():
+        op.execute(f'DROP INDEX `{name}` ON `{table}` ALGORITHM=INPLACE LOCK=NONE')
+    else:
+        op.drop_index(name, table_name=table)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in INDEXES:
+        _create_index_online(name, table, columns)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, columns in reversed(INDEXES):
+        fk_column = FK_COLUMNS.get(name)
+        if fk_column and _is_mysql():
+            _create_index_online(f'ix_{table}_{fk_column}_fk', table, [fk_column])
+        _drop_index_online(name, table)
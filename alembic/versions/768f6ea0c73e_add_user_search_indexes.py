@@ -0,0 +1,39 @@
+"""add user search indexes
+
+Revision ID: 768f6ea0c73e
+Revises: d9c7c0a89f88
+Create Date: 2026-10-17 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision: str = '768f6ea0c73e'
+down_revision: Union[str, Sequence[str], None] = 'd9c7c0a89f88'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Prefix search nama (email sudah punya index unik)
+    op.create_index('ix_users_full_name', 'users', ['full_name'], unique=False)
+    # Substring search: FULLTEXT dengan parser ngram
+    op.create_index(
+        'ft_users_search',
+        'users',
+        ['full_name', 'email'],
+        unique=False,
+        mysql_prefix='FULLTEXT',
+        mysql_with_parser='ngram',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ft_users_search', table_name='users')
+    op.drop_index('ix_users_full_name', table_name='users')
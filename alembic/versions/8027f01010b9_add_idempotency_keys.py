@@ -0,0 +1,42 @@
+"""add idempotency keys
+
+Revision ID: 8027f01010b9
+Revises: 8a80e387fffa
+Create Date: 2026-10-17 13:48:52.610733
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision: str = '8027f01010b9'
+down_revision: Union[str, Sequence[str], None] = '8a80e387fffa'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('idempotency_keys',
+    sa.Column('user_id', mysql.BIGINT(unsigned=True), nullable=False),
+    sa.Column('idem_key', mysql.VARCHAR(length=100), nullable=False),
+    sa.Column('request_hash', mysql.BINARY(length=32), nullable=False),
+    sa.Column('status', mysql.ENUM('PROCESSING', 'COMPLETED'), nullable=False),
+    sa.Column('response_status', mysql.SMALLINT(unsigned=True), nullable=True),
+    sa.Column('response_headers', mysql.JSON(), nullable=True),
+    sa.Column('response_body', mysql.MEDIUMBLOB(), nullable=True),
+    sa.Column('created_at', mysql.DATETIME(), nullable=False),
+    sa.Column('expires_at', mysql.DATETIME(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'idem_key')
+    )
+    op.create_index('ix_idempotency_keys_expires_at', 'idempotency_keys', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_idempotency_keys_expires_at', table_name='idempotency_keys')
+    op.drop_table('idempotency_keys')
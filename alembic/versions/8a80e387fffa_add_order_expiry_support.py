@@ -0,0 +1,71 @@
+"""add order expiry support
+
+Revision ID: 8a80e387fffa
+Revises: eb65bc5112dc
+Create Date: 2026-10-17 12:05:19.377240
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision: str = '8a80e387fffa'
+down_revision: Union[str, Sequence[str], None] = 'eb65bc5112dc'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _is_mysql() -> bool:
+    return op.get_bind().dialect.name == 'mysql'
+
+
+def _drop_index_online(name: str, table: str) -> None:
+    if _is_mysql():
+        op.execute(f'DROP INDEX `{name}` ON `{table}` ALGORITHM=INPLACE LOCK=NONE')
+    else:
+        op.drop_index(name, table_name=table)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Kolom nullable di akhir tabel: MySQL 8 pakai ALGORITHM=INSTANT
+    op.add_column(
+        'orders',
+        sa.Column('promo_code_id', mysql.BIGINT(unsigned=True), nullable=True)
+    )
+    if _is_mysql():
+        # ADD FOREIGN KEY hanya bisa INPLACE (tanpa COPY / lock tabel orders)
+        # kalau foreign_key_checks mati. Aman: kolom baru, semua nilainya NULL.
+        op.execute('SET foreign_key_checks = 0')
+        op.execute(
+            'ALTER TABLE `orders` ADD CONSTRAINT `fk_orders_promo_code_id` '
+            'FOREIGN KEY (`promo_code_id`) REFERENCES `promo_codes` (`id`), '
+            'ALGORITHM=INPLACE, LOCK=NONE'
+        )
+        op.execute('SET foreign_key_checks = 1')
+        # Sweeper order expired: WHERE status = 'pending' AND expires_at < now
+        op.execute(
+            'CREATE INDEX `ix_orders_status_expires_at` ON `orders` (`status`, `expires_at`) '
+            'ALGORITHM=INPLACE LOCK=NONE'
+        )
+    else:
+        op.create_foreign_key(
+            'fk_orders_promo_code_id', 'orders', 'promo_codes', ['promo_code_id'], ['id']
+        )
+        op.create_index('ix_orders_status_expires_at', 'orders', ['status', 'expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _drop_index_online('ix_orders_status_expires_at', 'orders')
+    if _is_mysql():
+        op.execute(
+            'ALTER TABLE `orders` DROP FOREIGN KEY `fk_orders_promo_code_id`, '
+            'ALGORITHM=INPLACE, LOCK=NONE'
+        )
+    else:
+        op.drop_constraint('fk_orders_promo_code_id', 'orders', type_='foreignkey')
+    op.drop_column('orders', 'promo_code_id')
@@ -0,0 +1,35 @@
+"""add ticket status index
+
+Revision ID: 8d4f0766e8db
+Revises: 8027f01010b9
+Create Date: 2026-10-17 15:20:33.184502
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision: str = '8d4f0766e8db'
+down_revision: Union[str, Sequence[str], None] = '8027f01010b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Refresh daftar revoke QR: WHERE status IN ('void', 'refunded')
+    if op.get_bind().dialect.name == 'mysql':
+        op.execute(
+            'CREATE INDEX `ix_tickets_status` ON `tickets` (`status`) '
+            'ALGORITHM=INPLACE LOCK=NONE'
+        )
+    else:
+        op.create_index('ix_tickets_status', 'tickets', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tickets_status', table_name='tickets')
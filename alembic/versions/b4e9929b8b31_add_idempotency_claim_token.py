@@ -0,0 +1,35 @@
+"""add idempotency claim token
+
+Revision ID: b4e9929b8b31
+Revises: 8d4f0766e8db
+Create Date: 2026-10-17 23:05:12.418207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4e9929b8b31'
+down_revision: Union[str, Sequence[str], None] = '8d4f0766e8db'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Klaim PROCESSING lama tidak punya token (pemiliknya tidak bisa simpan /
+    # lepas lagi): buang saja, paling lama berumur PROCESSING timeout.
+    # Row COMPLETED dapat nilai default implisit (0x00..), token tidak dipakai lagi.
+    op.execute("DELETE FROM idempotency_keys WHERE status = 'PROCESSING'")
+    op.add_column(
+        'idempotency_keys',
+        sa.Column('claim_token', mysql.BINARY(length=16), nullable=False)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('idempotency_keys', 'claim_token')
@@ -0,0 +1,41 @@
+"""add ticket type shards
+
+Revision ID: eb65bc5112dc
+Revises: 36d1e784e367
+Create Date: 2026-10-17 11:27:48.904116
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision: str = 'eb65bc5112dc'
+down_revision: Union[str, Sequence[str], None] = '36d1e784e367'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'ticket_types',
+        sa.Column('inventory_shards', mysql.INTEGER(), server_default='0', nullable=False)
+    )
+    op.create_table('ticket_type_shards',
+    sa.Column('ticket_type_id', mysql.BIGINT(unsigned=True), nullable=False),
+    sa.Column('shard_no', mysql.SMALLINT(unsigned=True), nullable=False),
+    sa.Column('quota', mysql.INTEGER(), nullable=False),
+    sa.Column('sold_count', mysql.INTEGER(), nullable=False),
+    sa.Column('updated_at', mysql.DATETIME(), nullable=False),
+    sa.ForeignKeyConstraint(['ticket_type_id'], ['ticket_types.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('ticket_type_id', 'shard_no')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('ticket_type_shards')
+    op.drop_column('ticket_types', 'inventory_shards')
@@ -7,17 +7,18 @@ from typing import Any
 from app.deps.db import get_db
 from app.core.config import settings
 from app.core.security import create_access_token
+from app.core.google_auth import google_verifier
 
 # --- Schemas ---
 # Pastikan di app/schemas/auth.py cuma butuh GoogleAuthIn & TokenOut
 from app.schemas.auth import GoogleAuthIn, TokenOut
 
-# --- Models ---
+# --- Models & Services ---
 from app.models.user import User, PlatformRole, UserStatus
+from app.services.user_service import UserService
 
-# --- Google Auth Lib ---
-from google.oauth2 import id_token
-from google.auth.transport import requests as google_requests
+# --- HTTP Client (fetch cert Google) ---
+import requests
 
 router = APIRouter()
 
@@ -63,12 +64,8 @@ async def auth_google(
     # B. Mode Production (Wajib Verify ke Server Google)
     else:
         try:
-            # Library Google akan validasi signature tokennya
-            id_info = id_token.verify_oauth2_token(
-                payload.id_token,
-                google_requests.Request(),
-                settings.GOOGLE_CLIENT_ID
-            )
+            # Validasi signature pakai cert Google yang di-cache per proses
+            id_info = await google_verifier.verify(payload.id_token)
             
             # Ambil data user dari token Google
             email = id_info["email"]
@@ -81,53 +78,40 @@ async def auth_google(
                 status_code=status.HTTP_401_UNAUTHORIZED, 
                 detail=f"Token Google Invalid: {str(e)}"
             )
+        except requests.RequestException:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Tidak dapat mengambil sertifikat Google, coba lagi nanti"
+            )
 
     # ---------------------------------------------------------
-    # 2. CEK USER DI DATABASE
+    # 2. CARI / BUAT USER (satu statement untuk user baru)
     # ---------------------------------------------------------
-    result = await db.execute(select(User).where(User.email == email))
-    user = result.scalar_one_or_none()
+    user = await UserService.upsert_google_user(
+        db,
+        email=email,
+        google_id=google_sub,
+        full_name=username,
+        avatar=avatar
+    )
 
-    if user:
-        # --- SKENARIO: USER LAMA (LOGIN) ---
-        
-        # Cek status takutnya user kena Banned
-        if user.user_status != UserStatus.ACTIVE:
-            raise HTTPException(403, "Akun anda telah dinonaktifkan.")
-        
-        # (Opsional) Update data user biar sinkron sama Google terbaru
-        # user.full_name = username 
-        # user.avatar = avatar
-        # await db.commit()
-        
-    else:
-        # --- SKENARIO: USER BARU (AUTO REGISTER) ---
-        user = User(
-            email=email,
-            full_name=username,
-            google_id=google_sub,
-            avatar=avatar,
-            role=PlatformRole.USER,       # Default jadi User biasa
-            user_status=UserStatus.ACTIVE # Default langsung aktif
-        )
-        
-        db.add(user)
-        await db.commit()
-        await db.refresh(user) # Refresh buat dapet ID baru
+    # Cek status takutnya user kena Banned
+    if user["user_status"] != UserStatus.ACTIVE:
+        raise HTTPException(403, "Akun anda telah dinonaktifkan.")
 
     # ---------------------------------------------------------
     # 3. GENERATE TOKEN APLIKASI (JWT)
     # ---------------------------------------------------------
     # Ini token yang dipakai frontend buat request API selanjutnya
     access_token = create_access_token(
-        sub=str(user.id),
-        extra={"role": user.role.value}
+        sub=str(user["id"]),
+        extra={"role": user["role"].value}
     )
 
     return {
         "access_token": access_token,
         "token_type": "bearer",
-        "user_id": user.id,
-        "full_name": user.full_name, # Pakai full_name karena di modelmu full_name
-        "platform_role": user.role
-    }
\ No newline at end of file
+        "user_id": user["id"],
+        "full_name": user["full_name"], # Pakai full_name karena di modelmu full_name
+        "platform_role": user["role"]
+    }
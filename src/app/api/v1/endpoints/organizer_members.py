@@ -1,9 +1,13 @@
 from typing import Annotated, List
-from fastapi import APIRouter, Depends, HTTPException, status, Path
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Path, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
-from app.deps.db import get_db
+from app.core.pagination import decode_cursor, paginate, set_next_cursor
+from app.db.session import replica_router, rw_key
+from app.deps.db import get_db, get_read_db
 from app.deps.auth import get_current_user
 from app.deps.organizer import (
     get_organizer_by_id,
@@ -55,29 +59,48 @@ async def invite_member(
 )
 async def get_organizer_members(
     organizer_id: int,
+    request: Request,
+    response: Response,
     _: Annotated[OrganizerMember, Depends(get_user_organizer_membership)],
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     skip: int = 0,
-    limit: int = 100
+    limit: Annotated[int, Query(ge=0)] = 100,
+    cursor: str | None = None,
+    stream: bool = False
 ):
     """
     Get semua member dari organizer.
     Semua member aktif bisa lihat daftar member.
+
+    - `cursor`: ambil dari header `X-Next-Cursor` response sebelumnya
+      (`skip` masih didukung untuk kompatibilitas)
+    - `stream=true`: kirim semua member sebagai NDJSON (satu baris per member)
     """
-    members = await OrganizerMemberService.get_organizer_members(
-        db, organizer_id, skip, limit
+    scope = f"organizer-members:{organizer_id}"
+    after = decode_cursor(scope, cursor) if cursor else None
+
+    if stream:
+        return StreamingResponse(
+            _stream_members_ndjson(replica_router.choose(rw_key(request)), organizer_id, after),
+            media_type="application/x-ndjson"
+        )
+
+    rows = await OrganizerMemberService.get_organizer_members_with_users(
+        db, organizer_id, skip, limit + 1, after
     )
-    
-    # Load user data untuk setiap member
-    result = []
-    for member in members:
-        user = await db.get(User, member.user_id)
-        member_dict = OrganizerMemberResponse.model_validate(member).model_dump()
-        member_dict['user_name'] = user.full_name if user else None
-        member_dict['user_email'] = user.email if user else None
-        result.append(member_dict)
-    
-    return result
+    rows, next_cursor = paginate(rows, limit, scope, lambda row: [row.user_id])
+    set_next_cursor(response, next_cursor)
+    return [row._asdict() for row in rows]
+
+
+async def _stream_members_ndjson(session_factory, organizer_id: int, after: list | None):
+    # Session sendiri, karena stream masih jalan setelah handler return
+    async with session_factory() as session:
+        result = await OrganizerMemberService.stream_organizer_members_with_users(
+            session, organizer_id, after
+        )
+        async for row in result:
+            yield orjson.dumps(row._asdict()) + b"\n"
 
 
 @router.get(
@@ -92,19 +115,14 @@ async def get_member_detail(
     db: Annotated[AsyncSession, Depends(get_db)]
 ):
     """Get detail member tertentu"""
-    member = await OrganizerMemberService.get_member(db, organizer_id, user_id)
+    member = await OrganizerMemberService.get_member_with_user(db, organizer_id, user_id)
     if not member:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Member tidak ditemukan"
         )
     
-    user = await db.get(User, user_id)
-    member_dict = OrganizerMemberResponse.model_validate(member).model_dump()
-    member_dict['user_name'] = user.full_name if user else None
-    member_dict['user_email'] = user.email if user else None
-    
-    return member_dict
+    return member._asdict()
 
 
 @router.patch(
@@ -1,8 +1,10 @@
 from typing import Annotated, List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.deps.db import get_db
+from app.core.http_cache import is_not_modified, validator_headers
+from app.core.pagination import decode_cursor, paginate, set_next_cursor
+from app.deps.db import get_db, get_read_db
 from app.deps.auth import get_current_user
 from app.deps.organizer import (
     get_organizer_by_id,
@@ -50,29 +52,27 @@ async def create_organizer(
     summary="Get daftar organizer user"
 )
 async def get_my_organizers(
+    response: Response,
     current_user: Annotated[User, Depends(get_current_user)],
-    db: Annotated[AsyncSession, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
     skip: int = 0,
-    limit: int = 100
+    limit: Annotated[int, Query(ge=0)] = 100,
+    cursor: str | None = None
 ):
     """
-    Get semua organizer dimana user adalah member aktif.
+    Get semua organizer dimana user adalah member aktif,
+    lengkap dengan role user dan jumlah member aktif.
+
+    Pagination: kirim `cursor` dari header `X-Next-Cursor` response sebelumnya.
+    `skip` (offset) masih didukung untuk kompatibilitas.
     """
-    organizers = await OrganizerService.get_user_organizers(
-        db, current_user.id, skip, limit
+    after = decode_cursor("my-organizers", cursor) if cursor else None
+    rows = await OrganizerService.get_user_organizers_with_role(
+        db, current_user.id, skip, limit + 1, after
     )
-    
-    # Tambahkan info role user di setiap organizer
-    result = []
-    for org in organizers:
-        member = await OrganizerMemberService.get_member(
-            db, org.id, current_user.id
-        )
-        org_dict = OrganizerResponse.model_validate(org).model_dump()
-        org_dict['user_role'] = member.role if member else None
-        result.append(org_dict)
-    
-    return result
+    rows, next_cursor = paginate(rows, limit, "my-organizers", lambda row: [row.id])
+    set_next_cursor(response, next_cursor)
+    return [row._asdict() for row in rows]
 
 
 @router.get(
@@ -94,10 +94,21 @@ async def get_organizer(
 )
 async def get_organizer_by_slug(
     slug: str,
+    request: Request,
+    response: Response,
     db: Annotated[AsyncSession, Depends(get_db)]
 ):
-    """Get organizer by slug"""
-    organizer = await OrganizerService.get_organizer_by_slug(db, slug)
+    """
+    Get organizer by slug (halaman publik).
+    Mendukung conditional GET: If-None-Match / If-Modified-Since -> 304.
+    """
+    organizer = await OrganizerService.get_organizer_by_slug_cached(db, slug)
+
+    headers = validator_headers(organizer["id"], organizer["updated_at"])
+    if is_not_modified(request, organizer["id"], organizer["updated_at"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
     return organizer
 
 
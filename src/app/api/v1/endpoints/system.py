@@ -0,0 +1,23 @@
+from typing import Annotated
+from fastapi import APIRouter, Depends
+
+from app.deps.auth import get_current_active_superuser
+from app.models.user import User
+from app.db.pool_metrics import pool_metrics_snapshot
+
+router = APIRouter()
+
+
+@router.get(
+    "/metrics/db-pool",
+    summary="Metrics connection pool DB (per proses) - Khusus Super Admin"
+)
+async def get_db_pool_metrics(
+    _: Annotated[User, Depends(get_current_active_superuser)]
+):
+    """
+    Gauge & histogram connection pool untuk proses worker ini:
+    waktu tunggu checkout, biaya pre-ping, lama koneksi dipinjam,
+    jumlah koneksi checked-out / overflow / timeout.
+    """
+    return pool_metrics_snapshot()
@@ -5,13 +5,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, or_
 
 # --- Dependencies ---
-from app.deps.db import get_db
-from app.deps.auth import get_current_user, get_current_active_superuser
+from app.deps.db import get_db, get_read_db
+from app.deps.auth import get_current_user, get_current_active_superuser, invalidate_principal
 
 # --- Models & Schemas ---
 from app.models.user import User, UserStatus, PlatformRole
 from app.models.organizer_member import OrganizerMember  # <-- TAMBAHKAN INI
 from app.schemas.user import UserUpdate, UserResponse, UserPublicResponse, UserStatusUpdate
+from app.services.user_service import UserService
 
 
 router = APIRouter()
@@ -86,6 +87,7 @@ async def update_user_me(
         except Exception as e:
             await db.rollback()
             raise HTTPException(status_code=500, detail=str(e))
+        invalidate_principal(current_user.id)
 
     return current_user
 
@@ -131,6 +133,7 @@ async def change_user_status(
     db.add(target_user)
     await db.commit()
     await db.refresh(target_user)
+    invalidate_principal(target_user.id)
 
     return target_user
 
@@ -148,36 +151,23 @@ async def search_users(
     organizer_id: int | None = Query(None, description="Exclude users already in this organizer"),
     limit: int = Query(10, le=50, description="Max results"),
     current_user: Annotated[User, Depends(get_current_user)] = None,
-    db: Annotated[AsyncSession, Depends(get_db)] = None
+    db: Annotated[AsyncSession, Depends(get_read_db)] = None
 ):
     """
     Search users by name or email.
     
     - Jika `organizer_id` diberikan, akan exclude user yang sudah jadi member organizer tersebut
     - Case-insensitive search
+    - Urutan: email persis > prefix nama/email > substring
     - Max 50 results
     """
-    
-    # Base query
-    query = select(User).where(
-        or_(
-            User.full_name.ilike(f"%{q}%"),
-            User.email.ilike(f"%{q}%")
-        )
-    ).limit(limit)
-    
-    # Exclude users yang sudah jadi member organizer tertentu
-    if organizer_id:
-        # Subquery untuk get user_ids yang sudah member
-        member_subquery = select(OrganizerMember.user_id).where(
-            OrganizerMember.organizer_id == organizer_id
-        )
-        
-        query = query.where(
-            User.id.not_in(member_subquery)
-        )
-    
-    result = await db.execute(query)
-    users = result.scalars().all()
-    
-    return users
\ No newline at end of file
+    rows = await UserService.search_users(db, q, organizer_id, limit)
+    return [
+        {
+            "id": row.id,
+            "name": row.full_name or "",
+            "email": row.email,
+            "picture": row.avatar,
+        }
+        for row in rows
+    ]
@@ -0,0 +1,76 @@
+import asyncio
+from typing import Annotated
+import orjson
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.waiting_room import waiting_room
+from app.deps.db import get_read_db
+from app.deps.auth import get_current_user
+from app.models.user import User
+from app.services.event_service import EventService
+
+
+router = APIRouter()
+
+
+@router.post(
+    "/{event_id}/queue",
+    summary="Masuk antrian checkout event"
+)
+async def join_queue(
+    event_id: int,
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_read_db)]
+):
+    """
+    Ambil nomor antrian + queue token. Join ulang mengembalikan nomor yang sama.
+    Token dikirim sebagai header `X-Queue-Token` saat cek status & checkout.
+    """
+    opens_at, closes_at = await EventService.get_sale_window(db, event_id)
+    return await waiting_room.join(event_id, current_user.id, opens_at, closes_at)
+
+
+@router.get(
+    "/{event_id}/queue/status",
+    summary="Cek posisi antrian"
+)
+async def get_queue_status(
+    event_id: int,
+    x_queue_token: Annotated[str, Header()]
+):
+    """Posisi & estimasi waktu tunggu; dihitung dari token saja (tanpa query)."""
+    return waiting_room.status(x_queue_token, event_id)
+
+
+@router.get(
+    "/{event_id}/queue/stream",
+    summary="Stream posisi antrian (Server-Sent Events)"
+)
+async def stream_queue_status(
+    event_id: int,
+    request: Request,
+    token: Annotated[str, Query(description="Queue token (EventSource tidak bisa kirim header)")]
+):
+    """Kirim status tiap beberapa detik sampai user dapat giliran."""
+    waiting_room.decode(token, event_id)
+    return StreamingResponse(
+        _queue_events(request, event_id, token),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+
+async def _queue_events(request: Request, event_id: int, token: str):
+    while True:
+        try:
+            queue_status = waiting_room.status(token, event_id)
+        except HTTPException as e:
+            yield b"event: error\ndata: " + orjson.dumps({"detail": e.detail}) + b"\n\n"
+            return
+        yield b"data: " + orjson.dumps(queue_status) + b"\n\n"
+        if queue_status["admitted"] or await request.is_disconnected():
+            return
+        await asyncio.sleep(settings.WAITING_ROOM_STREAM_INTERVAL_SECONDS)
@@ -1,8 +1,10 @@
 from fastapi import APIRouter
-from .endpoints import auth, users, organizers, organizer_members
+from .endpoints import auth, users, organizers, organizer_members, system, waiting_room
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
 api_router.include_router(users.router, prefix="/user", tags=["user"])
 api_router.include_router(organizers.router, prefix="/organizers", tags=["Organizers"])
-api_router.include_router(organizer_members.router, prefix="/organizers", tags=["Organizer Members"])
\ No newline at end of file
+api_router.include_router(organizer_members.router, prefix="/organizers", tags=["Organizer Members"])
+api_router.include_router(waiting_room.router, prefix="/events", tags=["Waiting Room"])
+api_router.include_router(system.router, prefix="/system", tags=["System"])
\ No newline at end of file
@@ -0,0 +1,228 @@
+import os
+import tempfile
+import threading
+import time
+from app.core.config import settings
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+# ==========================================
+# ID 63-bit ala Snowflake
+# ==========================================
+# | 41 bit ms sejak EPOCH | 10 bit worker | 12 bit sequence |
+# worker = 5 bit host (CODE_HOST_ID) | 5 bit slot proses di host itu
+# Urut waktu, jadi row baru selalu ditambahkan di ujung index unik
+# (tidak menyebar ke page B-tree acak seperti UUID).
+EPOCH_MS = 1767225600000  # 2026-01-01T00:00:00Z
+WORKER_BITS = 10
+SEQUENCE_BITS = 12
+MAX_WORKER = (1 << WORKER_BITS) - 1
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+SLOT_BITS = 5
+MAX_SLOT = (1 << SLOT_BITS) - 1
+MAX_HOST = MAX_WORKER >> SLOT_BITS
+
+# Crockford base32: tanpa I, L, O, U (tidak tertukar saat dibaca/diketik).
+# Urutan alfabet = urutan ASCII, jadi string fixed-width tetap k-sortable.
+ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_DECODE = {c: i for i, c in enumerate(ALPHABET)}
+_DECODE.update({"O": 0, "I": 1, "L": 1})
+BODY_LENGTH = 13  # 13 x 5 bit = 65 bit >= 63 bit
+
+ORDER_PREFIX = "ORD"
+TICKET_PREFIX = "TIX"
+
+# High-water mark ms disimpan di file lock slot. Proses baru yang mengklaim
+# slot yang sama (restart, atau jam mundur lalu restart) menunggu sampai jam
+# melewatinya, jadi tidak mungkin mengulang ms milik pemilik sebelumnya.
+# Ditulis per lease, bukan per ms: paling banyak satu write per LEASE_MS.
+LEASE_MS = 1000
+# Jam tertinggal lebih jauh dari ini: gagal keras, jangan blok berlama-lama
+MAX_CLOCK_SKEW_MS = 5000
+
+
+def _try_lock(fd: int) -> bool:
+    try:
+        if os.name == "nt":
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        return True
+    except OSError:
+        return False
+
+
+def claim_worker_id(host_id: int, lock_dir: str) -> tuple[int, int]:
+    """
+    Klaim slot proses pertama yang masih kosong di host ini lewat file lock
+    eksklusif. Return (worker_id, fd); lock lepas sendiri saat fd ditutup /
+    proses mati, jadi slot worker yang crash langsung bisa dipakai lagi.
+    """
+    if not 0 <= host_id <= MAX_HOST:
+        raise ValueError(f"host_id harus 0-{MAX_HOST}")
+    os.makedirs(lock_dir, exist_ok=True)
+    for slot in range(MAX_SLOT + 1):
+        path = os.path.join(lock_dir, f"code-worker-{host_id}-{slot}.lock")
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        if _try_lock(fd):
+            return (host_id << SLOT_BITS) | slot, fd
+        os.close(fd)
+    raise RuntimeError(f"Semua {MAX_SLOT + 1} slot worker id di host {host_id} terpakai")
+
+
+def _read_high_water(fd: int) -> int:
+    os.lseek(fd, 0, os.SEEK_SET)
+    raw = os.read(fd, 32).strip()
+    return int(raw) if raw.isdigit() else -1
+
+
+def _write_high_water(fd: int, ms: int) -> None:
+    # Lebar tetap: tidak perlu truncate
+    os.lseek(fd, 0, os.SEEK_SET)
+    os.write(fd, b"%020d" % ms)
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000) - EPOCH_MS
+
+
+def _wait_until_after(ms: int) -> int:
+    """Blok sampai jam > ms (paling lama MAX_CLOCK_SKEW_MS); return ms sekarang."""
+    now = _now_ms()
+    if ms - now > MAX_CLOCK_SKEW_MS:
+        raise RuntimeError(
+            f"Jam tertinggal {ms - now} ms dari id terakhir, tidak aman membuat id"
+        )
+    while now <= ms:
+        time.sleep((ms - now + 1) / 1000)
+        now = _now_ms()
+    return now
+
+
+def _claim_default() -> tuple[int, int]:
+    lock_dir = settings.CODE_WORKER_LOCK_DIR or os.path.join(
+        tempfile.gettempdir(), "ticketing-code-workers"
+    )
+    return claim_worker_id(settings.CODE_HOST_ID, lock_dir)
+
+
+class CodeGenerator:
+    """
+    Generator id unik per proses tanpa query ke DB (thread-safe).
+
+    Timestamp id tidak pernah melewati jam: jam mundur (NTP) memakai ms
+    terakhir + sequence, dan kalau sequence 1 ms habis generator menunggu ms
+    berikutnya (bukan meminjam ms masa depan). Dengan `state_fd` (file lock
+    slot), high-water mark ms ikut disimpan supaya proses pengganti di slot
+    yang sama mulai setelahnya.
+    """
+
+    def __init__(self, worker_id: int, state_fd: int | None = None):
+        if not 0 <= worker_id <= MAX_WORKER:
+            raise ValueError(f"worker_id harus 0-{MAX_WORKER}")
+        self.worker_id = worker_id
+        self._last_ms = -1
+        self._sequence = 0
+        self._lock = threading.Lock()
+        self._state_fd = state_fd
+        self._leased_until = -1
+        if state_fd is not None:
+            # Pemilik slot sebelumnya hanya memakai ms < high-water mark
+            high_water = _read_high_water(state_fd)
+            if high_water >= 0:
+                _wait_until_after(high_water - 1)
+
+    def next_id(self) -> int:
+        with self._lock:
+            now = _now_ms()
+            if now > self._last_ms:
+                self._last_ms = now
+                self._sequence = 0
+            else:
+                # Masih di ms yang sama, atau jam mundur: lanjutkan sequence
+                # di ms terakhir, jangan mengulang kombinasi (ms, sequence)
+                self._sequence = (self._sequence + 1) & MAX_SEQUENCE
+                if self._sequence == 0:
+                    self._last_ms = _wait_until_after(self._last_ms)
+            if self._state_fd is not None and self._last_ms >= self._leased_until:
+                self._leased_until = self._last_ms + LEASE_MS
+                _write_high_water(self._state_fd, self._leased_until)
+            return (
+                (self._last_ms << (WORKER_BITS + SEQUENCE_BITS))
+                | (self.worker_id << SEQUENCE_BITS)
+                | self._sequence
+            )
+
+
+def _check_symbol(body: str) -> str:
+    """Check digit Luhn mod 32: deteksi salah ketik 1 karakter & tukar posisi."""
+    factor, total = 2, 0
+    for ch in reversed(body):
+        addend = factor * _DECODE[ch]
+        total += addend // 32 + addend % 32
+        factor = 1 if factor == 2 else 2
+    return ALPHABET[(32 - total % 32) % 32]
+
+
+def encode_id(value: int) -> str:
+    chars = []
+    for _ in range(BODY_LENGTH):
+        chars.append(ALPHABET[value & 31])
+        value >>= 5
+    body = "".join(reversed(chars))
+    return body + _check_symbol(body)
+
+
+def decode_id(code: str) -> int:
+    """
+    Kebalikan encode_id (boleh dengan prefix `XXX-`). ValueError kalau format
+    atau check digit salah, jadi salah ketik ditolak tanpa query DB.
+    """
+    text = code.rpartition("-")[2].upper()
+    if len(text) != BODY_LENGTH + 1:
+        raise ValueError("Panjang kode tidak valid")
+    try:
+        normalized = "".join(ALPHABET[_DECODE[c]] for c in text)
+    except KeyError:
+        raise ValueError("Karakter kode tidak valid")
+    body = normalized[:-1]
+    if _check_symbol(body) != normalized[-1]:
+        raise ValueError("Check digit kode tidak valid")
+    value = 0
+    for ch in body:
+        value = (value << 5) | _DECODE[ch]
+    return value
+
+
+def id_timestamp_ms(value: int) -> int:
+    """Epoch ms (UTC) saat id dibuat."""
+    return (value >> (WORKER_BITS + SEQUENCE_BITS)) + EPOCH_MS
+
+
+_worker_id, _lock_fd = _claim_default()
+generator = CodeGenerator(_worker_id, _lock_fd)
+
+
+def _reset_after_fork():
+    # Worker hasil fork (gunicorn --preload) butuh worker id & state sendiri.
+    # fd warisan cukup ditutup: lock milik parent tetap dipegang parent.
+    global generator, _worker_id, _lock_fd
+    os.close(_lock_fd)
+    _worker_id, _lock_fd = _claim_default()
+    generator = CodeGenerator(_worker_id, _lock_fd)
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def new_order_code() -> str:
+    """Mis. ORD-01JC8Z3Q4K5M2X (18 karakter, muat di VARCHAR(40))."""
+    return f"{ORDER_PREFIX}-{encode_id(generator.next_id())}"
+
+
+def new_ticket_code() -> str:
+    """Mis. TIX-01JC8Z3Q4K5M2X; id numeriknya (decode_id) dipakai di QR token."""
+    return f"{TICKET_PREFIX}-{encode_id(generator.next_id())}"
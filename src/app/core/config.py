@@ -1,6 +1,6 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from pydantic import AnyHttpUrl
-from typing import List
+from pydantic import AnyHttpUrl, Field
+from typing import Dict, List
 
 class Settings(BaseSettings):
     APP_NAME: str = "Ayunadi CRM Services"
@@ -8,6 +8,13 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
     DATABASE_URL: str
+    DATABASE_REPLICA_URLS: List[str] = []
+    REPLICA_MAX_LAG_SECONDS: int = 5
+    REPLICA_HEALTH_CHECK_SECONDS: int = 5
+    READ_YOUR_WRITES_SECONDS: int = 10
+    DB_POOL_METRICS_LOG_SECONDS: int = 0
+    SQL_INSTRUMENTATION: bool = False
+    SLOW_QUERY_MS: int = 200
     CORS_ORIGINS: List[AnyHttpUrl] = []
     MAIL_USERNAME: str
     MAIL_PASSWORD: str
@@ -15,6 +22,41 @@ class Settings(BaseSettings):
     MAIL_PORT: int = 587
     MAIL_SERVER: str = "smtp.gmail.com"
     GOOGLE_CLIENT_ID: str | None 
+    GOOGLE_CERTS_URL: str = "https://www.googleapis.com/oauth2/v1/certs"
+    BCRYPT_MAX_WORKERS: int = 4
+    BCRYPT_MAX_PENDING: int = 32
+    ACCESS_TOKEN_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    MEMBERSHIP_CACHE_SIZE: int = 50000
+    MEMBERSHIP_CACHE_TTL_SECONDS: int = 30
+    ORGANIZER_SLUG_CACHE_SIZE: int = 10000
+    ORGANIZER_SLUG_CACHE_TTL_SECONDS: int = 300
+    ORGANIZER_SLUG_NEGATIVE_TTL_SECONDS: int = 30
+    INVENTORY_SHARD_MODE_TTL_SECONDS: int = 30
+    INVENTORY_MAX_SHARDS: int = 64
+    # Loop background di bawah default mati (0): cukup nyalakan di SATU
+    # proses (mis. satu instance / worker khusus), bukan di tiap worker API
+    INVENTORY_REFRESH_SECONDS: int = 0
+    ORDER_EXPIRY_SWEEP_SECONDS: int = 0
+    ORDER_EXPIRY_BATCH_SIZE: int = 200
+    ORDER_EXPIRY_MAX_BATCHES: int = 50
+    WAITING_ROOM_RATE_PER_SECOND: float = Field(50, gt=0)
+    WAITING_ROOM_BURST: int = Field(100, ge=0)
+    WAITING_ROOM_TOKEN_TTL_SECONDS: int = 3600
+    WAITING_ROOM_STREAM_INTERVAL_SECONDS: int = 2
+    EVENT_SALE_CACHE_TTL_SECONDS: int = 60
+    IDEMPOTENCY_TTL_SECONDS: int = 86400
+    IDEMPOTENCY_PROCESSING_TIMEOUT_SECONDS: int = 60
+    IDEMPOTENCY_WAIT_SECONDS: float = 2
+    IDEMPOTENCY_POLL_INTERVAL_MS: int = 50
+    IDEMPOTENCY_PURGE_SECONDS: int = 300
+    # Unik per host / container (0-31); slot per proses diklaim otomatis
+    CODE_HOST_ID: int = Field(0, ge=0, le=31)
+    CODE_WORKER_LOCK_DIR: str | None = None
+    QR_SIGNING_KEYS: Dict[int, str] = {}
+    QR_ACTIVE_KID: int = 1
+    QR_REVOCATION_REFRESH_SECONDS: int = 60
 
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
@@ -0,0 +1,175 @@
+import asyncio
+import base64
+import contextlib
+import logging
+import re
+import time
+
+import requests
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicNumbers
+from google.auth import jwt as google_jwt
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+def _b64url_int(value: str) -> int:
+    return int.from_bytes(base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)), "big")
+
+
+def parse_certs(payload: dict) -> dict[str, str]:
+    """
+    kid -> PEM dari response cert Google. Terima dua format:
+    - v1 (`/oauth2/v1/certs`): {kid: "-----BEGIN CERTIFICATE-----..."}
+    - JWKS (`/oauth2/v3/certs`, stand-in lokal): {"keys": [{"kid", "kty": "RSA", "n", "e"}]}
+    """
+    if "keys" not in payload:
+        return payload
+    certs = {}
+    for jwk in payload["keys"]:
+        if jwk.get("kty") != "RSA" or "kid" not in jwk:
+            continue
+        public_key = RSAPublicNumbers(_b64url_int(jwk["e"]), _b64url_int(jwk["n"])).public_key()
+        certs[jwk["kid"]] = public_key.public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        ).decode("ascii")
+    return certs
+
+
+class GoogleTokenVerifier:
+    """
+    Verifikasi ID Token Google tanpa nge-block event loop.
+
+    - Cert signing Google disimpan di cache per-proses.
+    - Cert di-refresh di background sesuai `Cache-Control: max-age` dari Google.
+    - Kalau token pakai `kid` yang belum dikenal, cert di-fetch ulang sekali.
+    - `certs_url` bisa diarahkan ke endpoint lokal untuk testing.
+    """
+
+    def __init__(
+        self,
+        certs_url: str,
+        audience: str | None,
+        min_refresh_seconds: int = 60,
+        refresh_margin_seconds: int = 60,
+        unknown_kid_cooldown_seconds: int = 10,
+        fetch_timeout: float = 5.0,
+        clock_skew_seconds: int = 10,
+    ):
+        self.certs_url = certs_url
+        self.audience = audience
+        self.min_refresh_seconds = min_refresh_seconds
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self.unknown_kid_cooldown_seconds = unknown_kid_cooldown_seconds
+        self.fetch_timeout = fetch_timeout
+        self.clock_skew_seconds = clock_skew_seconds
+
+        self._certs: dict[str, str] = {}
+        self._expires_at = 0.0
+        self._last_fetch = 0.0
+        self._lock = asyncio.Lock()
+        self._refresh_task: asyncio.Task | None = None
+
+    # ------------------------------------------------------------------
+    # Fetch cert
+    # ------------------------------------------------------------------
+    def _fetch_sync(self) -> tuple[dict[str, str], int]:
+        resp = requests.get(self.certs_url, timeout=self.fetch_timeout)
+        resp.raise_for_status()
+        match = _MAX_AGE_RE.search(resp.headers.get("Cache-Control", ""))
+        max_age = int(match.group(1)) if match else self.min_refresh_seconds
+        return parse_certs(resp.json()), max_age
+
+    async def _fetch(self):
+        # `requests` itu blocking, jadi dijalankan di thread
+        certs, max_age = await asyncio.to_thread(self._fetch_sync)
+        now = time.monotonic()
+        self._certs = certs
+        self._last_fetch = now
+        self._expires_at = now + max(max_age, self.min_refresh_seconds)
+
+    async def refresh(self, force: bool = False):
+        """Fetch cert kalau cache kosong/kadaluarsa (atau dipaksa)."""
+        async with self._lock:
+            if not force and self._certs and time.monotonic() < self._expires_at:
+                return
+            await self._fetch()
+
+    async def _refresh_for_kid(self, kid: str):
+        """Fetch ulang sekali untuk `kid` yang belum dikenal."""
+        async with self._lock:
+            # Request lain mungkin sudah fetch duluan
+            if kid in self._certs:
+                return
+            # Batasi fetch ulang supaya `kid` ngasal tidak bikin kita spam Google
+            if time.monotonic() - self._last_fetch < self.unknown_kid_cooldown_seconds:
+                return
+            await self._fetch()
+
+    # ------------------------------------------------------------------
+    # Background refresh
+    # ------------------------------------------------------------------
+    async def _refresh_loop(self):
+        while True:
+            try:
+                await self.refresh(force=True)
+                delay = self._expires_at - time.monotonic() - self.refresh_margin_seconds
+            except Exception:
+                # Cert lama tetap dipakai, Google rotate key dengan masa overlap
+                logger.warning("Gagal refresh cert Google", exc_info=True)
+                delay = self.min_refresh_seconds
+            await asyncio.sleep(max(delay, self.min_refresh_seconds))
+
+    def start(self):
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._refresh_task
+            self._refresh_task = None
+
+    # ------------------------------------------------------------------
+    # Verifikasi
+    # ------------------------------------------------------------------
+    async def verify(self, token: str) -> dict:
+        """
+        Verifikasi ID Token dan return claims-nya.
+        Raise `ValueError` kalau token tidak valid.
+        """
+        header = google_jwt.decode_header(token)
+        kid = header.get("kid")
+
+        # Cache kosong / expired dan background task tidak jalan
+        if not self._certs or time.monotonic() >= self._expires_at:
+            await self.refresh()
+
+        if kid is not None and kid not in self._certs:
+            await self._refresh_for_kid(kid)
+
+        # Verifikasi RS256 cuma butuh puluhan mikrodetik, aman dijalankan langsung
+        id_info = google_jwt.decode(
+            token,
+            certs=self._certs,
+            audience=self.audience,
+            clock_skew_in_seconds=self.clock_skew_seconds,
+        )
+
+        if id_info.get("iss") not in GOOGLE_ISSUERS:
+            raise ValueError(f"Wrong issuer: {id_info.get('iss')}")
+
+        return id_info
+
+
+google_verifier = GoogleTokenVerifier(
+    certs_url=settings.GOOGLE_CERTS_URL,
+    audience=settings.GOOGLE_CLIENT_ID,
+)
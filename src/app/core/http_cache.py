@@ -0,0 +1,50 @@
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request
+
+
+def _as_utc(dt: datetime) -> datetime:
+    # Kolom DATETIME kita naive, isinya UTC (datetime.utcnow)
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def make_etag(key: str | int, updated_at: datetime) -> str:
+    return f'W/"{key}-{int(_as_utc(updated_at).timestamp())}"'
+
+
+def validator_headers(key: str | int, updated_at: datetime) -> dict[str, str]:
+    """Header ETag + Last-Modified dari `updated_at` resource."""
+    return {
+        "ETag": make_etag(key, updated_at),
+        "Last-Modified": format_datetime(_as_utc(updated_at).replace(microsecond=0), usegmt=True),
+        "Cache-Control": "public, no-cache",
+    }
+
+
+def is_not_modified(request: Request, key: str | int, updated_at: datetime) -> bool:
+    """
+    Cek If-None-Match / If-Modified-Since dari request.
+    If-None-Match diprioritaskan (RFC 9110).
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        etag = make_etag(key, updated_at)
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        # Weak comparison: abaikan prefix W/
+        wanted = etag.removeprefix("W/")
+        return "*" in tags or any(tag.removeprefix("W/") == wanted for tag in tags)
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return _as_utc(updated_at).replace(microsecond=0) <= since
+
+    return False
@@ -0,0 +1,306 @@
+import asyncio
+import contextlib
+import hashlib
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select, insert, update, delete
+from sqlalchemy.exc import IntegrityError
+from app.core.config import settings
+from app.core.security import decode_access_token
+from app.db.session import engine
+from app.models.idempotency_key import IdempotencyKey, IdempotencyStatus
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = b"idempotency-key"
+REPLAY_HEADER = b"idempotent-replayed"
+MUTATING_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+MAX_KEY_LENGTH = 100
+
+_table = IdempotencyKey.__table__
+
+
+def _bearer_user_id(headers: dict[bytes, bytes]) -> int | None:
+    auth = headers.get(b"authorization", b"").decode("latin-1")
+    scheme, _, token = auth.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        sub = decode_access_token(token).get("sub")
+        return int(sub) if sub is not None else None
+    except (HTTPException, ValueError):
+        return None
+
+
+def _error(status_code: int, detail: str, headers: dict | None = None) -> ORJSONResponse:
+    return ORJSONResponse({"detail": detail}, status_code=status_code, headers=headers)
+
+
+class IdempotencyMiddleware:
+    """
+    Layer Idempotency-Key untuk request mutasi (POST/PUT/PATCH/DELETE) user login.
+
+    - Request pertama mengklaim (user_id, key) dengan satu INSERT ke PK,
+      handler jalan, response disimpan.
+    - Request ulang dengan body sama -> response tersimpan di-replay tanpa
+      menjalankan handler (header `Idempotent-Replayed: true`).
+    - Duplikat yang datang saat request pertama masih jalan menunggu sebentar,
+      lalu 409 kalau belum selesai.
+    - Key sama dengan body berbeda -> 422.
+    - Response 5xx / exception tidak disimpan (klaim dihapus, boleh retry).
+    - Tiap klaim punya token acak; simpan / lepas hanya kalau token masih
+      cocok, jadi proses lambat yang klaimnya sudah diambil alih (lewat
+      PROCESSING timeout) tidak menimpa / menghapus klaim pemilik baru.
+    Pakai koneksi sendiri, bukan session request. Biaya per request ber-key:
+    dua transaksi tulis yang di-commit (klaim + simpan response), ukur dengan
+    tests/bench/test_bench_idempotency.py.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in MUTATING_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        raw_key = headers.get(IDEMPOTENCY_HEADER)
+        user_id = _bearer_user_id(headers) if raw_key else None
+        if user_id is None:
+            # Tanpa key / belum login: lewat biasa (handler yang urus 401)
+            await self.app(scope, receive, send)
+            return
+
+        key = raw_key.decode("latin-1").strip()
+        if not key or len(key) > MAX_KEY_LENGTH:
+            await _error(400, f"Idempotency-Key wajib 1-{MAX_KEY_LENGTH} karakter")(scope, receive, send)
+            return
+
+        body, receive = await _buffer_body(receive)
+        fingerprint = hashlib.sha256(
+            b"%s %s?%s\n" % (scope["method"].encode(), scope["path"].encode(), scope["query_string"])
+            + body
+        ).digest()
+
+        claim_token, stored = await _claim(user_id, key, fingerprint)
+        if stored is not None:
+            await stored(scope, receive, send)
+            return
+
+        captured = {"status": None, "headers": [], "body": bytearray()}
+
+        async def capture_send(message):
+            if message["type"] == "http.response.start":
+                captured["status"] = message["status"]
+                captured["headers"] = message.get("headers", [])
+            elif message["type"] == "http.response.body":
+                captured["body"] += message.get("body", b"")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, capture_send)
+        except BaseException:
+            await _release(user_id, key, claim_token)
+            raise
+
+        if captured["status"] is None or captured["status"] >= 500:
+            await _release(user_id, key, claim_token)
+        else:
+            await _complete(user_id, key, claim_token, captured)
+
+
+async def _buffer_body(receive):
+    """Baca seluruh body (untuk fingerprint) lalu kembalikan receive pengganti."""
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    body = b"".join(chunks)
+    sent = False
+
+    async def replay_receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        return await receive()
+
+    return body, replay_receive
+
+
+def _pk(user_id: int, key: str):
+    return (_table.c.user_id == user_id) & (_table.c.idem_key == key)
+
+
+def _owned(user_id: int, key: str, claim_token: bytes):
+    """Row klaim milik request ini (belum selesai, belum diambil alih)."""
+    return (
+        _pk(user_id, key)
+        & (_table.c.claim_token == claim_token)
+        & (_table.c.status == IdempotencyStatus.PROCESSING)
+    )
+
+
+async def _claim(user_id: int, key: str, fingerprint: bytes):
+    """
+    Return (claim_token, None) kalau klaim berhasil, handler boleh jalan.
+    Selain itu (None, response): response (ASGI app) yang langsung dikirim
+    ke client.
+    """
+    deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+    while True:
+        now = datetime.utcnow()
+        claim_token = os.urandom(16)
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(
+                    insert(_table).values(
+                        user_id=user_id,
+                        idem_key=key,
+                        request_hash=fingerprint,
+                        claim_token=claim_token,
+                        status=IdempotencyStatus.PROCESSING,
+                        created_at=now,
+                        expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_PROCESSING_TIMEOUT_SECONDS),
+                    )
+                )
+            return claim_token, None
+        except IntegrityError:
+            pass
+
+        async with engine.connect() as conn:
+            result = await conn.execute(select(_table).where(_pk(user_id, key)))
+            row = result.first()
+
+        if row is None:
+            # Row hilang di antara INSERT dan SELECT; coba klaim lagi
+            if time.monotonic() >= deadline:
+                return None, _error(409, "Request dengan Idempotency-Key ini masih diproses")
+            await asyncio.sleep(settings.IDEMPOTENCY_POLL_INTERVAL_MS / 1000)
+            continue
+        if row.expires_at < now:
+            # Replay kedaluwarsa / klaim yatim (proses crash): ambil alih
+            async with engine.begin() as conn:
+                await conn.execute(
+                    delete(_table).where(_pk(user_id, key), _table.c.expires_at < now)
+                )
+            continue
+        if row.request_hash != fingerprint:
+            return None, _error(422, "Idempotency-Key sudah dipakai untuk request yang berbeda")
+        if row.status == IdempotencyStatus.COMPLETED:
+            return None, _StoredResponse(row.response_status, row.response_headers, row.response_body)
+        if time.monotonic() >= deadline:
+            return None, _error(
+                409,
+                "Request dengan Idempotency-Key ini masih diproses",
+                headers={"Retry-After": "1"}
+            )
+        await asyncio.sleep(settings.IDEMPOTENCY_POLL_INTERVAL_MS / 1000)
+
+
+async def _complete(user_id: int, key: str, claim_token: bytes, captured: dict) -> None:
+    headers = [
+        [k.decode("latin-1"), v.decode("latin-1")]
+        for k, v in captured["headers"]
+        if k.lower() not in (b"set-cookie", b"content-length", b"server-timing")
+    ]
+    try:
+        async with engine.begin() as conn:
+            result = await conn.execute(
+                update(_table)
+                .where(_owned(user_id, key, claim_token))
+                .values(
+                    status=IdempotencyStatus.COMPLETED,
+                    response_status=captured["status"],
+                    response_headers=headers,
+                    response_body=bytes(captured["body"]),
+                    expires_at=datetime.utcnow() + timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS),
+                )
+            )
+        if result.rowcount == 0:
+            logger.warning("Klaim idempotency sudah diambil alih request lain, response tidak disimpan")
+    except Exception:
+        # Response sudah terkirim; gagal simpan cukup dicatat, klaim kedaluwarsa sendiri
+        logger.warning("Gagal menyimpan response idempotency", exc_info=True)
+
+
+async def _release(user_id: int, key: str, claim_token: bytes) -> None:
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(delete(_table).where(_owned(user_id, key, claim_token)))
+    except Exception:
+        logger.warning("Gagal melepas klaim idempotency", exc_info=True)
+
+
+class _StoredResponse:
+    def __init__(self, status_code: int, headers: list, body: bytes):
+        self.status_code = status_code
+        self.headers = [(k.encode("latin-1"), v.encode("latin-1")) for k, v in headers or []]
+        self.body = body or b""
+
+    async def __call__(self, scope, receive, send):
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.headers + [
+                (b"content-length", str(len(self.body)).encode("latin-1")),
+                (REPLAY_HEADER, b"true"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": self.body})
+
+
+# ==========================================
+# PURGE BERKALA
+# ==========================================
+_purge_task: asyncio.Task | None = None
+
+PURGE_BATCH_SIZE = 1000
+
+
+async def purge_expired() -> int:
+    """Hapus row kedaluwarsa per batch kecil (lewat index expires_at)."""
+    total = 0
+    while True:
+        async with engine.begin() as conn:
+            result = await conn.execute(
+                delete(_table)
+                .where(_table.c.expires_at < datetime.utcnow())
+                .with_dialect_options(mysql_limit=PURGE_BATCH_SIZE)
+            )
+        total += result.rowcount
+        if result.rowcount < PURGE_BATCH_SIZE:
+            return total
+
+
+async def _purge_loop(interval: int):
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await purge_expired()
+        except Exception:
+            logger.warning("Purge idempotency key gagal", exc_info=True)
+
+
+def start_purge(interval: int):
+    global _purge_task
+    if interval > 0 and (_purge_task is None or _purge_task.done()):
+        _purge_task = asyncio.create_task(_purge_loop(interval))
+
+
+async def stop_purge():
+    global _purge_task
+    if _purge_task is not None:
+        _purge_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await _purge_task
+        _purge_task = None
@@ -0,0 +1,57 @@
+import threading
+from bisect import bisect_left
+
+
+class Histogram:
+    """
+    Histogram sederhana per proses (bucket tetap, satuan milidetik).
+    Cukup untuk p50/p95/p99 kasar tanpa dependency metrics eksternal.
+    """
+
+    DEFAULT_BUCKETS = (0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value_ms: float) -> None:
+        idx = bisect_left(self.buckets, value_ms)
+        with self._lock:
+            self._counts[idx] += 1
+            self._count += 1
+            self._sum += value_ms
+            if value_ms > self._max:
+                self._max = value_ms
+
+    def _percentile(self, counts: list[int], total: int, p: float) -> float:
+        if total == 0:
+            return 0.0
+        target = total * p
+        running = 0
+        for idx, n in enumerate(counts):
+            running += n
+            if running >= target:
+                # Upper bound bucket; bucket overflow pakai nilai max
+                return self.buckets[idx] if idx < len(self.buckets) else self._max
+        return self._max
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = list(self._counts)
+            total, total_sum, maximum = self._count, self._sum, self._max
+        return {
+            "count": total,
+            "avg_ms": round(total_sum / total, 3) if total else 0.0,
+            "max_ms": round(maximum, 3),
+            "p50_ms": self._percentile(counts, total, 0.50),
+            "p95_ms": self._percentile(counts, total, 0.95),
+            "p99_ms": self._percentile(counts, total, 0.99),
+            "buckets": {
+                **{f"le_{b}": n for b, n in zip(self.buckets, counts)},
+                "le_inf": counts[-1],
+            },
+        }
@@ -0,0 +1,81 @@
+import base64
+import hashlib
+import hmac
+from typing import Any, Callable, Sequence
+
+import orjson
+from fastapi import HTTPException, Response, status
+from sqlalchemy import tuple_
+
+from app.core.config import settings
+
+# Cursor halaman berikutnya dikirim lewat header supaya body list tetap kompatibel
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+_SIG_BYTES = 16
+
+
+def _sign(data: bytes) -> bytes:
+    return hmac.new(settings.SECRET_KEY.encode("utf-8"), data, hashlib.sha256).digest()[:_SIG_BYTES]
+
+
+def encode_cursor(scope: str, values: Sequence[Any]) -> str:
+    """
+    Buat cursor opaque + bertanda tangan dari nilai keyset baris terakhir.
+    `scope` mencegah cursor satu list dipakai di list lain.
+    """
+    data = orjson.dumps([scope, list(values)])
+    return base64.urlsafe_b64encode(data + _sign(data)).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(scope: str, cursor: str) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data, sig = raw[:-_SIG_BYTES], raw[-_SIG_BYTES:]
+        if not hmac.compare_digest(sig, _sign(data)):
+            raise ValueError("signature")
+        cursor_scope, values = orjson.loads(data)
+        if cursor_scope != scope:
+            raise ValueError("scope")
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor tidak valid"
+        )
+    return values
+
+
+def apply_keyset(query, columns: Sequence, values: Sequence[Any] | None):
+    """
+    Tambah kondisi `(kolom...) > (nilai...)` sesuai urutan ORDER BY query.
+    Query harus sudah di-order by `columns` (ascending) dengan urutan stabil.
+    """
+    if values is None:
+        return query
+    if len(columns) == 1:
+        return query.where(columns[0] > values[0])
+    return query.where(tuple_(*columns) > tuple_(*values))
+
+
+def paginate(
+    rows: Sequence,
+    limit: int,
+    scope: str,
+    key: Callable[[Any], Sequence[Any]],
+) -> tuple[list, str | None]:
+    """
+    `rows` diambil dengan `limit + 1`. Kalau ada baris lebih,
+    return `limit` baris pertama + cursor halaman berikutnya.
+    """
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    if not rows:
+        # limit=0: tidak ada baris terakhir untuk dijadikan cursor
+        return rows, None
+    return rows, encode_cursor(scope, key(rows[-1]))
+
+
+def set_next_cursor(response: Response, next_cursor: str | None) -> None:
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
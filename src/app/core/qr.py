@@ -0,0 +1,222 @@
+import asyncio
+import base64
+import binascii
+import contextlib
+import hashlib
+import hmac
+import logging
+import struct
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select, func
+from app.core.codes import TICKET_PREFIX, decode_id, encode_id
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.checkin import CheckinResult
+from app.models.event import Event
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.models.ticket import Ticket, TicketStatusEnum
+
+logger = logging.getLogger(__name__)
+
+# ==========================================
+# FORMAT TOKEN QR
+# ==========================================
+# version(1) | kid(1) | ticket uid(8) | event id(8) | ticket type id(8) |
+# issued_at epoch detik(4) | HMAC-SHA256 dipotong 16 byte
+# -> 46 byte, base64url tanpa padding = 62 karakter.
+VERSION = 1
+_PAYLOAD = struct.Struct(">BBQQQI")
+MAC_LENGTH = 16
+TOKEN_LENGTH = _PAYLOAD.size + MAC_LENGTH
+
+
+def _load_keys() -> dict[int, bytes]:
+    """
+    kid -> key dari QR_SIGNING_KEYS. Kalau kosong, satu key (kid 1) diturunkan
+    dari SECRET_KEY. Rotasi: tambah kid baru, pindahkan QR_ACTIVE_KID, key
+    lama tetap disimpan selama tiket lama masih berlaku.
+    """
+    if settings.QR_SIGNING_KEYS:
+        keys = {int(kid): key.encode("utf-8") for kid, key in settings.QR_SIGNING_KEYS.items()}
+    else:
+        keys = {1: hmac.new(settings.SECRET_KEY.encode("utf-8"), b"ticket-qr", hashlib.sha256).digest()}
+    if settings.QR_ACTIVE_KID not in keys or not all(0 <= kid <= 255 for kid in keys):
+        raise RuntimeError("QR_ACTIVE_KID harus ada di QR_SIGNING_KEYS (kid 0-255)")
+    return keys
+
+
+_keys = _load_keys()
+
+
+@dataclass(frozen=True)
+class QrClaims:
+    ticket_uid: int
+    event_id: int
+    ticket_type_id: int
+    issued_at: datetime
+    kid: int
+
+    @property
+    def ticket_code(self) -> str:
+        """ticket_code unik untuk lookup duplikat check-in (index unik)."""
+        return f"{TICKET_PREFIX}-{encode_id(self.ticket_uid)}"
+
+
+class QrTokenError(Exception):
+    """Token ditolak sebelum menyentuh DB; `result` langsung dipakai untuk Checkin."""
+
+    def __init__(self, result: CheckinResult, reason: str):
+        super().__init__(reason)
+        self.result = result
+        self.reason = reason
+
+
+def _mac(key: bytes, payload: bytes) -> bytes:
+    return hmac.new(key, payload, hashlib.sha256).digest()[:MAC_LENGTH]
+
+
+def sign_ticket(
+    ticket_code: str,
+    event_id: int,
+    ticket_type_id: int,
+    issued_at: datetime
+) -> str:
+    """Buat qr_token untuk tiket (uid diambil dari ticket_code, lihat app.core.codes)."""
+    kid = settings.QR_ACTIVE_KID
+    payload = _PAYLOAD.pack(
+        VERSION,
+        kid,
+        decode_id(ticket_code),
+        event_id,
+        ticket_type_id,
+        int(issued_at.replace(tzinfo=timezone.utc).timestamp()),
+    )
+    token = payload + _mac(_keys[kid], payload)
+    return base64.urlsafe_b64encode(token).rstrip(b"=").decode("ascii")
+
+
+def verify_qr_token(token: str, event_id: int | None = None) -> QrClaims:
+    """
+    Cek keaslian token tanpa I/O: format, kid, MAC, event, daftar revoke.
+    Lolos di sini baru lanjut ke cek duplikat check-in di DB.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    except (binascii.Error, ValueError):
+        raise QrTokenError(CheckinResult.INVALID, "Format QR tidak valid")
+    if len(raw) != TOKEN_LENGTH:
+        raise QrTokenError(CheckinResult.INVALID, "Format QR tidak valid")
+
+    payload, mac = raw[:_PAYLOAD.size], raw[_PAYLOAD.size:]
+    version, kid, ticket_uid, token_event_id, ticket_type_id, issued_at = _PAYLOAD.unpack(payload)
+    key = _keys.get(kid)
+    if version != VERSION or key is None:
+        raise QrTokenError(CheckinResult.INVALID, "Versi / key QR tidak dikenal")
+    if not hmac.compare_digest(mac, _mac(key, payload)):
+        raise QrTokenError(CheckinResult.INVALID, "Tanda tangan QR tidak valid")
+    if event_id is not None and token_event_id != event_id:
+        raise QrTokenError(CheckinResult.INVALID, "Tiket bukan untuk event ini")
+    if ticket_uid in revoked_tickets:
+        raise QrTokenError(CheckinResult.BLOCKED, "Tiket sudah dibatalkan")
+
+    return QrClaims(
+        ticket_uid=ticket_uid,
+        event_id=token_event_id,
+        ticket_type_id=ticket_type_id,
+        issued_at=datetime.fromtimestamp(issued_at, timezone.utc).replace(tzinfo=None),
+        kid=kid,
+    )
+
+
+# ==========================================
+# REVOCATION (tiket void / refunded)
+# ==========================================
+# uid tiket -> simpan sampai kapan (UTC naive), per proses. Refresh berkala
+# hanya membaca tiket void/refunded dari event yang belum selesai, dan uid
+# dibuang setelah event-nya selesai (QR-nya tidak akan di-scan lagi), jadi
+# ukuran map mengikuti event yang sedang berjalan, bukan seluruh histori.
+# Panggil revoke_ticket() saat tiket di-void/refund supaya proses ini
+# langsung menolak tanpa menunggu refresh.
+revoked_tickets: dict[int, datetime] = {}
+
+
+def revoke_ticket(ticket_code: str, event_end_at: datetime | None = None) -> None:
+    """
+    Tanpa event_end_at, entry ditahan sampai refresh berikutnya pasti sudah
+    melihat status baru (lalu diganti end_at event-nya).
+    """
+    if event_end_at is None:
+        interval = settings.QR_REVOCATION_REFRESH_SECONDS
+        event_end_at = (
+            datetime.utcnow() + timedelta(seconds=2 * interval) if interval > 0 else datetime.max
+        )
+    uid = decode_id(ticket_code)
+    revoked_tickets[uid] = max(revoked_tickets.get(uid, event_end_at), event_end_at)
+
+
+def prune_revocations(now: datetime | None = None) -> int:
+    """Buang uid yang event-nya sudah selesai. Return jumlah yang dibuang."""
+    now = now or datetime.utcnow()
+    expired = [uid for uid, keep_until in revoked_tickets.items() if keep_until <= now]
+    for uid in expired:
+        del revoked_tickets[uid]
+    return len(expired)
+
+
+async def refresh_revocations() -> int:
+    async with AsyncSessionLocal() as db:
+        # Lewat ix_tickets_status, lalu join per PK sampai events
+        result = await db.execute(
+            select(Ticket.ticket_code, Event.end_at)
+            .join(OrderItem, OrderItem.id == Ticket.order_item_id)
+            .join(Order, Order.id == OrderItem.order_id)
+            .join(Event, Event.id == Order.event_id)
+            .where(
+                Ticket.status.in_([TicketStatusEnum.VOID, TicketStatusEnum.REFUNDED]),
+                Event.end_at > func.utc_timestamp()
+            )
+        )
+        rows = result.all()
+
+    prune_revocations()
+    count = 0
+    for code, end_at in rows:
+        try:
+            uid = decode_id(code)
+        except ValueError:
+            # Kode format lama (sebelum generator codes) tidak punya QR bertanda tangan
+            continue
+        # Tidak pernah menghapus entry yang tidak ada di hasil: revoke_ticket()
+        # yang terjadi setelah SELECT di atas tetap tersimpan
+        revoked_tickets[uid] = max(revoked_tickets.get(uid, end_at), end_at)
+        count += 1
+    return count
+
+
+_refresh_task: asyncio.Task | None = None
+
+
+async def _refresh_loop(interval: int):
+    while True:
+        try:
+            await refresh_revocations()
+        except Exception:
+            logger.warning("Refresh revocation QR gagal", exc_info=True)
+        await asyncio.sleep(interval)
+
+
+def start_revocation_refresh(interval: int):
+    global _refresh_task
+    if interval > 0 and (_refresh_task is None or _refresh_task.done()):
+        _refresh_task = asyncio.create_task(_refresh_loop(interval))
+
+
+async def stop_revocation_refresh():
+    global _refresh_task
+    if _refresh_task is not None:
+        _refresh_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await _refresh_task
+        _refresh_task = None
@@ -1,8 +1,14 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from fastapi import HTTPException, status
 from jose import jwt, JWTError, ExpiredSignatureError
 import hashlib
 from string import hexdigits
 import bcrypt
+from cachetools import TLRUCache
 from app.core.config import settings
 
 ALGO = "HS256"
@@ -55,6 +61,41 @@ def maybe_upgrade_hash(raw: str, stored: str) -> str | None:
         return create_bsha256(raw)
     return None
 
+# ==========================================
+# ASYNC VARIANT (bcrypt di luar event loop)
+# ==========================================
+# bcrypt melepas GIL selama hashing, jadi thread pool sudah jalan paralel.
+_bcrypt_executor = ThreadPoolExecutor(
+    max_workers=settings.BCRYPT_MAX_WORKERS,
+    thread_name_prefix="bcrypt",
+)
+_bcrypt_pending = 0  # job yang sedang jalan + antri
+
+async def _run_bcrypt(fn, *args):
+    # Backpressure: kalau antrian penuh langsung 503, jangan numpuk lag
+    global _bcrypt_pending
+    if _bcrypt_pending >= settings.BCRYPT_MAX_PENDING:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server sedang sibuk, coba lagi sebentar",
+            headers={"Retry-After": "1"},
+        )
+    _bcrypt_pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_bcrypt_executor, fn, *args)
+    finally:
+        _bcrypt_pending -= 1
+
+async def create_bsha256_async(raw: str) -> str:
+    return await _run_bcrypt(create_bsha256, raw)
+
+async def verify_password_async(raw: str, stored: str) -> bool:
+    return await _run_bcrypt(verify_password, raw, stored)
+
+async def maybe_upgrade_hash_async(raw: str, stored: str) -> str | None:
+    return await _run_bcrypt(maybe_upgrade_hash, raw, stored)
+
 def create_access_token(sub: str, extra: dict | None = None) -> str:
     data = {"sub": sub,
             "exp": datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)}
@@ -72,14 +113,48 @@ def create_verify_email_token(user_id: int) -> str:
         settings.SECRET_KEY,
         algorithm="HS256"
     )
+# ==========================================
+# CACHE HASIL VERIFIKASI ACCESS TOKEN
+# ==========================================
+# sha256(token) -> payload, disimpan sampai `exp` token (tidak pernah lewat).
+def _token_ttu(_key, payload: dict, _now: float) -> float:
+    return payload["exp"]
+
+_token_cache = (
+    TLRUCache(maxsize=settings.ACCESS_TOKEN_CACHE_SIZE, ttu=_token_ttu, timer=time.time)
+    if settings.ACCESS_TOKEN_CACHE_SIZE > 0 else None
+)
+_token_cache_lock = threading.Lock()
+_token_cache_stats = {"hits": 0, "misses": 0}
+
+def token_cache_info() -> dict:
+    with _token_cache_lock:
+        return {
+            **_token_cache_stats,
+            "size": len(_token_cache) if _token_cache is not None else 0,
+            "maxsize": settings.ACCESS_TOKEN_CACHE_SIZE,
+        }
+
 def decode_access_token(token: str) -> dict:
+    key = None
+    if _token_cache is not None:
+        key = hashlib.sha256(token.encode("utf-8")).digest()
+        with _token_cache_lock:
+            cached = _token_cache.get(key)
+            _token_cache_stats["hits" if cached is not None else "misses"] += 1
+        if cached is not None:
+            return dict(cached)
+
     try:
         payload = jwt.decode(
             token,
             settings.SECRET_KEY,
             algorithms=[ALGO]
         )
-        return payload
+        if key is not None and isinstance(payload.get("exp"), (int, float)):
+            with _token_cache_lock:
+                _token_cache[key] = payload
+        return dict(payload)
 
     except ExpiredSignatureError:
         raise HTTPException(
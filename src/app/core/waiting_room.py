@@ -0,0 +1,215 @@
+import hashlib
+import hmac
+import math
+import time
+from cachetools import TTLCache
+from fastapi import HTTPException, status
+from jose import jwt, JWTError, ExpiredSignatureError
+from app.core.config import settings
+from app.core.security import ALGO
+
+QUEUE_TOKEN_TYPE = "queue"
+
+# Key turunan: queue token tidak boleh bisa dipakai sebagai access token
+_QUEUE_KEY = hmac.new(
+    settings.SECRET_KEY.encode("utf-8"), b"waiting-room", hashlib.sha256
+).hexdigest()
+
+
+class QueueStore:
+    """
+    Interface penyimpanan antrian per event.
+
+    Yang disimpan hanya waktu buka antrian + nomor urut per user; posisi dan
+    status admission dihitung dari token, jadi polling tidak butuh store.
+    Implementasi bersama (mis. Redis) cukup mengikuti method di bawah.
+    """
+
+    async def open(self, event_id: int, opens_at: float) -> float:
+        """
+        Set waktu buka antrian ke jadwal terbaru (sale_start_at bisa diubah);
+        nomor urut yang sudah ada tetap. Return waktu buka efektif.
+        """
+        raise NotImplementedError
+
+    async def enqueue(self, event_id: int, user_id: int) -> int:
+        """Nomor urut (mulai 0) user di antrian event; join ulang dapat nomor yang sama."""
+        raise NotImplementedError
+
+    async def length(self, event_id: int) -> int:
+        raise NotImplementedError
+
+    async def forget(self, event_id: int) -> None:
+        """Buang antrian event (penjualan sudah selesai)."""
+        raise NotImplementedError
+
+
+class _EventQueue:
+    __slots__ = ("opens_at", "members")
+
+    def __init__(self, opens_at: float):
+        self.opens_at = opens_at
+        self.members: dict[int, int] = {}
+
+
+class InMemoryQueueStore(QueueStore):
+    """
+    Store per proses. Cukup untuk satu worker / testing lokal; dengan
+    beberapa worker tiap proses punya antrian sendiri, jadi rate efektif
+    = rate x jumlah worker.
+
+    Antrian event yang tidak dapat join baru selama `idle_ttl_seconds`
+    (= umur queue token) dibuang: semua token yang pernah diterbitkan sudah
+    kedaluwarsa, nomor urutnya tidak dipakai lagi.
+    """
+
+    def __init__(self, idle_ttl_seconds: float, max_events: int = 10000):
+        self._queues: TTLCache = TTLCache(maxsize=max_events, ttl=idle_ttl_seconds)
+
+    async def open(self, event_id: int, opens_at: float) -> float:
+        queue = self._queues.get(event_id)
+        if queue is None:
+            queue = _EventQueue(opens_at)
+        queue.opens_at = opens_at
+        # Set ulang = TTL dihitung lagi dari join terakhir
+        self._queues[event_id] = queue
+        return opens_at
+
+    async def enqueue(self, event_id: int, user_id: int) -> int:
+        # Selalu setelah open(), jadi antriannya pasti ada
+        members = self._queues[event_id].members
+        seq = members.get(user_id)
+        if seq is None:
+            seq = members[user_id] = len(members)
+        return seq
+
+    async def length(self, event_id: int) -> int:
+        queue = self._queues.get(event_id)
+        return len(queue.members) if queue is not None else 0
+
+    async def forget(self, event_id: int) -> None:
+        self._queues.pop(event_id, None)
+
+
+class WaitingRoom:
+    """
+    Admission control checkout per event.
+
+    Sejak antrian buka (paling cepat sale_start_at), `burst` orang pertama
+    langsung masuk, lalu `rate_per_second` orang per detik. User dengan
+    nomor urut `seq` boleh checkout kalau seq < jumlah yang sudah diizinkan.
+    Semua yang dibutuhkan (seq, waktu buka) ada di queue token yang ditandatangani,
+    jadi cek status tidak menyentuh MySQL maupun store. Admission checkout
+    juga mencocokkan waktu buka di token dengan jadwal terbaru, supaya token
+    dari sebelum jadwal diubah tidak bisa dipakai.
+    """
+
+    def __init__(self, store: QueueStore, rate_per_second: float, burst: int):
+        if rate_per_second <= 0:
+            raise ValueError("rate_per_second harus > 0")
+        if burst < 0:
+            raise ValueError("burst tidak boleh negatif")
+        self.store = store
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+
+    def admitted_count(self, opens_at: float, now: float) -> int:
+        if now < opens_at:
+            return 0
+        return self.burst + int((now - opens_at) * self.rate_per_second)
+
+    def position(self, seq: int, opens_at: float, now: float | None = None) -> dict:
+        now = time.time() if now is None else now
+        admitted = self.admitted_count(opens_at, now)
+        ahead = seq - admitted + 1
+        if ahead <= 0:
+            return {"admitted": True, "position": 0, "eta_seconds": 0}
+        # Sebelum buka: tunggu buka dulu, lalu giliran berdasarkan rate
+        wait_open = max(opens_at - now, 0)
+        if wait_open:
+            ahead = max(seq - self.burst + 1, 0)
+        return {
+            "admitted": False,
+            "position": ahead,
+            "eta_seconds": math.ceil(wait_open + ahead / self.rate_per_second),
+        }
+
+    async def join(self, event_id: int, user_id: int, opens_at: float, closes_at: float) -> dict:
+        if time.time() >= closes_at:
+            await self.store.forget(event_id)
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Penjualan tiket event ini sudah berakhir"
+            )
+        opens_at = await self.store.open(event_id, opens_at)
+        seq = await self.store.enqueue(event_id, user_id)
+        payload = {
+            "typ": QUEUE_TOKEN_TYPE,
+            "sub": str(user_id),
+            "evt": event_id,
+            "seq": seq,
+            "opn": opens_at,
+            "exp": int(time.time()) + settings.WAITING_ROOM_TOKEN_TTL_SECONDS,
+        }
+        token = jwt.encode(payload, _QUEUE_KEY, algorithm=ALGO)
+        return {"token": token, **self.position(seq, opens_at)}
+
+    def decode(self, token: str, event_id: int) -> dict:
+        try:
+            payload = jwt.decode(token, _QUEUE_KEY, algorithms=[ALGO])
+        except ExpiredSignatureError:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token antrian sudah kedaluwarsa, silakan antri ulang"
+            )
+        except JWTError:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token antrian tidak valid"
+            )
+        if payload.get("typ") != QUEUE_TOKEN_TYPE or payload.get("evt") != event_id:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token antrian tidak valid untuk event ini"
+            )
+        return payload
+
+    def status(self, token: str, event_id: int) -> dict:
+        payload = self.decode(token, event_id)
+        return self.position(payload["seq"], payload["opn"])
+
+    def admit(self, token: str | None, event_id: int, user_id: int, opens_at: float) -> dict:
+        """Cek token checkout; return payload kalau user sudah dapat giliran."""
+        if not token:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Silakan masuk antrian terlebih dahulu"
+            )
+        payload = self.decode(token, event_id)
+        if payload.get("sub") != str(user_id):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Token antrian bukan milik user ini"
+            )
+        if payload["opn"] != opens_at:
+            # Jadwal penjualan berubah setelah token dibuat; join ulang
+            # mempertahankan nomor urut
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Jadwal penjualan berubah, silakan antri ulang"
+            )
+        queue_status = self.position(payload["seq"], payload["opn"])
+        if not queue_status["admitted"]:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Belum giliran checkout",
+                headers={"Retry-After": str(max(queue_status["eta_seconds"], 1))}
+            )
+        return payload
+
+
+waiting_room = WaitingRoom(
+    InMemoryQueueStore(idle_ttl_seconds=settings.WAITING_ROOM_TOKEN_TTL_SECONDS),
+    rate_per_second=settings.WAITING_ROOM_RATE_PER_SECOND,
+    burst=settings.WAITING_ROOM_BURST,
+)
@@ -0,0 +1,171 @@
+import asyncio
+import contextlib
+import logging
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Queue pool yang mencatat waktu tunggu checkout ke `metrics`. Pool event
+    hanya terpanggil setelah koneksi didapat, jadi antrian di pool harus
+    diukur dari dalam pool. `recreate()` (dipanggil `engine.dispose()`)
+    membawa `metrics` ke pool baru.
+    """
+
+    metrics: "PoolMetrics | None" = None
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.timeouts += 1
+            raise
+        finally:
+            if self.metrics is not None:
+                self.metrics.checkout_wait.observe((time.perf_counter() - start) * 1000)
+        # Dibaca event checkout: selisihnya = pre-ping
+        record.info["acquired_at"] = time.perf_counter()
+        return record
+
+
+class PoolMetrics:
+    """
+    Instrumentasi connection pool satu engine lewat pool event (listener
+    dipasang di engine, jadi tetap jalan setelah pool dibuat ulang):
+    - checkout_wait: waktu tunggu dapat koneksi dari pool (antri saat pool
+      penuh); hanya untuk engine dengan `InstrumentedQueuePool`
+    - pre_ping: durasi ping `pool_pre_ping` per checkout
+    - hold: lama koneksi dipinjam (checkout -> checkin)
+    - gauge size / checked_out / checked_in / overflow dibaca langsung dari pool
+    """
+
+    def __init__(self, name: str, engine: AsyncEngine):
+        self.name = name
+        self.engine = engine.sync_engine
+        self.checkout_wait = Histogram()
+        self.pre_ping = Histogram()
+        self.hold = Histogram()
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.max_checked_out = 0
+        self._instrument()
+
+    @property
+    def pool(self):
+        # Selalu pool terkini: engine.dispose() mengganti object pool
+        return self.engine.pool
+
+    def _instrument(self):
+        if isinstance(self.pool, InstrumentedQueuePool):
+            self.pool.metrics = self
+
+        @event.listens_for(self.engine, "connect")
+        def _on_connect(dbapi_connection, connection_record):
+            self.connects += 1
+
+        @event.listens_for(self.engine, "checkout")
+        def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+            now = time.perf_counter()
+            acquired = connection_record.info.pop("acquired_at", None)
+            if acquired is not None:
+                self.pre_ping.observe((now - acquired) * 1000)
+            connection_record.info["checkout_at"] = now
+            checked_out = self.pool.checkedout()
+            if checked_out > self.max_checked_out:
+                self.max_checked_out = checked_out
+
+        @event.listens_for(self.engine, "checkin")
+        def _on_checkin(dbapi_connection, connection_record):
+            started = connection_record.info.pop("checkout_at", None)
+            if started is not None:
+                self.hold.observe((time.perf_counter() - started) * 1000)
+
+        @event.listens_for(self.engine, "invalidate")
+        def _on_invalidate(dbapi_connection, connection_record, exception):
+            self.invalidations += 1
+
+    def snapshot(self) -> dict:
+        pool = self.pool
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "max_checked_out": self.max_checked_out,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "timeouts": self.timeouts,
+            "checkout_wait": self.checkout_wait.snapshot(),
+            "pre_ping": self.pre_ping.snapshot(),
+            "hold": self.hold.snapshot(),
+        }
+
+
+pool_metrics: dict[str, PoolMetrics] = {}
+
+
+def instrument_engine(name: str, engine: AsyncEngine) -> PoolMetrics:
+    metrics = PoolMetrics(name, engine)
+    pool_metrics[name] = metrics
+    return metrics
+
+
+def pool_metrics_snapshot() -> dict:
+    return {name: metrics.snapshot() for name, metrics in pool_metrics.items()}
+
+
+# ==========================================
+# LOG SINK (opsional)
+# ==========================================
+_log_task: asyncio.Task | None = None
+
+
+async def _log_loop(interval: int):
+    while True:
+        await asyncio.sleep(interval)
+        for name, metrics in pool_metrics.items():
+            snap = metrics.snapshot()
+            logger.info(
+                "db_pool name=%s size=%s checked_out=%s overflow=%s max_checked_out=%s "
+                "timeouts=%s wait_p99_ms=%s pre_ping_p99_ms=%s hold_p99_ms=%s",
+                name,
+                snap["size"],
+                snap["checked_out"],
+                snap["overflow"],
+                snap["max_checked_out"],
+                snap["timeouts"],
+                snap["checkout_wait"]["p99_ms"],
+                snap["pre_ping"]["p99_ms"],
+                snap["hold"]["p99_ms"],
+            )
+
+
+def start_logging(interval: int):
+    global _log_task
+    if interval > 0 and (_log_task is None or _log_task.done()):
+        _log_task = asyncio.create_task(_log_loop(interval))
+
+
+async def stop_logging():
+    global _log_task
+    if _log_task is not None:
+        _log_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await _log_task
+        _log_task = None
@@ -0,0 +1,174 @@
+import contextlib
+import contextvars
+import logging
+import re
+import time
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+SERVER_TIMING_HEADER = "server-timing"
+
+
+class QueryStats:
+    """Jumlah statement + total waktu DB dalam satu request (atau satu blok budget)."""
+
+    def __init__(self, scope: dict | None = None):
+        self.scope = scope
+        self.count = 0
+        self.duration_ms = 0.0
+
+    @property
+    def route(self) -> str:
+        if not self.scope:
+            return "-"
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or self.scope.get("path", "-")
+
+
+_current: contextvars.ContextVar[QueryStats | None] = contextvars.ContextVar(
+    "query_stats", default=None
+)
+
+_slow_query_ms: float = 0
+
+
+# ==========================================
+# NORMALISASI SQL (untuk log slow query)
+# ==========================================
+_RE_STRING = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_RE_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_RE_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%s|%\(\w+\)s)(?:\s*,\s*(?:\?|%s|%\(\w+\)s))+\s*\)")
+_RE_SPACE = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    """Buang literal + ratakan IN (...) supaya query sejenis jadi satu bentuk."""
+    sql = _RE_STRING.sub("?", statement)
+    sql = _RE_NUMBER.sub("?", sql)
+    sql = _RE_PLACEHOLDER_LIST.sub("(?+)", sql)
+    return _RE_SPACE.sub(" ", sql).strip()
+
+
+# ==========================================
+# LISTENER ENGINE
+# ==========================================
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info["query_start"].pop()) * 1000
+    stats = _current.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration_ms += elapsed_ms
+    if _slow_query_ms and elapsed_ms >= _slow_query_ms:
+        logger.warning(
+            "slow_query ms=%.1f route=%s sql=%s",
+            elapsed_ms,
+            stats.route if stats is not None else "-",
+            normalize_sql(statement),
+        )
+
+
+def _handle_error(exception_context):
+    # Statement gagal tidak lewat after_cursor_execute; buang start time-nya
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
+
+
+def instrument_queries(engine: AsyncEngine, slow_query_ms: float = 0) -> None:
+    """
+    Pasang listener hitung query ke engine.
+    Hanya dipanggil kalau SQL_INSTRUMENTATION aktif; kalau tidak, engine
+    sama sekali tidak punya listener ini (nol overhead).
+    """
+    global _slow_query_ms
+    _slow_query_ms = slow_query_ms
+    sync_engine = engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+
+# ==========================================
+# MIDDLEWARE (pure ASGI)
+# ==========================================
+class QueryStatsMiddleware:
+    """
+    Kumpulkan QueryStats per request dan tempel sebagai header Server-Timing:
+        server-timing: db;dur=12.3;desc="4 queries"
+    Query yang jalan setelah header terkirim (mis. response streaming) tetap
+    masuk slow-query log, tapi tidak ikut terhitung di header.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(scope)
+        token = _current.set(stats)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                timing = f'db;dur={stats.duration_ms:.1f};desc="{stats.count} queries"'
+                headers = list(message.get("headers", []))
+                headers.append((SERVER_TIMING_HEADER.encode("latin-1"), timing.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+
+
+# ==========================================
+# QUERY BUDGET (untuk test)
+# ==========================================
+_RE_TIMING_COUNT = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+
+@contextlib.contextmanager
+def query_budget(max_queries: int):
+    """
+    Assert jumlah query di dalam blok tidak melebihi budget:
+
+        with query_budget(2):
+            await OrganizerMemberService.get_organizer_members_with_users(db, 1)
+
+    Butuh SQL_INSTRUMENTATION=true (kalau tidak, hitungan selalu 0).
+    """
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+    assert stats.count <= max_queries, (
+        f"Query budget terlampaui: {stats.count} query (maks {max_queries})"
+    )
+
+
+def queries_from_response(response) -> int:
+    """Ambil jumlah query dari header Server-Timing response (TestClient / httpx)."""
+    match = _RE_TIMING_COUNT.search(response.headers.get(SERVER_TIMING_HEADER, ""))
+    if match is None:
+        raise AssertionError("Header Server-Timing tidak ada; SQL_INSTRUMENTATION aktif?")
+    return int(match.group(1))
+
+
+def assert_query_budget(response, max_queries: int) -> None:
+    """Assert endpoint tidak melebihi budget query, mis. members list <= 2."""
+    count = queries_from_response(response)
+    assert count <= max_queries, (
+        f"Query budget terlampaui: {count} query (maks {max_queries})"
+    )
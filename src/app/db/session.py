@@ -1,14 +1,212 @@
+import asyncio
+import contextlib
+import hashlib
+import itertools
+import logging
+
+from cachetools import TTLCache
+from fastapi import Request
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import Session
 from app.core.config import settings
+from app.db.pool_metrics import InstrumentedQueuePool, instrument_engine
+from app.db.query_stats import instrument_queries
+
+logger = logging.getLogger(__name__)
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
+ENGINE_OPTIONS = dict(
+    poolclass=InstrumentedQueuePool,
     pool_pre_ping=True,
     pool_size=10,
     max_overflow=20,
 )
-AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
 
-async def get_session() -> AsyncSession:
-    async with AsyncSessionLocal() as s:
-        yield s
+engine = create_async_engine(settings.DATABASE_URL, **ENGINE_OPTIONS)
+
+
+class PrimarySession(Session):
+    """Session ke primary; dipakai untuk melacak write (read-your-writes)."""
+
+
+AsyncSessionLocal = async_sessionmaker(
+    engine, expire_on_commit=False, class_=AsyncSession, sync_session_class=PrimarySession
+)
+
+replica_engines = [
+    create_async_engine(url, **ENGINE_OPTIONS) for url in settings.DATABASE_REPLICA_URLS
+]
+
+# Histogram/gauge pool per engine (lihat GET /system/metrics/db-pool)
+instrument_engine("primary", engine)
+for i, replica in enumerate(replica_engines):
+    instrument_engine(f"replica-{i}", replica)
+
+# Hitung query per request + slow-query log (mati = tanpa listener sama sekali)
+if settings.SQL_INSTRUMENTATION:
+    for e in (engine, *replica_engines):
+        instrument_queries(e, slow_query_ms=settings.SLOW_QUERY_MS)
+
+ReplicaSessionLocals = [
+    async_sessionmaker(e, expire_on_commit=False, class_=AsyncSession) for e in replica_engines
+]
+
+
+def rw_key(request: Request) -> str | None:
+    """Kunci read-your-writes: digest bearer token (satu sesi login)."""
+    auth = request.headers.get("authorization")
+    if not auth:
+        return None
+    return hashlib.sha256(auth.encode("utf-8")).hexdigest()
+
+
+async def _replica_lag(conn) -> float | None:
+    """Lag replica dalam detik. None = replikasi berhenti / tidak diketahui."""
+    if conn.dialect.name != "mysql":
+        # Stand-in lokal (mis. SQLite): cukup cek koneksi hidup
+        await conn.exec_driver_sql("SELECT 1")
+        return 0
+    result = await conn.exec_driver_sql("SHOW REPLICA STATUS")
+    row = result.mappings().first()
+    if row is None:
+        # Bukan replica (mis. testing lokal pakai DB biasa)
+        return 0
+    lag = row.get("Seconds_Behind_Source", row.get("Seconds_Behind_Master"))
+    return float(lag) if lag is not None else None
+
+
+class ReplicaRouter:
+    """
+    Pilih sessionmaker untuk query read-only:
+    - Client yang baru write (dalam READ_YOUR_WRITES_SECONDS) -> primary.
+    - Selain itu round-robin ke replica yang sehat.
+    - Tidak ada replica sehat (down / lag kebesaran) -> fallback ke primary.
+    """
+
+    def __init__(self, engines, sessionmakers):
+        self._engines = engines
+        self._sessionmakers = sessionmakers
+        self._healthy = [True] * len(engines)
+        self._rr = itertools.count()
+        self._recent_writers: TTLCache = TTLCache(
+            maxsize=100_000, ttl=settings.READ_YOUR_WRITES_SECONDS
+        )
+        self._task: asyncio.Task | None = None
+
+    def mark_write(self, key: str | None) -> None:
+        if key:
+            self._recent_writers[key] = True
+
+    def choose(self, key: str | None) -> async_sessionmaker:
+        if key and key in self._recent_writers:
+            return AsyncSessionLocal
+        healthy = [i for i, ok in enumerate(self._healthy) if ok]
+        if not healthy:
+            return AsyncSessionLocal
+        return self._sessionmakers[healthy[next(self._rr) % len(healthy)]]
+
+    async def check_health(self) -> None:
+        for i, replica in enumerate(self._engines):
+            try:
+                async with replica.connect() as conn:
+                    lag = await _replica_lag(conn)
+                healthy = lag is not None and lag <= settings.REPLICA_MAX_LAG_SECONDS
+            except Exception:
+                logger.warning("Health check replica #%s gagal", i, exc_info=True)
+                healthy = False
+            if healthy != self._healthy[i]:
+                logger.warning("Replica #%s sekarang %s", i, "sehat" if healthy else "tidak sehat")
+            self._healthy[i] = healthy
+
+    async def _health_loop(self):
+        while True:
+            await self.check_health()
+            await asyncio.sleep(settings.REPLICA_HEALTH_CHECK_SECONDS)
+
+    def start(self):
+        if self._engines and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._health_loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+
+replica_router = ReplicaRouter(replica_engines, ReplicaSessionLocals)
+
+
+# ==========================================
+# TRACKING WRITE DI PRIMARY
+# ==========================================
+@event.listens_for(PrimarySession, "after_flush")
+def _mark_flush(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(PrimarySession, "do_orm_execute")
+def _mark_dml(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(PrimarySession, "after_commit")
+def _after_commit(session):
+    if session.info.pop("wrote", False):
+        replica_router.mark_write(session.info.get("rw_key"))
+
+
+@event.listens_for(PrimarySession, "after_rollback")
+def _after_rollback(session):
+    session.info.pop("wrote", None)
+
+
+class LazySession:
+    """
+    Proxy AsyncSession yang baru dibuat saat pertama kali dipakai.
+
+    Request yang ternyata tidak butuh SQL (cache hit, dsb) tidak pernah
+    membuat session, apalagi meminjam koneksi dari pool.
+    """
+
+    def __init__(self, factory: async_sessionmaker, info: dict | None = None):
+        self._factory = factory
+        self._info = info or {}
+        self._session: AsyncSession | None = None
+
+    def _get(self) -> AsyncSession:
+        if self._session is None:
+            self._session = self._factory()
+            self._session.info.update(self._info)
+        return self._session
+
+    def __getattr__(self, name):
+        return getattr(self._get(), name)
+
+    @property
+    def started(self) -> bool:
+        return self._session is not None
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+async def get_session(request: Request) -> AsyncSession:
+    session = LazySession(AsyncSessionLocal, {"rw_key": rw_key(request)})
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
+async def get_read_session(request: Request) -> AsyncSession:
+    """Session untuk handler read-only; diarahkan ke replica kalau aman."""
+    session = LazySession(replica_router.choose(rw_key(request)))
+    try:
+        yield session
+    finally:
+        await session.close()
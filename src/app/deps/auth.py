@@ -1,7 +1,10 @@
 from typing import Annotated
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from cachetools import TTLCache
+from sqlalchemy import inspect as sa_inspect
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
 from app.core.config import settings
 from app.models.user import User, UserStatus
@@ -17,6 +20,32 @@ credential_exception = HTTPException(
     headers={"WWW-Authenticate": "Bearer"},
 )
 
+# ==========================================
+# PRINCIPAL CACHE (per proses)
+# ==========================================
+# user_id -> snapshot kolom User. Cache hit tidak menyentuh DB sama sekali
+# (AsyncSession baru ambil koneksi dari pool saat query pertama).
+_principal_cache: TTLCache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+def _user_snapshot(user: User) -> dict:
+    return {attr.key: getattr(user, attr.key) for attr in sa_inspect(User).column_attrs}
+
+
+def _user_from_snapshot(data: dict) -> User:
+    # Instance baru per request (detached), jadi aman di-`db.add()` oleh handler
+    user = User(**data)
+    make_transient_to_detached(user)
+    return user
+
+
+def invalidate_principal(user_id: int) -> None:
+    """Panggil setelah data User berubah (status, role, profil)."""
+    _principal_cache.pop(user_id, None)
+
 
 async def get_current_user(
     token_auth: Annotated[HTTPAuthorizationCredentials, Depends(security)],
@@ -29,9 +58,14 @@ async def get_current_user(
     if user_id is None:
         raise credential_exception
     
-    user = await db.get(User, int(user_id))
-    if not user:
-        raise credential_exception
+    cached = _principal_cache.get(int(user_id))
+    if cached is not None:
+        user = _user_from_snapshot(cached)
+    else:
+        user = await db.get(User, int(user_id))
+        if not user:
+            raise credential_exception
+        _principal_cache[user.id] = _user_snapshot(user)
     
     if user.user_status != UserStatus.ACTIVE:
         raise HTTPException(
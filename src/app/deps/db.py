@@ -1,6 +1,12 @@
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.session import get_session
+from app.db.session import get_session, get_read_session
 
-async def get_db(session: AsyncSession = Depends(get_session)):
+# scope="function": session ditutup (koneksi balik ke pool) begitu handler
+# selesai, tidak menunggu response selesai dikirim ke client.
+async def get_db(session: AsyncSession = Depends(get_session, scope="function")):
+    return session
+
+async def get_read_db(session: AsyncSession = Depends(get_read_session, scope="function")):
+    """Session read-only (replica kalau tersedia). Jangan dipakai untuk write."""
     return session
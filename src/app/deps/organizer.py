@@ -8,6 +8,7 @@ from app.models.user import User
 from app.models.organizer import Organizer
 from app.models.organizer_member import OrganizerMember, Role, Status as MemberStatus
 from app.services.organizer_service import OrganizerService
+from app.services.organizer_member_service import OrganizerMemberService
 
 
 async def get_organizer_by_id(
@@ -19,16 +20,23 @@ async def get_organizer_by_id(
 
 
 async def get_user_organizer_membership(
-    organizer: Annotated[Organizer, Depends(get_organizer_by_id)],
+    organizer_id: int,
     current_user: Annotated[User, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)]
 ) -> OrganizerMember:
-    """Cek apakah user adalah member dari organizer"""
-    from app.services.organizer_member_service import OrganizerMemberService
-    
-    member = await OrganizerMemberService.get_member(
-        db, organizer.id, current_user.id
+    """
+    Cek apakah user adalah member dari organizer.
+    Organizer + membership dicek dalam satu query yang di-cache.
+    """
+    membership = await OrganizerMemberService.get_membership(
+        db, organizer_id, current_user.id
     )
+    if membership is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Organizer tidak ditemukan"
+        )
+    _, member = membership
     
     if not member or member.status != MemberStatus.ACTIVE:
         raise HTTPException(
@@ -0,0 +1,24 @@
+from typing import Annotated
+from fastapi import Depends, Header
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.deps.auth import get_current_user
+from app.deps.db import get_read_db
+from app.core.waiting_room import waiting_room
+from app.models.user import User
+from app.services.event_service import EventService
+
+
+async def require_checkout_admission(
+    event_id: int,
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_read_db)],
+    x_queue_token: Annotated[str | None, Header()] = None
+) -> dict:
+    """
+    Dependency endpoint checkout: user harus sudah dapat giliran di waiting
+    room event ini. Giliran dihitung dari token; jadwal penjualan dari cache
+    EventService (query hanya saat cache kosong).
+    """
+    opens_at, _ = await EventService.get_sale_window(db, event_id)
+    return waiting_room.admit(x_queue_token, event_id, current_user.id, opens_at)
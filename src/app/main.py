@@ -1,10 +1,55 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import ORJSONResponse
 from app.core.config import settings
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.google_auth import google_verifier
+from app.core import idempotency, qr
+from app.core.idempotency import IdempotencyMiddleware
+from app.db import pool_metrics
+from app.db.query_stats import QueryStatsMiddleware
+from app.db.session import replica_router
+from app.services import inventory_service, order_expiry_service
 from app.api.v1.router import api_router
 
-app = FastAPI(title=settings.APP_NAME, default_response_class=ORJSONResponse)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Refresh cert Google di background (hanya mode production)
+    if settings.GOOGLE_CLIENT_ID:
+        google_verifier.start()
+    # Health check replica (no-op kalau DATABASE_REPLICA_URLS kosong)
+    replica_router.start()
+    # Log metrics pool berkala (0 = mati)
+    pool_metrics.start_logging(settings.DB_POOL_METRICS_LOG_SECONDS)
+    # Sinkron sold_count ticket type sharded dari SUM shard (0 = mati)
+    inventory_service.start_refresh(settings.INVENTORY_REFRESH_SECONDS)
+    # Expire order pending + kembalikan kuota (0 = mati)
+    order_expiry_service.start_sweeper(
+        settings.ORDER_EXPIRY_SWEEP_SECONDS,
+        settings.ORDER_EXPIRY_BATCH_SIZE,
+        settings.ORDER_EXPIRY_MAX_BATCHES,
+    )
+    # Hapus Idempotency-Key kedaluwarsa (0 = mati)
+    idempotency.start_purge(settings.IDEMPOTENCY_PURGE_SECONDS)
+    # Daftar QR tiket void/refunded untuk verifikasi di gate (0 = mati)
+    qr.start_revocation_refresh(settings.QR_REVOCATION_REFRESH_SECONDS)
+    yield
+    await qr.stop_revocation_refresh()
+    await idempotency.stop_purge()
+    await order_expiry_service.stop_sweeper()
+    await inventory_service.stop_refresh()
+    await pool_metrics.stop_logging()
+    await replica_router.stop()
+    await google_verifier.stop()
+
+
+app = FastAPI(title=settings.APP_NAME, default_response_class=ORJSONResponse, lifespan=lifespan)
+
+# Replay response untuk request mutasi dengan header Idempotency-Key
+# (di dalam CORS, supaya header CORS tidak ikut tersimpan)
+app.add_middleware(IdempotencyMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -12,6 +57,11 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "Idempotent-Replayed"],
 )
 
+# Server-Timing (jumlah query + waktu DB) per request
+if settings.SQL_INSTRUMENTATION:
+    app.add_middleware(QueryStatsMiddleware)
+
 app.include_router(api_router, prefix="/api/v1")
@@ -13,3 +13,5 @@ from .payment import Payment
 from .payout import Payout
 from .payout_line import PayoutLine
 from .promo_code import PromoCode
+from .ticket_type_shard import TicketTypeShard
+from .idempotency_key import IdempotencyKey
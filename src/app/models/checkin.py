@@ -1,7 +1,7 @@
 import enum
 from datetime import datetime
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, DateTime, ForeignKey, JSON
+from sqlalchemy import String, DateTime, ForeignKey, JSON, Index
 from sqlalchemy.dialects.mysql import BIGINT, VARCHAR, ENUM, DATETIME, JSON as MYSQL_JSON
 from app.db.base import Base
 
@@ -15,6 +15,9 @@ class CheckinResult(str, enum.Enum):
 
 class Checkin(Base):
     __tablename__ = "checkins"
+    __table_args__ = (
+        Index('ix_checkins_ticket_id_scanned_at', 'ticket_id', 'scanned_at'),
+    )
 
     id: Mapped[int] = mapped_column(
         BIGINT(unsigned=True),
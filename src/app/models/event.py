@@ -1,7 +1,7 @@
 import enum
 from datetime import datetime
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, DateTime, ForeignKey, Text, Boolean
+from sqlalchemy import String, DateTime, ForeignKey, Text, Boolean, Index
 from sqlalchemy.dialects.mysql import BIGINT, VARCHAR, ENUM, DATETIME, TEXT, CHAR, BOOLEAN
 from app.db.base import Base
 
@@ -17,6 +17,9 @@ class EventVisibility(str, enum.Enum):
 
 class Event(Base):
     __tablename__ = "events"
+    __table_args__ = (
+        Index('ix_events_organizer_id_visibility_start_at', 'organizer_id', 'visibility', 'start_at'),
+    )
 
     id: Mapped[int] = mapped_column(
         BIGINT(unsigned=True),
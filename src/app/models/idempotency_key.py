@@ -0,0 +1,76 @@
+import enum
+from datetime import datetime
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import ForeignKey, Index
+from sqlalchemy.dialects.mysql import BIGINT, VARCHAR, ENUM, DATETIME, BINARY, SMALLINT, JSON as MYSQL_JSON, MEDIUMBLOB
+from app.db.base import Base
+
+
+class IdempotencyStatus(str, enum.Enum):
+    PROCESSING = 'processing'
+    COMPLETED = 'completed'
+
+
+class IdempotencyKey(Base):
+    """Response tersimpan per (user, Idempotency-Key) untuk replay request ulang."""
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        # Purge row kedaluwarsa
+        Index('ix_idempotency_keys_expires_at', 'expires_at'),
+    )
+
+    user_id: Mapped[int] = mapped_column(
+        BIGINT(unsigned=True),
+        ForeignKey('users.id', ondelete="CASCADE"),
+        primary_key=True
+    )
+
+    idem_key: Mapped[str] = mapped_column(
+        VARCHAR(100),
+        primary_key=True
+    )
+
+    # sha256(method + path + query + body)
+    request_hash: Mapped[bytes] = mapped_column(
+        BINARY(32),
+        nullable=False
+    )
+
+    # Acak per klaim: simpan / lepas hanya oleh request pemilik klaim
+    claim_token: Mapped[bytes] = mapped_column(
+        BINARY(16),
+        nullable=False
+    )
+
+    status: Mapped[str] = mapped_column(
+        ENUM(IdempotencyStatus, name='idempotency_status'),
+        nullable=False
+    )
+
+    response_status: Mapped[int] = mapped_column(
+        SMALLINT(unsigned=True),
+        nullable=True
+    )
+
+    response_headers: Mapped[list] = mapped_column(
+        MYSQL_JSON,
+        nullable=True
+    )
+
+    response_body: Mapped[bytes] = mapped_column(
+        MEDIUMBLOB,
+        nullable=True
+    )
+
+    created_at: Mapped[datetime] = mapped_column(
+        DATETIME,
+        default=datetime.utcnow,
+        nullable=False
+    )
+
+    # PROCESSING: batas waktu klaim (proses crash -> boleh diambil ulang)
+    # COMPLETED: batas waktu replay
+    expires_at: Mapped[datetime] = mapped_column(
+        DATETIME,
+        nullable=False
+    )
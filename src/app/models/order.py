@@ -2,7 +2,7 @@ import enum
 from datetime import datetime
 from decimal import Decimal
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, DateTime, ForeignKey, Numeric
+from sqlalchemy import String, DateTime, ForeignKey, Numeric, Index
 from sqlalchemy.dialects.mysql import BIGINT, VARCHAR, ENUM, DATETIME, DECIMAL, CHAR
 from app.db.base import Base
 
@@ -17,6 +17,12 @@ class OrderStatus(str, enum.Enum):
 
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        Index('ix_orders_event_id_status', 'event_id', 'status'),
+        Index('ix_orders_buyer_user_id_created_at', 'buyer_user_id', 'created_at'),
+        # Sweeper order expired: status = pending AND expires_at < now
+        Index('ix_orders_status_expires_at', 'status', 'expires_at'),
+    )
 
     id: Mapped[int] = mapped_column(
         BIGINT(unsigned=True),
@@ -41,6 +47,13 @@ class Order(Base):
         nullable=False
     )
 
+    # Promo yang dipakai; used_count dikembalikan kalau order expired
+    promo_code_id: Mapped[int] = mapped_column(
+        BIGINT(unsigned=True),
+        ForeignKey('promo_codes.id'),
+        nullable=True
+    )
+
     order_code: Mapped[str] = mapped_column(
         VARCHAR(40),
         unique=True,
@@ -1,13 +1,17 @@
 from datetime import datetime
 from decimal import Decimal
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, DateTime, ForeignKey, Integer, Numeric
+from sqlalchemy import String, DateTime, ForeignKey, Integer, Numeric, Index
 from sqlalchemy.dialects.mysql import BIGINT, DATETIME, DECIMAL, INTEGER
 from app.db.base import Base
 
 
 class OrderItem(Base):
     __tablename__ = "order_items"
+    __table_args__ = (
+        # Covering: qty per order / ticket type tanpa baca row
+        Index('ix_order_items_order_id', 'order_id', 'ticket_type_id', 'qty'),
+    )
 
     id: Mapped[int] = mapped_column(
         BIGINT(unsigned=True),
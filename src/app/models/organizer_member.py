@@ -1,7 +1,7 @@
 import enum
 from datetime import date, datetime
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, DateTime, ForeignKey, Integer, Date
+from sqlalchemy import String, DateTime, ForeignKey, Integer, Date, Index
 from sqlalchemy.dialects.mysql import BIGINT, VARCHAR, ENUM, DATETIME
 from app.db.base import Base
 
@@ -18,6 +18,9 @@ class Status(str, enum.Enum):
 
 class OrganizerMember(Base):
     __tablename__ = 'organizer_members'
+    __table_args__ = (
+        Index('ix_organizer_members_user_id_status', 'user_id', 'status'),
+    )
 
     organizer_id: Mapped[int] = mapped_column(
         BIGINT(unsigned=True),
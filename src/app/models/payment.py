@@ -2,7 +2,7 @@ import enum
 from datetime import datetime
 from decimal import Decimal
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, DateTime, ForeignKey, Numeric, JSON
+from sqlalchemy import String, DateTime, ForeignKey, Numeric, JSON, Index
 from sqlalchemy.dialects.mysql import BIGINT, VARCHAR, ENUM, DATETIME, DECIMAL, JSON as MYSQL_JSON
 from app.db.base import Base
 
@@ -18,6 +18,9 @@ class PaymentStatus(str, enum.Enum):
 
 class Payment(Base):
     __tablename__ = "payments"
+    __table_args__ = (
+        Index('ix_payments_payment_ref', 'payment_ref'),
+    )
 
     id: Mapped[int] = mapped_column(
         BIGINT(unsigned=True),
@@ -1,7 +1,7 @@
 import enum
 from datetime import datetime
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, DateTime, ForeignKey
+from sqlalchemy import String, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.mysql import BIGINT, VARCHAR, ENUM, DATETIME
 from app.db.base import Base
 
@@ -15,6 +15,10 @@ class TicketStatusEnum(str, enum.Enum):
 
 class Ticket(Base):
     __tablename__ = "tickets"
+    __table_args__ = (
+        # Refresh daftar revoke QR (void / refunded)
+        Index('ix_tickets_status', 'status'),
+    )
 
     id: Mapped[int] = mapped_column(
         BIGINT(unsigned=True),
@@ -33,6 +37,7 @@ class Ticket(Base):
         nullable=False
     )
 
+    # Token bertanda tangan (app.core.qr), bisa diverifikasi tanpa query
     qr_token: Mapped[str] = mapped_column(
         VARCHAR(255),
         unique=True,
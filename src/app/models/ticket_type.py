@@ -63,6 +63,15 @@ class TicketType(Base):
         nullable=False
     )
 
+    # 0 = counter tunggal di sold_count; N = kuota dipecah ke N row
+    # ticket_type_shards (untuk tier yang sangat ramai)
+    inventory_shards: Mapped[int] = mapped_column(
+        INTEGER,
+        default=0,
+        server_default='0',
+        nullable=False
+    )
+
     status: Mapped[str] = mapped_column(
         ENUM(TicketStatus, name='ticket_status'),
         default='active',
@@ -93,3 +102,9 @@ class TicketType(Base):
         back_populates='ticket_type',
         cascade='all, delete-orphan'
     )
+
+    shards = relationship(
+        'TicketTypeShard',
+        back_populates='ticket_type',
+        cascade='all, delete-orphan'
+    )
@@ -0,0 +1,47 @@
+from datetime import datetime
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import ForeignKey
+from sqlalchemy.dialects.mysql import BIGINT, INTEGER, SMALLINT, DATETIME
+from app.db.base import Base
+
+
+class TicketTypeShard(Base):
+    """
+    Pecahan kuota TicketType (mode sharded counter).
+    SUM(quota) = TicketType.quota, SUM(sold_count) = sold_count sebenarnya.
+    """
+    __tablename__ = "ticket_type_shards"
+
+    ticket_type_id: Mapped[int] = mapped_column(
+        BIGINT(unsigned=True),
+        ForeignKey('ticket_types.id', ondelete="CASCADE"),
+        primary_key=True
+    )
+
+    shard_no: Mapped[int] = mapped_column(
+        SMALLINT(unsigned=True),
+        primary_key=True
+    )
+
+    quota: Mapped[int] = mapped_column(
+        INTEGER,
+        nullable=False
+    )
+
+    sold_count: Mapped[int] = mapped_column(
+        INTEGER,
+        default=0,
+        nullable=False
+    )
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DATETIME,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        nullable=False
+    )
+
+    ticket_type = relationship(
+        'TicketType',
+        back_populates='shards'
+    )
@@ -1,7 +1,7 @@
 import enum
 from datetime import date, datetime
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, DateTime, ForeignKey, Integer, Date
+from sqlalchemy import String, DateTime, ForeignKey, Integer, Date, Index
 from sqlalchemy.dialects.mysql import BIGINT, VARCHAR, ENUM, DATETIME
 from app.db.base import Base
 
@@ -17,6 +17,16 @@ class UserStatus(str, enum.Enum):
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        Index('ix_users_full_name', 'full_name'),
+        Index(
+            'ft_users_search',
+            'full_name',
+            'email',
+            mysql_prefix='FULLTEXT',
+            mysql_with_parser='ngram'
+        ),
+    )
 
     id: Mapped[int] = mapped_column(
         BIGINT(unsigned=True),
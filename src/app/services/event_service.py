@@ -0,0 +1,60 @@
+from datetime import datetime, timezone
+from cachetools import TTLCache
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
+from fastapi import HTTPException, status
+from app.core.config import settings
+from app.models.event import Event
+from app.models.ticket_type import TicketType
+
+
+# event_id -> (epoch buka, epoch tutup) penjualan: sale_start_at paling awal
+# & sale_end_at paling akhir semua ticket type
+_sale_window_cache: TTLCache = TTLCache(
+    maxsize=10000,
+    ttl=settings.EVENT_SALE_CACHE_TTL_SECONDS,
+)
+
+
+def _epoch(value: datetime) -> float:
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+class EventService:
+    @staticmethod
+    async def get_sale_window(
+        db: AsyncSession,
+        event_id: int
+    ) -> tuple[float, float]:
+        """
+        Epoch (UTC) tiket pertama event mulai dijual & tiket terakhir berhenti
+        dijual. Di-cache supaya lonjakan join antrian tidak menembak MySQL;
+        jadwal yang diubah terbaca lagi setelah TTL cache.
+        """
+        window = _sale_window_cache.get(event_id)
+        if window is not None:
+            return window
+
+        result = await db.execute(
+            select(Event.id, func.min(TicketType.sale_start_at), func.max(TicketType.sale_end_at))
+            .outerjoin(TicketType, TicketType.event_id == Event.id)
+            .where(Event.id == event_id)
+            .group_by(Event.id)
+        )
+        row = result.first()
+        if row is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Event tidak ditemukan"
+            )
+        _, sale_start, sale_end = row
+        if sale_start is None:
+            # Belum ada ticket type: jangan di-cache, supaya antrian langsung
+            # ikut jadwal begitu ticket type ditambahkan
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Penjualan tiket event ini belum dijadwalkan"
+            )
+        window = (_epoch(sale_start), _epoch(sale_end))
+        _sale_window_cache[event_id] = window
+        return window
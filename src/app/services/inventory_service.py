@@ -0,0 +1,474 @@
+import asyncio
+import contextlib
+import logging
+import random
+from cachetools import TTLCache
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, delete, insert, func
+from fastapi import HTTPException, status
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.ticket_type import TicketType, TicketStatus
+from app.models.ticket_type_shard import TicketTypeShard
+
+logger = logging.getLogger(__name__)
+
+# Mode inventory per ticket type: id -> inventory_shards (0 = row tunggal).
+# Basi sebentar tidak masalah: UPDATE row tunggal mensyaratkan
+# inventory_shards = 0, dan jalur shard cek ulang kalau shard-nya hilang.
+_shard_mode_cache: TTLCache = TTLCache(
+    maxsize=10000,
+    ttl=settings.INVENTORY_SHARD_MODE_TTL_SECONDS,
+)
+
+
+class InventoryService:
+    """
+    Reservasi kuota TicketType tanpa read-modify-write.
+
+    Mode row tunggal: satu UPDATE bersyarat per ticket type; cek kuota,
+    max_per_order, status, dan jendela penjualan terjadi di statement yang
+    sama dengan penambahan sold_count, jadi tidak mungkin oversell.
+
+    Mode sharded (inventory_shards > 0): kuota dipecah ke N row
+    ticket_type_shards. Reservasi mengambil shard acak yang masih muat,
+    jadi lock tersebar ke N row. sold_count di ticket_types di-refresh
+    berkala dari SUM shard.
+
+    Row lock dipegang sampai transaksi caller commit, jadi commit secepatnya
+    setelah order dibuat.
+    """
+
+    # Ulang UPDATE sekali kalau baca klasifikasi ternyata lihat kuota cukup
+    # (ada release di antara UPDATE dan SELECT); row sudah di-lock, jadi
+    # UPDATE ulang pasti berhasil
+    MAX_ATTEMPTS = 2
+    # Berapa shard acak yang dicoba sebelum rebalance
+    SHARD_ATTEMPTS = 3
+
+    # ==========================================
+    # STATE & VALIDASI
+    # ==========================================
+    @staticmethod
+    async def _load_state(db: AsyncSession, ticket_type_id: int, locking: bool = False):
+        """
+        Baca state ticket type. Default consistent read biasa (tanpa lock).
+
+        `locking=True` untuk klasifikasi setelah UPDATE bersyarat gagal:
+        consistent read bisa melihat snapshot lama transaksi ini (kuota
+        masih ada) padahal UPDATE sudah melihat data terbaru (habis).
+        FOR UPDATE, bukan FOR SHARE: kalau ternyata kuota cukup, UPDATE
+        ulang tidak perlu upgrade lock S -> X (deadlock antar request).
+        """
+        now = func.utc_timestamp()
+        query = select(
+            TicketType.quota,
+            TicketType.sold_count,
+            TicketType.max_per_order,
+            TicketType.status,
+            TicketType.inventory_shards,
+            (TicketType.sale_start_at > now).label("not_started"),
+            (TicketType.sale_end_at < now).label("ended"),
+        ).where(TicketType.id == ticket_type_id)
+        if locking:
+            query = query.with_for_update()
+        result = await db.execute(query)
+        row = result.first()
+        if row is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Tipe tiket tidak ditemukan"
+            )
+        _shard_mode_cache[ticket_type_id] = row.inventory_shards
+        return row
+
+    @staticmethod
+    def _check_sellable(state, qty: int) -> None:
+        if qty > state.max_per_order:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Maksimal {state.max_per_order} tiket per order"
+            )
+        if state.status != TicketStatus.ACTIVE or state.not_started or state.ended:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Tiket sedang tidak dijual"
+            )
+
+    @staticmethod
+    def _raise_insufficient(remaining: int, qty: int) -> None:
+        if remaining <= 0:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Tiket habis"
+            )
+        if remaining < qty:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Sisa tiket tinggal {remaining}"
+            )
+
+    @staticmethod
+    def _busy() -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Tiket sedang ramai, coba lagi"
+        )
+
+    @staticmethod
+    async def _shard_count(db: AsyncSession, ticket_type_id: int) -> int:
+        shards = _shard_mode_cache.get(ticket_type_id)
+        if shards is None:
+            result = await db.execute(
+                select(TicketType.inventory_shards).where(TicketType.id == ticket_type_id)
+            )
+            shards = result.scalar_one_or_none() or 0
+            _shard_mode_cache[ticket_type_id] = shards
+        return shards
+
+    # ==========================================
+    # RESERVE
+    # ==========================================
+    @staticmethod
+    async def reserve(
+        db: AsyncSession,
+        ticket_type_id: int,
+        qty: int
+    ) -> None:
+        """Ambil `qty` kuota. Tidak commit; ikut transaksi pembuatan order."""
+        if qty < 1:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Jumlah tiket minimal 1"
+            )
+
+        if await InventoryService._shard_count(db, ticket_type_id):
+            await InventoryService._reserve_sharded(db, ticket_type_id, qty)
+            return
+
+        now = func.utc_timestamp()
+        stmt = (
+            update(TicketType)
+            .where(
+                TicketType.id == ticket_type_id,
+                TicketType.inventory_shards == 0,
+                TicketType.status == TicketStatus.ACTIVE,
+                TicketType.max_per_order >= qty,
+                TicketType.sold_count + qty <= TicketType.quota,
+                TicketType.sale_start_at <= now,
+                TicketType.sale_end_at >= now,
+            )
+            .values(sold_count=TicketType.sold_count + qty)
+            .execution_options(synchronize_session=False)
+        )
+        for _ in range(InventoryService.MAX_ATTEMPTS):
+            result = await db.execute(stmt)
+            if result.rowcount == 1:
+                return
+            state = await InventoryService._load_state(db, ticket_type_id, locking=True)
+            InventoryService._check_sellable(state, qty)
+            if state.inventory_shards:
+                # Baru saja dipindah ke mode sharded
+                await InventoryService._reserve_sharded(db, ticket_type_id, qty, state)
+                return
+            InventoryService._raise_insufficient(state.quota - state.sold_count, qty)
+
+        raise InventoryService._busy()
+
+    @staticmethod
+    async def _reserve_sharded(
+        db: AsyncSession,
+        ticket_type_id: int,
+        qty: int,
+        state=None
+    ) -> None:
+        # Status/jendela jual dicek dari read biasa: ticket_types tidak
+        # disentuh sama sekali di jalur ini supaya tidak jadi hot row lagi
+        if state is None:
+            state = await InventoryService._load_state(db, ticket_type_id)
+            InventoryService._check_sellable(state, qty)
+
+        result = await db.execute(
+            select(TicketTypeShard.shard_no).where(
+                TicketTypeShard.ticket_type_id == ticket_type_id,
+                TicketTypeShard.quota - TicketTypeShard.sold_count >= qty
+            )
+        )
+        candidates = list(result.scalars().all())
+        random.shuffle(candidates)
+
+        for shard_no in candidates[:InventoryService.SHARD_ATTEMPTS]:
+            result = await db.execute(
+                update(TicketTypeShard)
+                .where(
+                    TicketTypeShard.ticket_type_id == ticket_type_id,
+                    TicketTypeShard.shard_no == shard_no,
+                    TicketTypeShard.sold_count + qty <= TicketTypeShard.quota
+                )
+                .values(sold_count=TicketTypeShard.sold_count + qty)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 1:
+                return
+
+        await InventoryService._reserve_rebalanced(db, ticket_type_id, qty)
+
+    @staticmethod
+    async def _reserve_rebalanced(
+        db: AsyncSession,
+        ticket_type_id: int,
+        qty: int
+    ) -> None:
+        """
+        Tidak ada shard yang muat `qty`: kunci semua shard (urut shard_no),
+        ambil qty dari total sisa, lalu ratakan sisa kapasitas ke semua shard.
+        """
+        result = await db.execute(
+            select(TicketTypeShard)
+            .where(TicketTypeShard.ticket_type_id == ticket_type_id)
+            .order_by(TicketTypeShard.shard_no)
+            .with_for_update()
+        )
+        shards = result.scalars().all()
+        if not shards:
+            # Sharding baru saja dimatikan
+            _shard_mode_cache.pop(ticket_type_id, None)
+            state = await InventoryService._load_state(db, ticket_type_id)
+            if state.inventory_shards:
+                raise InventoryService._busy()
+            await InventoryService.reserve(db, ticket_type_id, qty)
+            return
+
+        free = sum(s.quota - s.sold_count for s in shards)
+        InventoryService._raise_insufficient(free, qty)
+
+        InventoryService._rebalance(shards, free - qty, extra_sold=qty)
+        await db.flush()
+
+    @staticmethod
+    def _rebalance(shards, free: int, extra_sold: int = 0) -> None:
+        """Set quota tiap shard = sold + bagian rata dari `free` (total quota tetap)."""
+        shards[0].sold_count += extra_sold
+        share, remainder = divmod(free, len(shards))
+        for i, shard in enumerate(shards):
+            shard.quota = shard.sold_count + share + (1 if i < remainder else 0)
+
+    @staticmethod
+    async def reserve_many(
+        db: AsyncSession,
+        items: dict[int, int]
+    ) -> None:
+        """
+        Reservasi beberapa ticket type ({ticket_type_id: qty}) dalam satu
+        transaksi. Diurutkan per id supaya urutan lock selalu sama antar
+        request (tidak deadlock).
+        """
+        for ticket_type_id in sorted(items):
+            await InventoryService.reserve(db, ticket_type_id, items[ticket_type_id])
+
+    # ==========================================
+    # RELEASE
+    # ==========================================
+    @staticmethod
+    async def release(
+        db: AsyncSession,
+        ticket_type_id: int,
+        qty: int
+    ) -> None:
+        """Kembalikan kuota (order batal / expired). Tidak commit."""
+        if await InventoryService._shard_count(db, ticket_type_id):
+            if await InventoryService._release_sharded(db, ticket_type_id, qty):
+                return
+
+        await db.execute(
+            update(TicketType)
+            .where(
+                TicketType.id == ticket_type_id,
+                TicketType.sold_count >= qty
+            )
+            .values(sold_count=TicketType.sold_count - qty)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    async def _release_sharded(
+        db: AsyncSession,
+        ticket_type_id: int,
+        qty: int
+    ) -> bool:
+        """False = ticket type ternyata tidak punya shard (pakai row tunggal)."""
+        result = await db.execute(
+            update(TicketTypeShard)
+            .where(
+                TicketTypeShard.ticket_type_id == ticket_type_id,
+                TicketTypeShard.sold_count >= qty
+            )
+            .values(sold_count=TicketTypeShard.sold_count - qty)
+            .with_dialect_options(mysql_limit=1)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 1:
+            return True
+
+        # qty tersebar di beberapa shard: kurangi satu-satu di bawah lock
+        result = await db.execute(
+            select(TicketTypeShard)
+            .where(TicketTypeShard.ticket_type_id == ticket_type_id)
+            .order_by(TicketTypeShard.shard_no)
+            .with_for_update()
+        )
+        shards = result.scalars().all()
+        if not shards:
+            _shard_mode_cache.pop(ticket_type_id, None)
+            return False
+
+        remaining = qty
+        for shard in shards:
+            take = min(shard.sold_count, remaining)
+            shard.sold_count -= take
+            remaining -= take
+            if remaining == 0:
+                break
+        await db.flush()
+        return True
+
+    # ==========================================
+    # KONFIGURASI SHARDING
+    # ==========================================
+    @staticmethod
+    async def enable_sharding(
+        db: AsyncSession,
+        ticket_type_id: int,
+        shard_count: int
+    ) -> None:
+        """Pecah quota & sold_count ticket type ke `shard_count` row shard."""
+        if not 1 <= shard_count <= settings.INVENTORY_MAX_SHARDS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Jumlah shard harus 1-{settings.INVENTORY_MAX_SHARDS}"
+            )
+        ticket_type = await InventoryService._lock_ticket_type(db, ticket_type_id)
+
+        if ticket_type.inventory_shards:
+            ticket_type.sold_count = await InventoryService._shard_sold_sum(db, ticket_type_id)
+        await db.execute(
+            delete(TicketTypeShard).where(TicketTypeShard.ticket_type_id == ticket_type_id)
+        )
+
+        base, remainder = divmod(ticket_type.quota, shard_count)
+        sold_left = ticket_type.sold_count
+        rows = []
+        for shard_no in range(shard_count):
+            quota = base + (1 if shard_no < remainder else 0)
+            sold = min(quota, sold_left)
+            sold_left -= sold
+            rows.append({
+                "ticket_type_id": ticket_type_id,
+                "shard_no": shard_no,
+                "quota": quota,
+                "sold_count": sold,
+            })
+        await db.execute(insert(TicketTypeShard), rows)
+
+        ticket_type.inventory_shards = shard_count
+        await db.commit()
+        _shard_mode_cache.pop(ticket_type_id, None)
+
+    @staticmethod
+    async def disable_sharding(
+        db: AsyncSession,
+        ticket_type_id: int
+    ) -> None:
+        """Gabung shard kembali ke sold_count di ticket_types."""
+        ticket_type = await InventoryService._lock_ticket_type(db, ticket_type_id)
+        if ticket_type.inventory_shards:
+            ticket_type.sold_count = await InventoryService._shard_sold_sum(db, ticket_type_id)
+            await db.execute(
+                delete(TicketTypeShard).where(TicketTypeShard.ticket_type_id == ticket_type_id)
+            )
+            ticket_type.inventory_shards = 0
+            await db.commit()
+        _shard_mode_cache.pop(ticket_type_id, None)
+
+    @staticmethod
+    async def _lock_ticket_type(db: AsyncSession, ticket_type_id: int) -> TicketType:
+        result = await db.execute(
+            select(TicketType).where(TicketType.id == ticket_type_id).with_for_update()
+        )
+        ticket_type = result.scalar_one_or_none()
+        if not ticket_type:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Tipe tiket tidak ditemukan"
+            )
+        return ticket_type
+
+    @staticmethod
+    async def _shard_sold_sum(db: AsyncSession, ticket_type_id: int) -> int:
+        # Locking read: shard yang sedang di-reserve ikut ditunggu
+        result = await db.execute(
+            select(TicketTypeShard.sold_count)
+            .where(TicketTypeShard.ticket_type_id == ticket_type_id)
+            .with_for_update()
+        )
+        return sum(result.scalars().all())
+
+    @staticmethod
+    async def refresh_sold_counts(db: AsyncSession) -> int:
+        """
+        Sinkronkan ticket_types.sold_count = SUM(shard.sold_count) untuk semua
+        ticket type sharded. Return jumlah ticket type yang di-refresh.
+        """
+        result = await db.execute(
+            select(TicketType.id).where(TicketType.inventory_shards > 0)
+        )
+        ids = list(result.scalars().all())
+        if not ids:
+            return 0
+
+        # Update per PK (bukan WHERE inventory_shards > 0) supaya hanya row
+        # ticket type sharded yang terkunci
+        shard_sum = (
+            select(func.coalesce(func.sum(TicketTypeShard.sold_count), 0))
+            .where(TicketTypeShard.ticket_type_id == TicketType.id)
+            .scalar_subquery()
+        )
+        await db.execute(
+            update(TicketType)
+            .where(TicketType.id.in_(ids), TicketType.inventory_shards > 0)
+            .values(sold_count=shard_sum)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        return len(ids)
+
+
+# ==========================================
+# REFRESH BERKALA sold_count SHARDED
+# ==========================================
+_refresh_task: asyncio.Task | None = None
+
+
+async def _refresh_loop(interval: int):
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with AsyncSessionLocal() as db:
+                await InventoryService.refresh_sold_counts(db)
+        except Exception:
+            logger.warning("Refresh sold_count sharded gagal", exc_info=True)
+
+
+def start_refresh(interval: int):
+    global _refresh_task
+    if interval > 0 and (_refresh_task is None or _refresh_task.done()):
+        _refresh_task = asyncio.create_task(_refresh_loop(interval))
+
+
+async def stop_refresh():
+    global _refresh_task
+    if _refresh_task is not None:
+        _refresh_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await _refresh_task
+        _refresh_task = None
@@ -0,0 +1,149 @@
+import asyncio
+import contextlib
+import logging
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, func, bindparam
+from app.db.session import AsyncSessionLocal
+from app.models.order import Order, OrderStatus
+from app.models.order_item import OrderItem
+from app.models.promo_code import PromoCode
+from app.models.ticket_type import TicketType
+from app.services.inventory_service import InventoryService
+
+logger = logging.getLogger(__name__)
+
+_ticket_types = TicketType.__table__
+_promo_codes = PromoCode.__table__
+
+
+class OrderExpiryService:
+    """
+    Expire order pending yang lewat expires_at dan kembalikan kuotanya.
+
+    Satu batch = satu transaksi pendek:
+    1. Ambil <= batch_size order lewat index (status, expires_at) dengan
+       FOR UPDATE SKIP LOCKED, jadi beberapa proses sweeper (atau request
+       pembayaran yang sedang mengunci order) tidak saling menunggu.
+    2. Tandai expired.
+    3. Kembalikan qty ke ticket_types.sold_count dan 1 pemakaian ke
+       promo_codes.used_count, di-agregasi per ticket type / promo.
+    """
+
+    @staticmethod
+    async def expire_batch(db: AsyncSession, batch_size: int) -> int:
+        """Proses satu batch lalu commit. Return jumlah order yang di-expire."""
+        result = await db.execute(
+            select(Order.id, Order.promo_code_id)
+            .where(
+                Order.status == OrderStatus.PENDING,
+                Order.expires_at < func.utc_timestamp()
+            )
+            .order_by(Order.expires_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        rows = result.all()
+        if not rows:
+            await db.rollback()
+            return 0
+        order_ids = [row.id for row in rows]
+
+        await db.execute(
+            update(Order)
+            .where(Order.id.in_(order_ids))
+            .values(status=OrderStatus.EXPIRED, updated_at=func.utc_timestamp())
+            .execution_options(synchronize_session=False)
+        )
+
+        # qty per ticket type (index covering order_items(order_id, ticket_type_id, qty))
+        result = await db.execute(
+            select(
+                OrderItem.ticket_type_id,
+                func.sum(OrderItem.qty).label("qty"),
+                TicketType.inventory_shards,
+            )
+            .join(TicketType, TicketType.id == OrderItem.ticket_type_id)
+            .where(OrderItem.order_id.in_(order_ids))
+            .group_by(OrderItem.ticket_type_id, TicketType.inventory_shards)
+            .order_by(OrderItem.ticket_type_id)
+        )
+        released = result.all()
+
+        # Urut per id (sama dengan reserve_many) supaya urutan lock konsisten
+        single = [
+            {"tt_id": row.ticket_type_id, "qty": int(row.qty)}
+            for row in released if not row.inventory_shards
+        ]
+        if single:
+            await db.execute(
+                update(_ticket_types)
+                .where(_ticket_types.c.id == bindparam("tt_id"))
+                .values(
+                    sold_count=func.greatest(_ticket_types.c.sold_count - bindparam("qty"), 0)
+                ),
+                single
+            )
+        for row in released:
+            if row.inventory_shards:
+                await InventoryService.release(db, row.ticket_type_id, int(row.qty))
+
+        promo_uses: dict[int, int] = {}
+        for row in rows:
+            if row.promo_code_id:
+                promo_uses[row.promo_code_id] = promo_uses.get(row.promo_code_id, 0) + 1
+        if promo_uses:
+            await db.execute(
+                update(_promo_codes)
+                .where(_promo_codes.c.id == bindparam("promo_id"))
+                .values(
+                    used_count=func.greatest(_promo_codes.c.used_count - bindparam("uses"), 0)
+                ),
+                [{"promo_id": k, "uses": v} for k, v in sorted(promo_uses.items())]
+            )
+
+        await db.commit()
+        return len(order_ids)
+
+    @staticmethod
+    async def sweep(db: AsyncSession, batch_size: int, max_batches: int) -> int:
+        """Jalankan batch sampai habis (atau max_batches). Return total order."""
+        total = 0
+        for _ in range(max_batches):
+            expired = await OrderExpiryService.expire_batch(db, batch_size)
+            total += expired
+            if expired < batch_size:
+                break
+        return total
+
+
+# ==========================================
+# SWEEPER BACKGROUND
+# ==========================================
+_sweep_task: asyncio.Task | None = None
+
+
+async def _sweep_loop(interval: int, batch_size: int, max_batches: int):
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with AsyncSessionLocal() as db:
+                expired = await OrderExpiryService.sweep(db, batch_size, max_batches)
+            if expired:
+                logger.info("order_expiry expired=%s", expired)
+        except Exception:
+            logger.warning("Sweeper order expired gagal", exc_info=True)
+
+
+def start_sweeper(interval: int, batch_size: int, max_batches: int):
+    global _sweep_task
+    if interval > 0 and (_sweep_task is None or _sweep_task.done()):
+        _sweep_task = asyncio.create_task(_sweep_loop(interval, batch_size, max_batches))
+
+
+async def stop_sweeper():
+    global _sweep_task
+    if _sweep_task is not None:
+        _sweep_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await _sweep_task
+        _sweep_task = None
@@ -1,12 +1,91 @@
+from cachetools import TTLCache
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, and_
+from sqlalchemy.orm import make_transient_to_detached
 from fastapi import HTTPException, status
+from app.core.config import settings
+from app.core.pagination import apply_keyset
+from app.models.organizer import Organizer, OrganizerStatus
 from app.models.organizer_member import OrganizerMember, Role, Status as MemberStatus
 from app.models.user import User
 from app.schemas.organizer_member import OrganizerMemberInvite, OrganizerMemberUpdate, OrganizerMemberInviteByEmail
 
 
+# (organizer_id, user_id) -> (status organizer, snapshot member | None)
+_membership_cache: TTLCache = TTLCache(
+    maxsize=settings.MEMBERSHIP_CACHE_SIZE,
+    ttl=settings.MEMBERSHIP_CACHE_TTL_SECONDS,
+)
+
+
+def _member_from_snapshot(organizer_id: int, user_id: int, data: dict) -> OrganizerMember:
+    # Instance baru per request (detached), bisa di-`db.delete()` / `db.add()` handler
+    member = OrganizerMember(organizer_id=organizer_id, user_id=user_id, **data)
+    make_transient_to_detached(member)
+    return member
+
+
 class OrganizerMemberService:
+    @staticmethod
+    async def get_membership(
+        db: AsyncSession,
+        organizer_id: int,
+        user_id: int
+    ) -> tuple[OrganizerStatus, OrganizerMember | None] | None:
+        """
+        Ambil status organizer + membership user dalam satu query (di-cache).
+        Return None kalau organizer tidak ada.
+        """
+        key = (organizer_id, user_id)
+        cached = _membership_cache.get(key)
+        if cached is None:
+            result = await db.execute(
+                select(
+                    Organizer.status.label("organizer_status"),
+                    OrganizerMember.role,
+                    OrganizerMember.status.label("member_status"),
+                    OrganizerMember.created_at,
+                    OrganizerMember.updated_at,
+                )
+                .select_from(Organizer)
+                .outerjoin(
+                    OrganizerMember,
+                    and_(
+                        OrganizerMember.organizer_id == Organizer.id,
+                        OrganizerMember.user_id == user_id
+                    )
+                )
+                .where(Organizer.id == organizer_id)
+            )
+            row = result.first()
+            if row is None:
+                return None
+
+            member_data = None
+            if row.role is not None:
+                member_data = {
+                    "role": row.role,
+                    "status": row.member_status,
+                    "created_at": row.created_at,
+                    "updated_at": row.updated_at,
+                }
+            cached = (row.organizer_status, member_data)
+            _membership_cache[key] = cached
+
+        organizer_status, member_data = cached
+        if member_data is None:
+            return organizer_status, None
+        return organizer_status, _member_from_snapshot(organizer_id, user_id, member_data)
+
+    @staticmethod
+    def invalidate_membership(organizer_id: int, user_id: int | None = None) -> None:
+        """Hapus cache membership satu member, atau semua member organizer."""
+        if user_id is not None:
+            _membership_cache.pop((organizer_id, user_id), None)
+            return
+        for key in [k for k in list(_membership_cache.keys()) if k[0] == organizer_id]:
+            _membership_cache.pop(key, None)
+
     @staticmethod
     async def get_member(
         db: AsyncSession,
@@ -54,6 +133,7 @@ class OrganizerMemberService:
         db.add(member)
         await db.commit()
         await db.refresh(member)
+        OrganizerMemberService.invalidate_membership(organizer_id, member.user_id)
         return member
 
     @staticmethod
@@ -61,17 +141,79 @@ class OrganizerMemberService:
         db: AsyncSession,
         organizer_id: int,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        after: list | None = None
     ):
         query = (
             select(OrganizerMember)
             .where(OrganizerMember.organizer_id == organizer_id)
-            .offset(skip)
-            .limit(limit)
+            .order_by(OrganizerMember.user_id)
         )
-        result = await db.execute(query)
+        query = apply_keyset(query, [OrganizerMember.user_id], after)
+        if after is None and skip:
+            query = query.offset(skip)
+        result = await db.execute(query.limit(limit))
         return result.scalars().all()
 
+    @staticmethod
+    def _members_with_users_query(organizer_id: int, after: list | None = None):
+        """Member + nama/email user dalam satu join, urut (organizer_id, user_id)"""
+        query = (
+            select(
+                OrganizerMember.organizer_id,
+                OrganizerMember.user_id,
+                OrganizerMember.role,
+                OrganizerMember.status,
+                OrganizerMember.created_at,
+                OrganizerMember.updated_at,
+                User.full_name.label("user_name"),
+                User.email.label("user_email"),
+            )
+            .select_from(OrganizerMember)
+            .outerjoin(User, User.id == OrganizerMember.user_id)
+            .where(OrganizerMember.organizer_id == organizer_id)
+            .order_by(OrganizerMember.organizer_id, OrganizerMember.user_id)
+        )
+        # Keyset: lanjut dari user_id terakhir, pakai PK (organizer_id, user_id)
+        return apply_keyset(query, [OrganizerMember.user_id], after)
+
+    @staticmethod
+    async def get_organizer_members_with_users(
+        db: AsyncSession,
+        organizer_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        after: list | None = None
+    ):
+        query = OrganizerMemberService._members_with_users_query(organizer_id, after)
+        if after is None and skip:
+            query = query.offset(skip)
+        result = await db.execute(query.limit(limit))
+        return result.all()
+
+    @staticmethod
+    async def stream_organizer_members_with_users(
+        db: AsyncSession,
+        organizer_id: int,
+        after: list | None = None,
+        chunk_size: int = 500
+    ):
+        """Stream member lewat server-side cursor, memori tetap flat"""
+        query = OrganizerMemberService._members_with_users_query(organizer_id, after)
+        return await db.stream(query.execution_options(yield_per=chunk_size))
+
+    @staticmethod
+    async def get_member_with_user(
+        db: AsyncSession,
+        organizer_id: int,
+        user_id: int
+    ):
+        query = OrganizerMemberService._members_with_users_query(organizer_id).where(
+            OrganizerMember.user_id == user_id
+        )
+        result = await db.execute(query)
+        return result.first()
+
     @staticmethod
     async def update_member(
         db: AsyncSession,
@@ -84,6 +226,7 @@ class OrganizerMemberService:
         
         await db.commit()
         await db.refresh(member)
+        OrganizerMemberService.invalidate_membership(member.organizer_id, member.user_id)
         return member
 
     @staticmethod
@@ -93,6 +236,7 @@ class OrganizerMemberService:
     ):
         await db.delete(member)
         await db.commit()
+        OrganizerMemberService.invalidate_membership(member.organizer_id, member.user_id)
 
     
     @staticmethod
@@ -136,4 +280,5 @@ class OrganizerMemberService:
         db.add(member)
         await db.commit()
         await db.refresh(member)
+        OrganizerMemberService.invalidate_membership(organizer_id, member.user_id)
         return member
\ No newline at end of file
@@ -1,12 +1,31 @@
+from cachetools import TTLCache
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, and_
+from sqlalchemy.orm import aliased
+from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException, status
+from app.core.config import settings
 from app.models.organizer import Organizer, OrganizerStatus
 from app.models.organizer_member import OrganizerMember, Role, Status as MemberStatus
-from app.schemas.organizer import OrganizerCreate, OrganizerUpdate
+from app.core.pagination import apply_keyset
+from app.schemas.organizer import OrganizerCreate, OrganizerUpdate, OrganizerResponse
+from app.services.organizer_member_service import OrganizerMemberService
+from app.services.slug_service import SlugService, duplicate_key
 from slugify import slugify
 
 
+# Cache publik slug -> data organizer (dict OrganizerResponse)
+_slug_cache: TTLCache = TTLCache(
+    maxsize=settings.ORGANIZER_SLUG_CACHE_SIZE,
+    ttl=settings.ORGANIZER_SLUG_CACHE_TTL_SECONDS,
+)
+# Negative cache untuk slug yang tidak ada (TTL lebih pendek)
+_slug_miss_cache: TTLCache = TTLCache(
+    maxsize=settings.ORGANIZER_SLUG_CACHE_SIZE,
+    ttl=settings.ORGANIZER_SLUG_NEGATIVE_TTL_SECONDS,
+)
+
+
 class OrganizerService:
     @staticmethod
     async def create_organizer(
@@ -16,29 +35,13 @@ class OrganizerService:
     ) -> Organizer:
         """Buat organizer baru dan set creator sebagai admin"""
         
-        # Generate slug dari name
-        base_slug = slugify(organizer_data.name)
-        slug = base_slug
-        
-        # Cek slug unique
-        counter = 1
-        while True:
-            result = await db.execute(
-                select(Organizer).where(Organizer.slug == slug)
-            )
-            if not result.scalar_one_or_none():
-                break
-            slug = f"{base_slug}-{counter}"
-            counter += 1
-        
-        # Buat organizer
+        # Buat organizer dengan slug unik dari name
         organizer = Organizer(
             name=organizer_data.name,
-            slug=slug,
             status=OrganizerStatus.PENDING
         )
-        db.add(organizer)
-        await db.flush()
+        await OrganizerService._assign_slug(db, organizer, organizer_data.name)
+        OrganizerService.invalidate_slug_cache(organizer.slug)
         
         # Tambahkan creator sebagai admin
         member = OrganizerMember(
@@ -53,6 +56,24 @@ class OrganizerService:
         
         return organizer
 
+    @staticmethod
+    async def _assign_slug(
+        db: AsyncSession,
+        organizer: Organizer,
+        name: str,
+        values: dict | None = None
+    ) -> str:
+        """SlugService.assign + nama organizer duplikat jadi 409."""
+        try:
+            return await SlugService.assign(db, organizer, slugify(name), values)
+        except IntegrityError as e:
+            if duplicate_key(e) == "name":
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Nama organizer sudah dipakai"
+                )
+            raise
+
     @staticmethod
     async def get_organizer_by_id(
         db: AsyncSession,
@@ -82,14 +103,52 @@ class OrganizerService:
             )
         return organizer
 
+    @staticmethod
+    async def get_organizer_by_slug_cached(
+        db: AsyncSession,
+        slug: str
+    ) -> dict:
+        """
+        Versi read-through cache dari get_organizer_by_slug untuk halaman publik.
+        Return dict siap pakai untuk OrganizerResponse.
+        """
+        data = _slug_cache.get(slug)
+        if data is not None:
+            return data
+        if slug in _slug_miss_cache:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Organizer tidak ditemukan"
+            )
+
+        try:
+            organizer = await OrganizerService.get_organizer_by_slug(db, slug)
+        except HTTPException:
+            _slug_miss_cache[slug] = True
+            raise
+
+        data = OrganizerResponse.model_validate(organizer).model_dump()
+        _slug_cache[slug] = data
+        return data
+
+    @staticmethod
+    def invalidate_slug_cache(*slugs: str) -> None:
+        for slug in slugs:
+            _slug_cache.pop(slug, None)
+            _slug_miss_cache.pop(slug, None)
+
     @staticmethod
     async def get_user_organizers(
         db: AsyncSession,
         user_id: int,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        after: list | None = None
     ):
-        """Get semua organizer yang user adalah member-nya"""
+        """
+        Get semua organizer yang user adalah member-nya.
+        `after` = nilai keyset (organizer id) dari cursor; kalau None pakai offset.
+        """
         query = (
             select(Organizer)
             .join(OrganizerMember)
@@ -97,12 +156,63 @@ class OrganizerService:
                 OrganizerMember.user_id == user_id,
                 OrganizerMember.status == MemberStatus.ACTIVE
             )
-            .offset(skip)
-            .limit(limit)
+            .order_by(Organizer.id)
         )
-        result = await db.execute(query)
+        query = apply_keyset(query, [Organizer.id], after)
+        if after is None and skip:
+            query = query.offset(skip)
+        result = await db.execute(query.limit(limit))
         return result.scalars().all()
 
+    @staticmethod
+    async def get_user_organizers_with_role(
+        db: AsyncSession,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        after: list | None = None
+    ):
+        """
+        Organizer milik user + role user + jumlah member aktif, satu query.
+        Return list of Row (kolom organizer, user_role, member_count).
+        """
+        mine = aliased(OrganizerMember)
+        members = aliased(OrganizerMember)
+        query = (
+            select(
+                Organizer.id,
+                Organizer.name,
+                Organizer.slug,
+                Organizer.status,
+                Organizer.created_at,
+                Organizer.updated_at,
+                mine.role.label("user_role"),
+                func.count(members.user_id).label("member_count"),
+            )
+            .join(
+                mine,
+                and_(
+                    mine.organizer_id == Organizer.id,
+                    mine.user_id == user_id,
+                    mine.status == MemberStatus.ACTIVE
+                )
+            )
+            .outerjoin(
+                members,
+                and_(
+                    members.organizer_id == Organizer.id,
+                    members.status == MemberStatus.ACTIVE
+                )
+            )
+            .group_by(Organizer.id, mine.role)
+            .order_by(Organizer.id)
+        )
+        query = apply_keyset(query, [Organizer.id], after)
+        if after is None and skip:
+            query = query.offset(skip)
+        result = await db.execute(query.limit(limit))
+        return result.all()
+
     @staticmethod
     async def update_organizer(
         db: AsyncSession,
@@ -110,30 +220,21 @@ class OrganizerService:
         update_data: OrganizerUpdate
     ) -> Organizer:
         update_dict = update_data.model_dump(exclude_unset=True)
+        old_slug = organizer.slug
         
         # Jika name diupdate, regenerate slug
         if 'name' in update_dict:
-            base_slug = slugify(update_dict['name'])
-            slug = base_slug
-            counter = 1
-            while True:
-                result = await db.execute(
-                    select(Organizer).where(
-                        Organizer.slug == slug,
-                        Organizer.id != organizer.id
-                    )
-                )
-                if not result.scalar_one_or_none():
-                    break
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            update_dict['slug'] = slug
-        
-        for key, value in update_dict.items():
-            setattr(organizer, key, value)
+            await OrganizerService._assign_slug(
+                db, organizer, update_dict['name'], update_dict
+            )
+        else:
+            for key, value in update_dict.items():
+                setattr(organizer, key, value)
         
         await db.commit()
         await db.refresh(organizer)
+        OrganizerMemberService.invalidate_membership(organizer.id)
+        OrganizerService.invalidate_slug_cache(old_slug, organizer.slug)
         return organizer
 
     @staticmethod
@@ -143,4 +244,6 @@ class OrganizerService:
     ):
         """Soft delete dengan set status SUSPENDED"""
         organizer.status = OrganizerStatus.SUSPENDED
-        await db.commit()
\ No newline at end of file
+        await db.commit()
+        OrganizerMemberService.invalidate_membership(organizer.id)
+        OrganizerService.invalidate_slug_cache(organizer.slug)
\ No newline at end of file
@@ -0,0 +1,93 @@
+import re
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, or_
+from sqlalchemy.exc import IntegrityError
+from fastapi import HTTPException, status
+
+# MySQL 1062: "Duplicate entry '<nilai>' for key '<tabel>.<key>'" (prefix tabel
+# sejak 8.0.19). Nama key selalu di akhir pesan, nilai duplikat di depannya.
+_DUPLICATE_KEY = re.compile(r"for key '(?:[^'.]+\.)?([^']+)'$")
+
+
+def duplicate_key(error: IntegrityError) -> str | None:
+    """Nama unique key yang dilanggar, None kalau bukan duplicate entry."""
+    args = getattr(error.orig, "args", ())
+    message = str(args[1]) if len(args) > 1 else str(error.orig)
+    match = _DUPLICATE_KEY.search(message.strip())
+    return match.group(1) if match else None
+
+
+class SlugService:
+    """
+    Alokasi slug unik untuk model yang punya kolom `slug` unik
+    (Organizer, Event, ...).
+    """
+
+    MAX_ATTEMPTS = 5
+
+    @staticmethod
+    async def allocate(
+        db: AsyncSession,
+        model,
+        base_slug: str,
+        exclude_id: int | None = None
+    ) -> str:
+        """
+        Ambil semua varian `base`, `base-N` dalam satu prefix query (pakai index
+        unik slug), lalu pilih suffix kosong terkecil di memori.
+        """
+        escaped = base_slug.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        query = select(model.slug).where(
+            or_(
+                model.slug == base_slug,
+                model.slug.like(f"{escaped}-%", escape="\\")
+            )
+        )
+        if exclude_id is not None:
+            query = query.where(model.id != exclude_id)
+        result = await db.execute(query)
+        taken = set(result.scalars().all())
+
+        if base_slug not in taken:
+            return base_slug
+
+        pattern = re.compile(rf"^{re.escape(base_slug)}-(\d+)$")
+        used = {int(m.group(1)) for s in taken if (m := pattern.match(s))}
+        counter = 1
+        while counter in used:
+            counter += 1
+        return f"{base_slug}-{counter}"
+
+    @staticmethod
+    async def assign(
+        db: AsyncSession,
+        instance,
+        base_slug: str,
+        values: dict | None = None
+    ) -> str:
+        """
+        Set slug (+ `values` lain) ke instance lalu flush di savepoint.
+        Kalau request lain lebih dulu mengambil slug yang sama (unique
+        violation), alokasi diulang alih-alih error 500.
+        """
+        model = type(instance)
+        # Simpan id di awal: rollback savepoint meng-expire atribut instance
+        instance_id = instance.id
+        for _ in range(SlugService.MAX_ATTEMPTS):
+            slug = await SlugService.allocate(db, model, base_slug, instance_id)
+            try:
+                async with db.begin_nested():
+                    for key, value in (values or {}).items():
+                        setattr(instance, key, value)
+                    instance.slug = slug
+                    db.add(instance)
+                    await db.flush()
+                return slug
+            except IntegrityError as e:
+                # Unique key lain (mis. name) bukan urusan retry slug
+                if duplicate_key(e) != "slug":
+                    raise
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Slug sedang dipakai, coba lagi"
+        )
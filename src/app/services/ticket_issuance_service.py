@@ -0,0 +1,86 @@
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, func
+from fastapi import HTTPException, status
+from app.core.codes import new_ticket_code
+from app.core.qr import sign_ticket
+from app.models.order import Order, OrderStatus
+from app.models.order_item import OrderItem
+from app.models.ticket import Ticket, TicketStatusEnum
+
+_tickets = Ticket.__table__
+
+
+class TicketIssuanceService:
+    """
+    Terbitkan tiket untuk order yang sudah dibayar: satu Ticket per unit qty
+    tiap OrderItem, dalam satu transaksi.
+
+    Aman dijalankan ulang (retry job / crash): order dikunci FOR UPDATE lalu
+    hanya kekurangan tiket per order_item yang dibuat.
+    """
+
+    # Row per statement executemany (driver MySQL menggabungkan jadi
+    # INSERT multi-row)
+    BATCH_SIZE = 1000
+
+    @staticmethod
+    async def issue_for_order(
+        db: AsyncSession,
+        order_id: int
+    ) -> int:
+        """Return jumlah tiket yang baru diterbitkan (0 = sudah lengkap)."""
+        result = await db.execute(
+            select(Order.id, Order.status, Order.event_id)
+            .where(Order.id == order_id)
+            .with_for_update()
+        )
+        order = result.first()
+        if order is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Order tidak ditemukan"
+            )
+        if order.status != OrderStatus.PAID:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Tiket hanya bisa diterbitkan untuk order yang sudah dibayar"
+            )
+
+        # Tiket yang sudah ada per item (hasil run sebelumnya)
+        result = await db.execute(
+            select(
+                OrderItem.id,
+                OrderItem.ticket_type_id,
+                OrderItem.qty,
+                func.count(Ticket.id).label("issued"),
+            )
+            .outerjoin(Ticket, Ticket.order_item_id == OrderItem.id)
+            .where(OrderItem.order_id == order_id)
+            .group_by(OrderItem.id, OrderItem.ticket_type_id, OrderItem.qty)
+            .order_by(OrderItem.id)
+        )
+
+        # Detik saja: issued_at ikut ditandatangani di QR token
+        now = datetime.utcnow().replace(microsecond=0)
+        rows = []
+        for item in result.all():
+            for _ in range(item.qty - item.issued):
+                ticket_code = new_ticket_code()
+                rows.append({
+                    "order_item_id": item.id,
+                    "ticket_code": ticket_code,
+                    "qr_token": sign_ticket(ticket_code, order.event_id, item.ticket_type_id, now),
+                    "status": TicketStatusEnum.ISSUED,
+                    "issued_at": now,
+                    "created_at": now,
+                })
+
+        for start in range(0, len(rows), TicketIssuanceService.BATCH_SIZE):
+            await db.execute(
+                insert(_tickets),
+                rows[start:start + TicketIssuanceService.BATCH_SIZE]
+            )
+
+        await db.commit()
+        return len(rows)
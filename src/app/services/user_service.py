@@ -0,0 +1,163 @@
+from datetime import datetime
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, and_, or_, func, literal, union_all
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.exc import IntegrityError
+from fastapi import HTTPException, status
+from app.models.user import User, PlatformRole, UserStatus
+from app.models.organizer_member import OrganizerMember
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+class UserService:
+    SEARCH_MIN_LENGTH = 2
+
+    # Ranking hasil search
+    RANK_EXACT_EMAIL = 3
+    RANK_PREFIX = 2
+    RANK_SUBSTRING = 1
+
+    @staticmethod
+    def _search_branch(condition, rank: int, organizer_id: int | None, limit: int):
+        query = select(
+            User.id,
+            User.full_name,
+            User.email,
+            User.avatar,
+            literal(rank).label("rank"),
+        ).where(condition)
+
+        # Anti-join pakai PK (organizer_id, user_id), bukan NOT IN (subquery)
+        if organizer_id:
+            query = query.outerjoin(
+                OrganizerMember,
+                and_(
+                    OrganizerMember.organizer_id == organizer_id,
+                    OrganizerMember.user_id == User.id
+                )
+            ).where(OrganizerMember.user_id.is_(None))
+
+        return query.limit(limit)
+
+    @staticmethod
+    async def search_users(
+        db: AsyncSession,
+        q: str,
+        organizer_id: int | None = None,
+        limit: int = 10
+    ):
+        """
+        Search user by nama / email, semua cabang pakai index:
+        - email persis           -> index unik email
+        - prefix email / nama    -> index email / ix_users_full_name
+        - substring              -> FULLTEXT ngram ft_users_search
+        Hasil diurutkan: email persis > prefix > substring.
+        """
+        q = q.strip()
+        # min_length di Query dihitung sebelum strip: "  " lolos lalu jadi
+        # prefix "%" yang cocok dengan semua user
+        if len(q) < UserService.SEARCH_MIN_LENGTH:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Kata kunci minimal {UserService.SEARCH_MIN_LENGTH} karakter"
+            )
+        prefix = f"{_escape_like(q)}%"
+        # Phrase search di ngram = pencarian substring
+        phrase = '"' + q.replace('"', " ") + '"'
+
+        branches = union_all(
+            UserService._search_branch(
+                User.email == q, UserService.RANK_EXACT_EMAIL, organizer_id, limit
+            ),
+            UserService._search_branch(
+                User.email.like(prefix, escape="\\"), UserService.RANK_PREFIX, organizer_id, limit
+            ),
+            UserService._search_branch(
+                User.full_name.like(prefix, escape="\\"), UserService.RANK_PREFIX, organizer_id, limit
+            ),
+            UserService._search_branch(
+                match(User.full_name, User.email, against=phrase).in_boolean_mode(),
+                UserService.RANK_SUBSTRING,
+                organizer_id,
+                limit
+            ),
+        ).subquery()
+
+        best_rank = func.max(branches.c.rank)
+        query = (
+            select(
+                branches.c.id,
+                branches.c.full_name,
+                branches.c.email,
+                branches.c.avatar,
+            )
+            .group_by(
+                branches.c.id,
+                branches.c.full_name,
+                branches.c.email,
+                branches.c.avatar
+            )
+            .order_by(best_rank.desc(), branches.c.id)
+            .limit(limit)
+        )
+        result = await db.execute(query)
+        return result.all()
+
+    @staticmethod
+    async def upsert_google_user(
+        db: AsyncSession,
+        email: str,
+        google_id: str,
+        full_name: str,
+        avatar: str | None
+    ) -> dict:
+        """
+        Resolve atau buat user dari login Google.
+        Return dict: id, full_name, role, user_status.
+
+        - User lama: satu SELECT (email / google_id, dua-duanya index unik).
+        - User baru: satu INSERT biasa, hasilnya langsung dari values.
+        - Login paralel untuk akun yang sama sudah insert duluan: INSERT
+          kena duplicate key, rollback, lalu baca ulang dengan locking read
+          (bukan snapshot lama) supaya role / status row yang ada terpakai.
+        """
+        query = select(User.id, User.full_name, User.role, User.user_status).where(
+            or_(User.email == email, User.google_id == google_id)
+        )
+        row = (await db.execute(query)).first()
+        if row:
+            return row._asdict()
+
+        now = datetime.utcnow()
+        values = {
+            "email": email,
+            "google_id": google_id,
+            "full_name": full_name,
+            "avatar": avatar,
+            "role": PlatformRole.USER,           # Default jadi User biasa
+            "user_status": UserStatus.ACTIVE,    # Default langsung aktif
+            "created_at": now,
+            "updated_at": now,
+        }
+        try:
+            result = await db.execute(insert(User).values(**values))
+            await db.commit()
+        except IntegrityError:
+            # Duplicate key hanya muncul setelah insert lawan commit (INSERT
+            # kita menunggu lock-nya). Snapshot REPEATABLE READ dari SELECT
+            # pertama tidak melihat row itu, jadi pakai FOR SHARE yang selalu
+            # membaca versi terbaru.
+            await db.rollback()
+            row = (await db.execute(query.with_for_update(read=True))).one()
+            await db.commit()
+            return row._asdict()
+
+        return {
+            "id": result.lastrowid,
+            "full_name": full_name,
+            "role": values["role"],
+            "user_status": values["user_status"],
+        }
@@ -0,0 +1,80 @@
+"""
+p99 latency endpoint lain (GET /ping) selama ada login yang hashing bcrypt:
+bcrypt langsung di coroutine vs lewat thread pool (create_bsha256_async).
+"""
+import asyncio
+import statistics
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.core import security
+
+pytestmark = pytest.mark.bench
+
+HASH_REQUESTS = 24
+PING_INTERVAL = 0.005
+# Login datang bertahap, bukan sekaligus
+LOGIN_INTERVAL = 0.02
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.post("/hash-sync")
+    async def hash_sync():
+        return {"hash": security.create_bsha256("password")}
+
+    @app.post("/hash-async")
+    async def hash_async():
+        return {"hash": await security.create_bsha256_async("password")}
+
+    return app
+
+
+async def _measure(path: str) -> list[float]:
+    transport = httpx.ASGITransport(app=_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        latencies = []
+        done = asyncio.Event()
+
+        async def pinger():
+            # Latency dihitung dari jadwal kirim, jadi waktu tertahan di loop
+            # yang sedang diblok bcrypt ikut terhitung
+            scheduled = time.perf_counter()
+            while not done.is_set():
+                await asyncio.sleep(max(scheduled - time.perf_counter(), 0))
+                await client.get("/ping")
+                latencies.append(time.perf_counter() - scheduled)
+                scheduled += PING_INTERVAL
+
+        async def login(i: int):
+            await asyncio.sleep(i * LOGIN_INTERVAL)
+            await client.post(path)
+
+        ping_task = asyncio.create_task(pinger())
+        await asyncio.gather(*(login(i) for i in range(HASH_REQUESTS)))
+        done.set()
+        await ping_task
+        return latencies
+
+
+def _p99(values: list[float]) -> float:
+    return statistics.quantiles(values, n=100)[98] * 1000 if len(values) > 1 else values[0] * 1000
+
+
+def test_bench_ping_p99_while_hashing():
+    in_loop = asyncio.run(_measure("/hash-sync"))
+    pooled = asyncio.run(_measure("/hash-async"))
+    print(
+        f"\nGET /ping selama {HASH_REQUESTS} hash bcrypt (rounds {security.BCRYPT_ROUNDS}):"
+        f"\n  bcrypt di event loop : p99 {_p99(in_loop):8.1f} ms ({len(in_loop)} ping)"
+        f"\n  bcrypt di thread pool: p99 {_p99(pooled):8.1f} ms ({len(pooled)} ping)"
+    )
+    assert _p99(pooled) < _p99(in_loop)
@@ -0,0 +1,58 @@
+"""
+Throughput INSERT kode unik: kode k-sortable (CodeGenerator) vs UUID4 acak
+di kolom VARCHAR(40) UNIQUE, tabel sudah berisi banyak row (index tidak
+muat di cache kecil -> UUID menyebar ke page B-tree acak).
+"""
+import asyncio
+import time
+import uuid
+
+import pytest
+
+from app.core.codes import new_order_code
+
+pytestmark = [pytest.mark.mysql, pytest.mark.bench]
+
+ROWS = 500_000
+BATCH = 2_000
+TABLES = {
+    "k-sortable": ("bench_codes_sortable", new_order_code),
+    "uuid4": ("bench_codes_uuid", lambda: f"ORD-{uuid.uuid4().hex}"),
+}
+
+
+async def _insert_rate(engine, table: str, make_code) -> tuple[float, float]:
+    """Return (row/detik keseluruhan, row/detik 10% batch terakhir)."""
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql(f"DROP TABLE IF EXISTS {table}")
+        await conn.exec_driver_sql(
+            f"CREATE TABLE {table} ("
+            " id BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,"
+            " code VARCHAR(40) NOT NULL,"
+            " UNIQUE KEY uq_code (code))"
+        )
+    batch_times = []
+    for _ in range(ROWS // BATCH):
+        rows = [(make_code(),) for _ in range(BATCH)]
+        start = time.perf_counter()
+        async with engine.begin() as conn:
+            await conn.exec_driver_sql(f"INSERT INTO {table} (code) VALUES (%s)", rows)
+        batch_times.append(time.perf_counter() - start)
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql(f"DROP TABLE {table}")
+    tail = batch_times[-max(len(batch_times) // 10, 1):]
+    return ROWS / sum(batch_times), len(tail) * BATCH / sum(tail)
+
+
+def test_bench_sortable_codes_vs_uuid(mysql_engine):
+    async def scenario():
+        return {
+            label: await _insert_rate(mysql_engine, table, make_code)
+            for label, (table, make_code) in TABLES.items()
+        }
+
+    results = asyncio.run(scenario())
+    print(f"\nINSERT {ROWS} kode unik (batch {BATCH}):")
+    for label, (overall, tail) in results.items():
+        print(f"  {label:10s}: {overall:9.0f} row/s, 10% batch terakhir {tail:9.0f} row/s")
+    assert results["k-sortable"][1] > 0
@@ -0,0 +1,73 @@
+"""
+Verifikasi ID token per detik: jalur lama (verify_token + fetch cert blocking
+tiap login) vs GoogleTokenVerifier (cert di cache, tidak blocking loop).
+Cert dilayani stand-in lokal, jadi angka jalur lama masih jauh lebih bagus
+daripada ke Google sungguhan (RTT 20-100 ms per login).
+"""
+import asyncio
+import time
+
+import pytest
+from google.auth.transport import requests as google_requests
+from google.oauth2 import id_token
+
+from app.core.google_auth import GoogleTokenVerifier
+from tests.google_stub import AUDIENCE, CertServer, SigningKey
+
+pytestmark = pytest.mark.bench
+
+LOGINS = 500
+CONCURRENCY = 50
+
+
+def _rate(elapsed: float) -> float:
+    return LOGINS / elapsed
+
+
+def test_bench_logins_per_second():
+    key = SigningKey("kid-bench")
+    tokens = [key.id_token(f"user{i}@example.com") for i in range(LOGINS)]
+
+    async def old_path(server):
+        request = google_requests.Request()
+
+        async def login(token):
+            # Sama dengan handler lama: sync call di dalam coroutine
+            id_token.verify_token(token, request, audience=AUDIENCE, certs_url=server.url)
+
+        start = time.perf_counter()
+        await _gather(login, tokens)
+        return time.perf_counter() - start
+
+    async def new_path(server):
+        verifier = GoogleTokenVerifier(certs_url=server.url, audience=AUDIENCE)
+        await verifier.refresh()
+        start = time.perf_counter()
+        await _gather(verifier.verify, tokens)
+        return time.perf_counter() - start
+
+    # verify_token (jalur lama) tidak bisa JWKS tanpa PyJWT: pakai format PEM v1
+    with CertServer([key], fmt="pem") as server:
+        old = asyncio.run(old_path(server))
+        old_hits = server.hits
+    with CertServer([key], fmt="pem") as server:
+        new = asyncio.run(new_path(server))
+        new_hits = server.hits
+
+    print(
+        f"\nlogin Google ({LOGINS} token, concurrency {CONCURRENCY}):"
+        f"\n  verify_token lama : {_rate(old):8.0f} login/s, fetch cert {old_hits}x"
+        f"\n  GoogleTokenVerifier: {_rate(new):8.0f} login/s, fetch cert {new_hits}x"
+    )
+    assert new_hits == 1
+    assert new < old
+
+
+async def _gather(fn, tokens):
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def one(token):
+        async with semaphore:
+            await fn(token)
+
+    await asyncio.gather(*(one(token) for token in tokens))
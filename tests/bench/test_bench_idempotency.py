@@ -0,0 +1,59 @@
+"""
+Overhead Idempotency-Key per request mutasi: handler kosong dengan vs tanpa
+key. Dengan key ada dua transaksi tulis (INSERT klaim + UPDATE response).
+"""
+import asyncio
+import statistics
+import time
+
+import httpx
+import pytest
+
+from app.db import session
+from tests.factories import auth_headers, create_user, unique
+from tests.test_idempotency import Handler
+
+pytestmark = [pytest.mark.mysql, pytest.mark.bench]
+
+REQUESTS = 500
+
+
+async def _latencies(client, headers_for) -> list[float]:
+    latencies = []
+    for _ in range(REQUESTS):
+        headers = headers_for()
+        start = time.perf_counter()
+        resp = await client.post("/orders", json={"qty": 1}, headers=headers)
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert resp.status_code == 201
+    return latencies
+
+
+def test_bench_idempotency_overhead(mysql_engine):
+    handler = Handler()
+
+    async def scenario():
+        headers = auth_headers(await create_user(mysql_engine))
+        transport = httpx.ASGITransport(app=handler.app)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                # Pemanasan pool koneksi
+                await client.post("/orders", json={}, headers={**headers, "Idempotency-Key": unique("warm")})
+                plain = await _latencies(client, lambda: headers)
+                keyed = await _latencies(
+                    client, lambda: {**headers, "Idempotency-Key": unique("bench")}
+                )
+            return plain, keyed
+        finally:
+            await session.engine.dispose()
+
+    plain, keyed = asyncio.run(scenario())
+    p50_plain, p50_keyed = statistics.median(plain), statistics.median(keyed)
+    p99 = lambda values: sorted(values)[int(len(values) * 0.99) - 1]  # noqa: E731
+    print(
+        f"\nIdempotency-Key overhead ({REQUESTS} request berurutan, handler kosong):"
+        f"\n  tanpa key: p50 {p50_plain:6.2f} ms  p99 {p99(plain):6.2f} ms"
+        f"\n  dengan key: p50 {p50_keyed:6.2f} ms  p99 {p99(keyed):6.2f} ms"
+        f"\n  overhead p50: {p50_keyed - p50_plain:6.2f} ms"
+    )
+    assert p50_keyed > p50_plain
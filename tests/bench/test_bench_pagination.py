@@ -0,0 +1,79 @@
+"""
+Latency halaman ke-1000 daftar member organizer (100 per halaman):
+offset (`skip`) vs keyset (`cursor`).
+"""
+import asyncio
+import statistics
+import time
+from datetime import datetime
+
+import pytest
+from sqlalchemy import insert, delete
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models.organizer_member import OrganizerMember, Role, Status
+from app.services.organizer_member_service import OrganizerMemberService
+
+pytestmark = [pytest.mark.mysql, pytest.mark.bench]
+
+ORGANIZER_ID = 990001
+PAGE_SIZE = 100
+PAGE = 1000
+MEMBERS = PAGE_SIZE * PAGE + PAGE_SIZE
+RUNS = 20
+
+
+async def _seed(engine):
+    now = datetime.utcnow()
+    async with engine.begin() as conn:
+        # Organizer & user induk tidak dibaca (outer join ke users)
+        await conn.exec_driver_sql("SET foreign_key_checks=0")
+        await conn.execute(delete(OrganizerMember).where(OrganizerMember.organizer_id == ORGANIZER_ID))
+        for start in range(0, MEMBERS, 10000):
+            await conn.execute(insert(OrganizerMember), [
+                {
+                    "organizer_id": ORGANIZER_ID,
+                    "user_id": user_id,
+                    "role": Role.VIEWER,
+                    "status": Status.ACTIVE,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for user_id in range(start + 1, min(start + 10000, MEMBERS) + 1)
+            ])
+        await conn.exec_driver_sql("ANALYZE TABLE organizer_members")
+
+
+async def _time(sessions, **kwargs) -> tuple[float, list]:
+    async with sessions() as db:
+        start = time.perf_counter()
+        rows = await OrganizerMemberService.get_organizer_members_with_users(
+            db, ORGANIZER_ID, limit=PAGE_SIZE + 1, **kwargs
+        )
+        return time.perf_counter() - start, rows
+
+
+def test_bench_page_1000_offset_vs_cursor(mysql_engine):
+    sessions = async_sessionmaker(mysql_engine, expire_on_commit=False)
+
+    async def scenario():
+        await _seed(mysql_engine)
+        skip = PAGE_SIZE * (PAGE - 1)
+        # Cursor halaman 1000 = user_id baris terakhir halaman 999
+        after = [skip]
+        offset_times, cursor_times = [], []
+        for _ in range(RUNS):
+            elapsed, offset_rows = await _time(sessions, skip=skip)
+            offset_times.append(elapsed)
+            elapsed, cursor_rows = await _time(sessions, after=after)
+            cursor_times.append(elapsed)
+        assert [r.user_id for r in offset_rows] == [r.user_id for r in cursor_rows]
+        return statistics.median(offset_times), statistics.median(cursor_times)
+
+    offset, cursor = asyncio.run(scenario())
+    print(
+        f"\nmember organizer halaman {PAGE} ({MEMBERS} member, {PAGE_SIZE}/halaman), median {RUNS}x:"
+        f"\n  offset (skip={PAGE_SIZE * (PAGE - 1)}): {offset * 1000:7.2f} ms"
+        f"\n  cursor                : {cursor * 1000:7.2f} ms"
+    )
+    assert cursor < offset
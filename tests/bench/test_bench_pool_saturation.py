@@ -0,0 +1,88 @@
+"""
+Load test connection pool: naikkan jumlah request paralel ke endpoint yang
+kena DB sampai throughput berhenti naik (knee), sambil membaca waktu tunggu
+checkout dari metrics pool. Setting pool = ENGINE_OPTIONS aplikasi.
+"""
+import asyncio
+import statistics
+import time
+
+import httpx
+import pytest
+
+from app.core.metrics import Histogram
+from app.db import session
+from app.db.pool_metrics import pool_metrics
+from app.main import app
+from app.models.organizer_member import Role
+from tests.factories import auth_headers, create_organizer, create_user
+
+pytestmark = [pytest.mark.mysql, pytest.mark.bench]
+
+CONCURRENCY = [1, 5, 10, 20, 30, 40, 60, 80, 120]
+DURATION_SECONDS = 5
+# Throughput naik < 10% dari level sebelumnya = sudah jenuh
+KNEE_GAIN = 1.10
+
+
+async def _run_level(client, headers, concurrency: int) -> dict:
+    metrics = pool_metrics["primary"]
+    metrics.checkout_wait = Histogram()
+    metrics.max_checked_out = 0
+    timeouts_before = metrics.timeouts
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + DURATION_SECONDS
+
+    async def worker():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            resp = await client.get("/api/v1/organizers/my-organizers", headers=headers)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if resp.status_code != 200:
+                errors += 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    latencies.sort()
+    wait = metrics.checkout_wait.snapshot()
+    return {
+        "concurrency": concurrency,
+        "rps": len(latencies) / DURATION_SECONDS,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1],
+        "wait_p99_ms": wait["p99_ms"],
+        "max_checked_out": metrics.max_checked_out,
+        "timeouts": metrics.timeouts - timeouts_before,
+        "errors": errors,
+    }
+
+
+def test_bench_pool_saturation_knee(mysql_engine):
+    async def scenario():
+        user_id = await create_user(mysql_engine)
+        await create_organizer(mysql_engine, {user_id: Role.ORGANIZER_ADMIN})
+        headers = auth_headers(user_id)
+        transport = httpx.ASGITransport(app=app)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://test", timeout=60) as client:
+                return [await _run_level(client, headers, c) for c in CONCURRENCY]
+        finally:
+            await session.engine.dispose()
+
+    levels = asyncio.run(scenario())
+    pool = session.ENGINE_OPTIONS
+    print(
+        f"\npool_size={pool['pool_size']} max_overflow={pool['max_overflow']}, "
+        f"{DURATION_SECONDS}s per level, GET /organizers/my-organizers:"
+    )
+    print(" conc    req/s   p50 ms   p99 ms  wait p99  max_out  timeout  error")
+    knee = None
+    for prev, level in zip([None, *levels], levels):
+        print(
+            f"{level['concurrency']:5d} {level['rps']:8.0f} {level['p50_ms']:8.1f} {level['p99_ms']:8.1f}"
+            f" {level['wait_p99_ms']:9.1f} {level['max_checked_out']:8d} {level['timeouts']:8d} {level['errors']:6d}"
+        )
+        if knee is None and prev is not None and level["rps"] < prev["rps"] * KNEE_GAIN:
+            knee = prev["concurrency"]
+    print(f"knee: ~{knee} request paralel" if knee else "knee: belum tercapai, naikkan CONCURRENCY")
+    assert levels[0]["errors"] == 0
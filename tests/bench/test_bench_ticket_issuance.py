@@ -0,0 +1,56 @@
+"""
+Throughput penerbitan tiket (tiket/detik) untuk order berisi 1, 50 dan 5000
+tiket: INSERT per batch (BATCH_SIZE) vs ongkos tetap per order (lock order,
+hitung tiket yang sudah ada, commit).
+"""
+import asyncio
+import statistics
+import time
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.services.ticket_issuance_service import TicketIssuanceService
+from tests.test_ticket_issuance import _create_order, _reset
+
+pytestmark = [pytest.mark.mysql, pytest.mark.bench]
+
+# Jumlah tiket per order -> jumlah order yang diterbitkan
+SIZES = {1: 2000, 50: 100, 5000: 5}
+
+
+async def _issue_rate(sessions, tickets_per_order: int, orders: int) -> tuple[float, float]:
+    """Return (tiket/detik, p50 detik per order)."""
+    order_ids = [
+        (await _create_order(sessions, [tickets_per_order]))[0]
+        for _ in range(orders)
+    ]
+    durations = []
+    for order_id in order_ids:
+        start = time.perf_counter()
+        async with sessions() as db:
+            issued = await TicketIssuanceService.issue_for_order(db, order_id)
+        durations.append(time.perf_counter() - start)
+        assert issued == tickets_per_order
+    return tickets_per_order * orders / sum(durations), statistics.median(durations)
+
+
+def test_bench_issue_tickets_per_second(mysql_engine):
+    sessions = async_sessionmaker(mysql_engine, expire_on_commit=False)
+
+    async def scenario():
+        results = {}
+        for tickets_per_order, orders in SIZES.items():
+            await _reset(sessions)
+            results[tickets_per_order] = await _issue_rate(sessions, tickets_per_order, orders)
+        await _reset(sessions)
+        return results
+
+    results = asyncio.run(scenario())
+    print(f"\nPenerbitan tiket (BATCH_SIZE {TicketIssuanceService.BATCH_SIZE}):")
+    for tickets_per_order, (rate, p50) in results.items():
+        print(
+            f"  {tickets_per_order:5d} tiket/order x {SIZES[tickets_per_order]:4d}: "
+            f"{rate:9.0f} tiket/s, p50 {p50 * 1000:8.1f} ms/order"
+        )
+    assert all(rate > 0 for rate, _ in results.values())
@@ -0,0 +1,103 @@
+"""
+Latency search user di 1 juta user: query lama (ILIKE '%q%' + NOT IN)
+vs UserService.search_users (email persis / prefix / FULLTEXT ngram).
+"""
+import asyncio
+import statistics
+import time
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, insert, or_, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models.organizer_member import OrganizerMember
+from app.models.user import PlatformRole, User, UserStatus
+from app.services.user_service import UserService
+
+pytestmark = [pytest.mark.mysql, pytest.mark.bench]
+
+USERS = 1_000_000
+BATCH = 10_000
+DOMAIN = "@search.bench"
+FIRST = ["Budi", "Sari", "Agus", "Dewi", "Rina", "Andi", "Putri", "Joko", "Wulan", "Hendra"]
+LAST = ["Santoso", "Wijaya", "Pratama", "Lestari", "Hidayat", "Kusuma", "Saputra", "Nugroho"]
+QUERIES = {
+    "email persis": f"user777777{DOMAIN}",
+    "prefix email": "user12345",
+    "prefix nama": "Wulan Kus",
+    "substring": "ndra Wija",
+}
+LIMIT = 10
+RUNS = 10
+ORGANIZER_ID = 990002
+
+
+async def _seed(engine):
+    async with engine.begin() as conn:
+        seeded = await conn.scalar(
+            select(func.count()).select_from(User).where(User.email.like(f"%{DOMAIN}"))
+        )
+        if seeded >= USERS:
+            return
+        now = datetime.utcnow()
+        for start in range(seeded, USERS, BATCH):
+            await conn.execute(insert(User), [
+                {
+                    "google_id": f"search-bench-{i}",
+                    "email": f"user{i}{DOMAIN}",
+                    "full_name": f"{FIRST[i % len(FIRST)]} {LAST[i // len(FIRST) % len(LAST)]} {i}",
+                    "role": PlatformRole.USER,
+                    "user_status": UserStatus.ACTIVE,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for i in range(start, min(start + BATCH, USERS))
+            ])
+        await conn.exec_driver_sql("ANALYZE TABLE users")
+
+
+async def _baseline(db, q: str, organizer_id: int, limit: int):
+    """Query sebelum optimasi: scan penuh tabel users."""
+    query = (
+        select(User)
+        .where(or_(User.full_name.ilike(f"%{q}%"), User.email.ilike(f"%{q}%")))
+        .where(User.id.not_in(
+            select(OrganizerMember.user_id).where(OrganizerMember.organizer_id == organizer_id)
+        ))
+        .limit(limit)
+    )
+    return (await db.execute(query)).scalars().all()
+
+
+async def _median(sessions, fn, q: str) -> float:
+    times = []
+    for _ in range(RUNS):
+        async with sessions() as db:
+            start = time.perf_counter()
+            await fn(db, q, ORGANIZER_ID, LIMIT)
+            times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def test_bench_search_1m_users(mysql_engine):
+    sessions = async_sessionmaker(mysql_engine, expire_on_commit=False)
+
+    async def scenario():
+        await _seed(mysql_engine)
+        results = {}
+        for label, q in QUERIES.items():
+            results[label] = (
+                await _median(sessions, _baseline, q),
+                await _median(sessions, UserService.search_users, q),
+            )
+        return results
+
+    results = asyncio.run(scenario())
+    print(f"\nsearch user ({USERS} user, limit {LIMIT}), median {RUNS}x:")
+    for label, (old, new) in results.items():
+        print(f"  {label:13s} ILIKE: {old * 1000:8.2f} ms   index: {new * 1000:8.2f} ms")
+    # Kata kunci yang umum bisa cepat ketemu di awal scan ILIKE; yang
+    # jarang (email persis) memaksa scan penuh
+    old, new = results["email persis"]
+    assert new < old
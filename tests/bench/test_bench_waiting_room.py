@@ -0,0 +1,100 @@
+"""
+Lonjakan 50k pembeli join antrian saat on-sale (HTTP, in-process), lalu
+semua polling status sekali. Auth & jadwal penjualan di-stub, jadi yang
+terukur hanya jalur waiting room (tanpa MySQL).
+"""
+import asyncio
+import statistics
+import time
+from types import SimpleNamespace
+from typing import Annotated
+
+import httpx
+import pytest
+from fastapi import Header
+
+from app.core.waiting_room import InMemoryQueueStore, WaitingRoom
+from app.api.v1.endpoints import waiting_room as waiting_room_endpoints
+from app.deps.auth import get_current_user
+from app.deps.db import get_read_db
+from app.main import app
+from app.services.event_service import EventService
+
+pytestmark = pytest.mark.bench
+
+ARRIVALS = 50_000
+CONCURRENCY = 500
+EVENT_ID = 1
+RATE = 50
+BURST = 100
+
+
+def _user_from_header(x_user: Annotated[str, Header()]):
+    return SimpleNamespace(id=int(x_user))
+
+
+def _p99(values: list[float]) -> float:
+    values = sorted(values)
+    return values[int(len(values) * 0.99) - 1]
+
+
+async def _run(client, requests, concurrency: int) -> tuple[list, list[float], float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(method, url, headers):
+        async with semaphore:
+            start = time.perf_counter()
+            resp = await client.request(method, url, headers=headers)
+            latencies.append((time.perf_counter() - start) * 1000)
+            return resp
+
+    start = time.perf_counter()
+    responses = await asyncio.gather(*(one(*request) for request in requests))
+    return responses, latencies, time.perf_counter() - start
+
+
+def test_bench_50k_arrivals(monkeypatch):
+    room = WaitingRoom(InMemoryQueueStore(idle_ttl_seconds=3600), rate_per_second=RATE, burst=BURST)
+    monkeypatch.setattr(waiting_room_endpoints, "waiting_room", room)
+    opens_at = time.time()
+
+    async def sale_window(db, event_id):
+        return opens_at, opens_at + 3600
+
+    monkeypatch.setattr(EventService, "get_sale_window", staticmethod(sale_window))
+    app.dependency_overrides[get_current_user] = _user_from_header
+    app.dependency_overrides[get_read_db] = lambda: None
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            joins = await _run(client, [
+                ("POST", f"/api/v1/events/{EVENT_ID}/queue", {"X-User": str(user_id)})
+                for user_id in range(1, ARRIVALS + 1)
+            ], CONCURRENCY)
+            statuses = await _run(client, [
+                ("GET", f"/api/v1/events/{EVENT_ID}/queue/status", {"X-Queue-Token": resp.json()["token"]})
+                for resp in joins[0]
+            ], CONCURRENCY)
+            return joins, statuses
+
+    try:
+        (joined, join_ms, join_s), (statuses, status_ms, status_s) = asyncio.run(scenario())
+    finally:
+        app.dependency_overrides.clear()
+
+    assert all(resp.status_code == 200 for resp in joined + statuses)
+    elapsed = time.time() - opens_at
+    admitted = sum(resp.json()["admitted"] for resp in statuses)
+    positions = sorted(resp.json()["position"] for resp in statuses if not resp.json()["admitted"])
+    print(
+        f"\n{ARRIVALS} arrival, concurrency {CONCURRENCY}, burst {BURST} + {RATE}/s:"
+        f"\n  join  : {ARRIVALS / join_s:8.0f} req/s  p50 {statistics.median(join_ms):6.1f} ms  p99 {_p99(join_ms):6.1f} ms"
+        f"\n  status: {ARRIVALS / status_s:8.0f} req/s  p50 {statistics.median(status_ms):6.1f} ms  p99 {_p99(status_ms):6.1f} ms"
+        f"\n  admitted setelah {elapsed:.1f}s: {admitted} (maks burst + rate x t = {BURST + int(elapsed * RATE)})"
+        f"\n  posisi terakhir: {positions[-1] if positions else 0}, eta {max(r.json()['eta_seconds'] for r in statuses)} s"
+    )
+    # Nomor urut unik & rapat: tidak ada yang dilewati / dobel
+    assert asyncio.run(room.store.length(EVENT_ID)) == ARRIVALS
+    assert admitted <= BURST + int(elapsed * RATE) + 1
@@ -0,0 +1,64 @@
+"""Helper data test untuk harness MySQL (lihat conftest.mysql_engine)."""
+import itertools
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from app.core.security import create_access_token
+from app.models.organizer import Organizer, OrganizerStatus
+from app.models.organizer_member import OrganizerMember, Role, Status as MemberStatus
+from app.models.user import User, PlatformRole, UserStatus
+
+_seq = itertools.count(1)
+
+
+def unique(prefix: str) -> str:
+    return f"{prefix}-{next(_seq)}-{uuid.uuid4().hex[:8]}"
+
+
+async def create_user(
+    engine: AsyncEngine,
+    email: str | None = None,
+    full_name: str = "Test User",
+    role: PlatformRole = PlatformRole.USER,
+    user_status: UserStatus = UserStatus.ACTIVE,
+    google_id: str | None = None,
+) -> int:
+    email = email or f"{unique('user')}@example.com"
+    async with async_sessionmaker(engine)() as db:
+        user = User(
+            email=email,
+            google_id=google_id or f"google-{email}",
+            full_name=full_name,
+            role=role,
+            user_status=user_status,
+        )
+        db.add(user)
+        await db.commit()
+        return user.id
+
+
+async def create_organizer(
+    engine: AsyncEngine,
+    members: dict[int, Role],
+    name: str | None = None,
+) -> int:
+    name = name or unique("Organizer")
+    async with async_sessionmaker(engine)() as db:
+        organizer = Organizer(name=name, slug=name.lower(), status=OrganizerStatus.VERIFIED)
+        db.add(organizer)
+        await db.flush()
+        for user_id, role in members.items():
+            db.add(OrganizerMember(
+                organizer_id=organizer.id,
+                user_id=user_id,
+                role=role,
+                status=MemberStatus.ACTIVE,
+            ))
+        await db.commit()
+        return organizer.id
+
+
+def auth_headers(user_id: int, role: PlatformRole = PlatformRole.USER) -> dict:
+    token = create_access_token(sub=str(user_id), extra={"role": role.value})
+    return {"Authorization": f"Bearer {token}"}
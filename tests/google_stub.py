@@ -0,0 +1,110 @@
+"""Stand-in endpoint cert Google (JWKS / PEM v1) + penanda tangan ID token lokal."""
+import base64
+import datetime
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from google.auth import crypt, jwt as google_jwt
+
+AUDIENCE = "test-client-id"
+ISSUER = "https://accounts.google.com"
+
+
+def _b64url(value: int) -> str:
+    raw = value.to_bytes((value.bit_length() + 7) // 8, "big")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+class SigningKey:
+    def __init__(self, kid: str):
+        self.kid = kid
+        self.private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        pem = self.private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+        self.signer = crypt.RSASigner.from_string(pem, key_id=kid)
+
+    def jwk(self) -> dict:
+        numbers = self.private_key.public_key().public_numbers()
+        return {"kid": self.kid, "kty": "RSA", "alg": "RS256", "use": "sig",
+                "n": _b64url(numbers.n), "e": _b64url(numbers.e)}
+
+    def certificate_pem(self) -> str:
+        name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, self.kid)])
+        now = datetime.datetime.now(datetime.timezone.utc)
+        cert = (
+            x509.CertificateBuilder()
+            .subject_name(name)
+            .issuer_name(name)
+            .public_key(self.private_key.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now - datetime.timedelta(days=1))
+            .not_valid_after(now + datetime.timedelta(days=1))
+            .sign(self.private_key, hashes.SHA256())
+        )
+        return cert.public_bytes(serialization.Encoding.PEM).decode("ascii")
+
+    def id_token(self, email: str = "user@example.com", **claims) -> str:
+        now = int(time.time())
+        payload = {
+            "iss": ISSUER,
+            "aud": AUDIENCE,
+            "sub": f"google-{email}",
+            "email": email,
+            "email_verified": True,
+            "name": "Test User",
+            "iat": now,
+            "exp": now + 3600,
+            **claims,
+        }
+        return google_jwt.encode(self.signer, payload).decode("ascii")
+
+
+class CertServer:
+    """HTTP server lokal; `keys` bisa diganti kapan saja untuk simulasi rotasi."""
+
+    def __init__(self, keys: list[SigningKey], fmt: str = "jwks", max_age: int = 3600):
+        self.keys = keys
+        self.fmt = fmt
+        self.max_age = max_age
+        self.hits = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.hits += 1
+                body = json.dumps(stub.payload()).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Cache-Control", f"public, max-age={stub.max_age}")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_port}/certs"
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def payload(self) -> dict:
+        if self.fmt == "jwks":
+            return {"keys": [key.jwk() for key in self.keys]}
+        return {key.kid: key.certificate_pem() for key in self.keys}
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,168 @@
+import os
+
+import pytest
+
+from app.core import codes
+from app.core.codes import (
+    ALPHABET,
+    LEASE_MS,
+    MAX_CLOCK_SKEW_MS,
+    MAX_SEQUENCE,
+    MAX_SLOT,
+    SEQUENCE_BITS,
+    SLOT_BITS,
+    WORKER_BITS,
+    CodeGenerator,
+    claim_worker_id,
+    decode_id,
+    encode_id,
+    new_ticket_code,
+)
+
+
+@pytest.fixture
+def claim(tmp_path):
+    fds = []
+
+    def _claim(host_id: int = 1) -> int:
+        worker_id, fd = claim_worker_id(host_id, str(tmp_path))
+        fds.append(fd)
+        return worker_id
+
+    yield _claim
+    for fd in fds:
+        os.close(fd)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Jam palsu (ms sejak EPOCH); sleep memajukan jam."""
+    state = {"now": 10_000_000, "slept": 0}
+
+    def sleep(seconds):
+        state["slept"] += 1
+        state["now"] += max(int(seconds * 1000), 1)
+
+    monkeypatch.setattr(codes, "_now_ms", lambda: state["now"])
+    monkeypatch.setattr(codes.time, "sleep", sleep)
+    return state
+
+
+def _ms(value: int) -> int:
+    return value >> (WORKER_BITS + SEQUENCE_BITS)
+
+
+def test_claimed_worker_ids_are_unique_per_process_slot(claim):
+    first, second = claim(), claim()
+    assert first != second
+    assert first >> SLOT_BITS == second >> SLOT_BITS == 1
+
+
+def test_two_generators_never_collide(claim):
+    a, b = CodeGenerator(claim()), CodeGenerator(claim())
+    ids = set()
+    for _ in range(20000):
+        ids.add(a.next_id())
+        ids.add(b.next_id())
+    assert len(ids) == 40000
+
+
+def test_released_slot_is_reused(tmp_path):
+    worker_id, fd = claim_worker_id(2, str(tmp_path))
+    os.close(fd)
+    again, fd = claim_worker_id(2, str(tmp_path))
+    os.close(fd)
+    assert again == worker_id
+
+
+def test_claim_fails_when_all_slots_taken(claim, tmp_path):
+    for _ in range(MAX_SLOT + 1):
+        claim()
+    with pytest.raises(RuntimeError):
+        claim_worker_id(1, str(tmp_path))
+
+
+def test_ids_and_codes_are_sortable():
+    generator = CodeGenerator(0)
+    ids = [generator.next_id() for _ in range(10000)]
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+    codes = [encode_id(value) for value in ids]
+    assert codes == sorted(codes)
+    # decode_id kebalikan encode_id
+    assert [decode_id(code) for code in codes] == ids
+
+
+def test_decode_round_trip_with_prefix_and_lookalikes():
+    code = new_ticket_code()
+    value = decode_id(code)
+    assert encode_id(value) == code.partition("-")[2]
+    body = code.partition("-")[2]
+    assert decode_id(body.lower().replace("0", "o").replace("1", "l")) == value
+
+
+def test_decode_rejects_bad_check_symbol():
+    code = encode_id(123456789)
+    bad = code[:-1] + next(c for c in ALPHABET if c != code[-1])
+    with pytest.raises(ValueError):
+        decode_id(bad)
+
+
+def test_decode_rejects_single_char_typo():
+    code = encode_id(987654321)
+    typo = code[:5] + ALPHABET[(ALPHABET.index(code[5]) + 1) % 32] + code[6:]
+    with pytest.raises(ValueError):
+        decode_id(typo)
+
+
+def test_sequence_overflow_waits_instead_of_borrowing_future_ms(clock):
+    generator = CodeGenerator(0)
+    ids = [generator.next_id() for _ in range(MAX_SEQUENCE + 2)]
+    assert len(set(ids)) == len(ids)
+    assert clock["slept"] == 1
+    assert max(_ms(value) for value in ids) <= clock["now"]
+
+
+def test_clock_backwards_continues_last_ms(clock):
+    generator = CodeGenerator(0)
+    first = generator.next_id()
+    clock["now"] -= 200
+    second = generator.next_id()
+    assert second > first
+    assert _ms(second) == _ms(first)
+
+
+def test_restart_in_same_slot_after_clock_step_back_never_reuses_ms(tmp_path, clock):
+    worker_id, fd = claim_worker_id(3, str(tmp_path))
+    old = CodeGenerator(worker_id, fd)
+    issued = [old.next_id() for _ in range(1000)]
+    clock["now"] += 300
+    issued.append(old.next_id())
+    os.close(fd)
+
+    # Proses pengganti mengklaim slot yang sama, jam NTP mundur 500 ms
+    clock["now"] -= 500
+    again, fd = claim_worker_id(3, str(tmp_path))
+    assert again == worker_id
+    try:
+        new = CodeGenerator(again, fd)
+        fresh = [new.next_id() for _ in range(1000)]
+    finally:
+        os.close(fd)
+    assert min(_ms(value) for value in fresh) > max(_ms(value) for value in issued)
+    # Menunggu paling lama sampai lease pemilik lama habis
+    assert clock["slept"] >= 1
+
+
+def test_restart_refuses_when_clock_far_behind_high_water(tmp_path, clock):
+    worker_id, fd = claim_worker_id(4, str(tmp_path))
+    CodeGenerator(worker_id, fd).next_id()
+    os.close(fd)
+
+    clock["now"] -= MAX_CLOCK_SKEW_MS + LEASE_MS + 1
+    again, fd = claim_worker_id(4, str(tmp_path))
+    try:
+        with pytest.raises(RuntimeError):
+            CodeGenerator(again, fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,267 @@
+"""
+Rencana eksekusi query hot path: tiap query harus lewat index yang
+disiapkan untuknya (migration 36d1e784e367 / 8a80e387fffa), bukan full scan.
+Schema test dibangun dari migration, jadi index yang diuji di sini memang
+index hasil migration.
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select, insert, delete, func
+
+from app.models.checkin import Checkin, CheckinResult
+from app.models.event import Event, EventVisibility
+from app.models.order import Order, OrderStatus
+from app.models.order_item import OrderItem
+from app.models.organizer_member import OrganizerMember, Role, Status as MemberStatus
+from app.models.payment import Payment, PaymentStatus
+from app.models.ticket import Ticket, TicketStatusEnum
+
+pytestmark = pytest.mark.mysql
+
+BUYERS = 200
+EVENTS = 20
+ORDERS = 4000
+TICKETS = 2000
+ORGANIZERS = 50
+# Id tinggi: events / organizer_members dipakai test lain, tidak di-delete
+EVENT_ID_BASE = 900000
+ORGANIZER_ID_BASE = 900000
+
+
+async def _seed(engine):
+    now = datetime.utcnow().replace(microsecond=0)
+    orders = []
+    for i in range(1, ORDERS + 1):
+        # ~5% pending (setengahnya sudah lewat expires_at), sisanya paid
+        pending = i % 20 == 0
+        orders.append({
+            "id": i,
+            "event_id": i % EVENTS + 1,
+            "organizer_id": 1,
+            "buyer_user_id": i % BUYERS + 1,
+            "order_code": f"ORD-TEST-{i}",
+            "status": OrderStatus.PENDING if pending else OrderStatus.PAID,
+            "currency": "IDR",
+            "subtotal": 100000,
+            "discount_total": 0,
+            "fee_total": 0,
+            "grand_total": 100000,
+            "expires_at": now + timedelta(minutes=-5 if i % 40 == 0 else 10),
+            "created_at": now - timedelta(minutes=i),
+            "updated_at": now,
+        })
+    tickets = [
+        {
+            "id": i,
+            "order_item_id": i,
+            "ticket_code": f"TIX-TEST-{i}",
+            "qr_token": f"qr-{i}",
+            "status": TicketStatusEnum.ISSUED,
+            "created_at": now,
+        }
+        for i in range(1, TICKETS + 1)
+    ]
+    order_items = [
+        {
+            "id": i,
+            "order_id": i,
+            "ticket_type_id": i % 50 + 1,
+            "qty": 1,
+            "unit_price": 100000,
+            "subtotal": 100000,
+            "created_at": now,
+        }
+        for i in range(1, ORDERS + 1)
+    ]
+    payments = [
+        {
+            "id": i,
+            "order_id": i,
+            "provider": "midtrans",
+            "method": "qris",
+            "amount": 100000,
+            "status": PaymentStatus.PAID,
+            "payment_ref": f"PAY-TEST-{i}",
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(1, ORDERS + 1)
+    ]
+    events = [
+        {
+            "id": EVENT_ID_BASE + i,
+            "organizer_id": ORGANIZER_ID_BASE + i % ORGANIZERS,
+            "created_by": 1,
+            "title": f"Explain {i}",
+            "slug": f"explain-{i}",
+            "start_at": now + timedelta(days=i % 90),
+            "end_at": now + timedelta(days=i % 90, hours=4),
+            "visibility": EventVisibility.PUBLISHED if i % 3 else EventVisibility.DRAFT,
+            "is_free": False,
+            "currency": "IDR",
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(1, ORDERS // 2 + 1)
+    ]
+    members = [
+        {
+            "organizer_id": ORGANIZER_ID_BASE + org,
+            "user_id": user,
+            "role": Role.VIEWER,
+            "status": MemberStatus.ACTIVE if (org + user) % 5 else MemberStatus.INACTIVE,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for org in range(ORGANIZERS)
+        for user in range(1, BUYERS + 1)
+    ]
+    checkins = [
+        {
+            "ticket_id": i % TICKETS + 1,
+            "gate_user_id": 1,
+            "scanned_at": now - timedelta(seconds=i),
+            "result": CheckinResult.OK if i <= TICKETS else CheckinResult.DUPLICATE,
+        }
+        for i in range(1, TICKETS * 2 + 1)
+    ]
+
+    async with engine.begin() as conn:
+        # Hanya data untuk planner; parent (user, event, order_item) tidak perlu ada
+        await conn.exec_driver_sql("SET foreign_key_checks=0")
+        for model in (Checkin, Ticket, Payment, OrderItem, Order):
+            await conn.execute(delete(model))
+        await conn.execute(delete(Event).where(Event.id > EVENT_ID_BASE))
+        await conn.execute(
+            delete(OrganizerMember).where(OrganizerMember.organizer_id >= ORGANIZER_ID_BASE)
+        )
+        await conn.execute(insert(Order), orders)
+        await conn.execute(insert(OrderItem), order_items)
+        await conn.execute(insert(Payment), payments)
+        await conn.execute(insert(Event), events)
+        await conn.execute(insert(OrganizerMember), members)
+        await conn.execute(insert(Ticket), tickets)
+        await conn.execute(insert(Checkin), checkins)
+        await conn.exec_driver_sql("SET foreign_key_checks=1")
+        await conn.exec_driver_sql(
+            "ANALYZE TABLE orders, order_items, payments, events, organizer_members, tickets, checkins"
+        )
+
+
+@pytest.fixture(scope="module")
+def engine(mysql_engine):
+    asyncio.run(_seed(mysql_engine))
+    return mysql_engine
+
+
+def _explain(engine, stmt) -> dict[str, dict]:
+    """EXPLAIN statement; return baris plan per nama tabel."""
+    async def run():
+        async with engine.connect() as conn:
+            sql = stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True})
+            result = await conn.exec_driver_sql(f"EXPLAIN {sql}")
+            return {row._mapping["table"]: row._asdict() for row in result}
+
+    return asyncio.run(run())
+
+
+def _assert_uses(plan: dict, table: str, key: str):
+    row = plan[table]
+    assert row["type"] != "ALL", row
+    assert row["key"] == key, row
+
+
+def test_buyer_order_list_uses_buyer_created_at_index(engine):
+    # Riwayat order user, terbaru dulu
+    stmt = (
+        select(Order.id, Order.order_code, Order.status, Order.grand_total, Order.created_at)
+        .where(Order.buyer_user_id == 7)
+        .order_by(Order.created_at.desc())
+        .limit(20)
+    )
+    plan = _explain(engine, stmt)
+    _assert_uses(plan, "orders", "ix_orders_buyer_user_id_created_at")
+    # ORDER BY ikut dilayani index, tidak perlu sort ulang
+    assert "filesort" not in (plan["orders"]["Extra"] or "")
+
+
+def test_event_order_list_uses_event_status_index(engine):
+    stmt = (
+        select(Order.id, Order.order_code, Order.grand_total)
+        .where(Order.event_id == 3, Order.status == OrderStatus.PAID)
+    )
+    _assert_uses(_explain(engine, stmt), "orders", "ix_orders_event_id_status")
+
+
+def test_expiry_sweeper_uses_status_expires_at_index(engine):
+    # Sama dengan SELECT di OrderExpiryService.expire_batch
+    stmt = (
+        select(Order.id, Order.promo_code_id)
+        .where(
+            Order.status == OrderStatus.PENDING,
+            Order.expires_at < func.utc_timestamp()
+        )
+        .order_by(Order.expires_at)
+        .limit(200)
+        .with_for_update(skip_locked=True)
+    )
+    plan = _explain(engine, stmt)
+    _assert_uses(plan, "orders", "ix_orders_status_expires_at")
+    assert plan["orders"]["type"] == "range"
+    assert "filesort" not in (plan["orders"]["Extra"] or "")
+
+
+def test_checkin_lookup_uses_ticket_index(engine):
+    # Cek duplikat check-in untuk tiket yang baru di-scan
+    stmt = (
+        select(Checkin.id)
+        .where(Checkin.ticket_id == 42, Checkin.result == CheckinResult.OK)
+        .limit(1)
+    )
+    _assert_uses(_explain(engine, stmt), "checkins", "ix_checkins_ticket_id_scanned_at")
+
+
+def test_ticket_lookup_by_code_uses_unique_key(engine):
+    stmt = select(Ticket.id, Ticket.status).where(Ticket.ticket_code == "TIX-TEST-42")
+    plan = _explain(engine, stmt)
+    assert plan["tickets"]["type"] == "const", plan["tickets"]
+
+
+def test_order_items_by_order_uses_covering_index(engine):
+    # Hitung qty per ticket type satu order (issue tiket / expiry)
+    stmt = select(OrderItem.ticket_type_id, OrderItem.qty).where(OrderItem.order_id == 42)
+    plan = _explain(engine, stmt)
+    _assert_uses(plan, "order_items", "ix_order_items_order_id")
+    assert "Using index" in (plan["order_items"]["Extra"] or "")
+
+
+def test_payment_webhook_lookup_uses_payment_ref_index(engine):
+    stmt = select(Payment.id, Payment.order_id, Payment.status).where(
+        Payment.payment_ref == "PAY-TEST-42"
+    )
+    _assert_uses(_explain(engine, stmt), "payments", "ix_payments_payment_ref")
+
+
+def test_organizer_event_list_uses_organizer_visibility_start_index(engine):
+    stmt = (
+        select(Event.id, Event.title, Event.start_at)
+        .where(
+            Event.organizer_id == ORGANIZER_ID_BASE + 7,
+            Event.visibility == EventVisibility.PUBLISHED,
+        )
+        .order_by(Event.start_at)
+        .limit(20)
+    )
+    plan = _explain(engine, stmt)
+    _assert_uses(plan, "events", "ix_events_organizer_id_visibility_start_at")
+    assert "filesort" not in (plan["events"]["Extra"] or "")
+
+
+def test_my_organizers_membership_uses_user_status_index(engine):
+    stmt = select(OrganizerMember.organizer_id, OrganizerMember.role).where(
+        OrganizerMember.user_id == 7,
+        OrganizerMember.status == MemberStatus.ACTIVE,
+    )
+    _assert_uses(_explain(engine, stmt), "organizer_members", "ix_organizer_members_user_id_status")
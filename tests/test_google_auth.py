@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+
+from app.core.google_auth import GoogleTokenVerifier
+from tests.google_stub import AUDIENCE, CertServer, SigningKey
+
+
+@pytest.fixture(scope="module")
+def key():
+    return SigningKey("kid-1")
+
+
+def _verifier(server: CertServer, **kwargs) -> GoogleTokenVerifier:
+    return GoogleTokenVerifier(certs_url=server.url, audience=AUDIENCE, **kwargs)
+
+
+@pytest.mark.parametrize("fmt", ["jwks", "pem"])
+def test_verify_accepts_jwks_and_pem_certs(key, fmt):
+    with CertServer([key], fmt=fmt) as server:
+        claims = asyncio.run(_verifier(server).verify(key.id_token("a@example.com")))
+    assert claims["email"] == "a@example.com"
+    assert claims["aud"] == AUDIENCE
+
+
+def test_certs_cached_between_logins(key):
+    async def scenario(verifier):
+        for i in range(20):
+            await verifier.verify(key.id_token(f"u{i}@example.com"))
+
+    with CertServer([key]) as server:
+        asyncio.run(scenario(_verifier(server)))
+        assert server.hits == 1
+
+
+def test_unknown_kid_refetches_once(key):
+    rotated = SigningKey("kid-2")
+
+    async def scenario(verifier, server):
+        await verifier.verify(key.id_token())
+        # Google rotasi key: token baru pakai kid yang belum ada di cache
+        server.keys = [key, rotated]
+        await asyncio.gather(*(verifier.verify(rotated.id_token()) for _ in range(10)))
+
+    with CertServer([key]) as server:
+        asyncio.run(scenario(_verifier(server, unknown_kid_cooldown_seconds=0), server))
+        assert server.hits == 2
+
+
+def test_unknown_kid_refetch_is_rate_limited(key):
+    forged = SigningKey("kid-forged")
+
+    async def scenario(verifier):
+        await verifier.verify(key.id_token())
+        for _ in range(5):
+            with pytest.raises(ValueError):
+                await verifier.verify(forged.id_token())
+
+    with CertServer([key]) as server:
+        asyncio.run(scenario(_verifier(server, unknown_kid_cooldown_seconds=60)))
+        assert server.hits == 1
+
+
+@pytest.mark.parametrize("claims", [
+    {"aud": "other-client"},
+    {"iss": "https://evil.example.com"},
+    {"exp": 1000, "iat": 900},
+])
+def test_invalid_claims_rejected(key, claims):
+    with CertServer([key]) as server:
+        with pytest.raises(ValueError):
+            asyncio.run(_verifier(server).verify(key.id_token(**claims)))
+
+
+def test_signature_from_other_key_rejected(key):
+    impostor = SigningKey("kid-1")
+    with CertServer([key]) as server:
+        with pytest.raises(ValueError):
+            asyncio.run(_verifier(server).verify(impostor.id_token()))
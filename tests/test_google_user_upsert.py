@@ -0,0 +1,79 @@
+"""
+Login Google paralel untuk akun yang sama: hanya satu row user, semua
+request dapat id yang sama, dan role / status row yang sudah ada dipakai.
+"""
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models.user import PlatformRole, User, UserStatus
+from app.services.user_service import UserService
+from tests.factories import unique
+
+pytestmark = pytest.mark.mysql
+
+PARALLEL_LOGINS = 20
+
+
+async def _login(sessions, email: str, google_id: str) -> dict:
+    async with sessions() as db:
+        return await UserService.upsert_google_user(
+            db, email=email, google_id=google_id, full_name="Paralel", avatar=None
+        )
+
+
+def test_parallel_first_login_creates_one_user(mysql_engine):
+    sessions = async_sessionmaker(mysql_engine, expire_on_commit=False)
+    email = f"{unique('paralel')}@example.com"
+    google_id = unique("sub")
+
+    async def scenario():
+        users = await asyncio.gather(
+            *(_login(sessions, email, google_id) for _ in range(PARALLEL_LOGINS))
+        )
+        async with sessions() as db:
+            count = await db.scalar(select(func.count()).select_from(User).where(User.email == email))
+        return users, count
+
+    users, count = asyncio.run(scenario())
+    assert count == 1
+    assert len({user["id"] for user in users}) == 1
+    assert all(user["role"] == PlatformRole.USER for user in users)
+
+
+def test_login_racing_committed_insert_reads_existing_row(mysql_engine):
+    """
+    Row lawan di-commit setelah SELECT pertama kita: snapshot REPEATABLE READ
+    tidak melihatnya, jadi data harus dibaca lewat locking read.
+    """
+    sessions = async_sessionmaker(mysql_engine, expire_on_commit=False)
+    email = f"{unique('race')}@example.com"
+    google_id = unique("sub")
+
+    async def scenario():
+        now = datetime.utcnow()
+        async with sessions() as rival:
+            result = await rival.execute(insert(User).values(
+                email=email,
+                google_id=google_id,
+                full_name="Admin",
+                role=PlatformRole.PLATFORM_ADMIN,
+                user_status=UserStatus.BANNED,
+                created_at=now,
+                updated_at=now,
+            ))
+            rival_id = result.lastrowid
+            # INSERT login menunggu lock row lawan yang belum commit
+            login = asyncio.create_task(_login(sessions, email, google_id))
+            await asyncio.sleep(0.5)
+            assert not login.done()
+            await rival.commit()
+        return rival_id, await login
+
+    rival_id, user = asyncio.run(scenario())
+    assert user["id"] == rival_id
+    assert user["role"] == PlatformRole.PLATFORM_ADMIN
+    assert user["user_status"] == UserStatus.BANNED
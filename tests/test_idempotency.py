@@ -0,0 +1,167 @@
+"""
+Idempotency-Key ke MySQL sungguhan. Handler dibungkus app kecil supaya
+jumlah eksekusinya bisa dihitung; middleware & tabelnya sama dengan produksi.
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from sqlalchemy import select, update
+
+from app.core import idempotency
+from app.core.idempotency import IdempotencyMiddleware
+from app.db import session
+from app.models.idempotency_key import IdempotencyKey, IdempotencyStatus
+from tests.factories import auth_headers, create_user, unique
+
+pytestmark = pytest.mark.mysql
+
+DUPLICATES = 5
+
+
+class Handler:
+    """Endpoint palsu: hitung eksekusi, bisa dibuat lambat / gagal."""
+
+    def __init__(self, delay: float = 0, fail_first: bool = False):
+        self.calls = 0
+        self.delay = delay
+        self.fail_first = fail_first
+        self.app = FastAPI()
+        self.app.add_middleware(IdempotencyMiddleware)
+        self.app.post("/orders")(self.create_order)
+
+    async def create_order(self, request: Request):
+        self.calls += 1
+        call = self.calls
+        await asyncio.sleep(self.delay)
+        if self.fail_first and call == 1:
+            return JSONResponse({"detail": "gateway error"}, status_code=502)
+        return JSONResponse({"call": call, "body": await request.json()}, status_code=201)
+
+
+def _run(scenario):
+    async def wrapper():
+        try:
+            return await scenario()
+        finally:
+            await session.engine.dispose()
+
+    return asyncio.run(wrapper())
+
+
+def _client(handler: Handler) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=handler.app), base_url="http://test")
+
+
+async def _headers(mysql_engine) -> dict:
+    user_id = await create_user(mysql_engine)
+    return {**auth_headers(user_id), "Idempotency-Key": unique("key")}
+
+
+def test_replay_returns_stored_response(mysql_engine):
+    handler = Handler()
+
+    async def scenario():
+        headers = await _headers(mysql_engine)
+        async with _client(handler) as client:
+            first = await client.post("/orders", json={"qty": 2}, headers=headers)
+            second = await client.post("/orders", json={"qty": 2}, headers=headers)
+        return first, second
+
+    first, second = _run(scenario)
+    assert first.status_code == second.status_code == 201
+    assert second.json() == first.json()
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert handler.calls == 1
+
+
+def test_same_key_different_body_rejected(mysql_engine):
+    handler = Handler()
+
+    async def scenario():
+        headers = await _headers(mysql_engine)
+        async with _client(handler) as client:
+            await client.post("/orders", json={"qty": 2}, headers=headers)
+            return await client.post("/orders", json={"qty": 3}, headers=headers)
+
+    resp = _run(scenario)
+    assert resp.status_code == 422
+    assert handler.calls == 1
+
+
+def test_concurrent_duplicates_run_handler_once(mysql_engine):
+    handler = Handler(delay=0.3)
+
+    async def scenario():
+        headers = await _headers(mysql_engine)
+        async with _client(handler) as client:
+            return await asyncio.gather(*(
+                client.post("/orders", json={"qty": 1}, headers=headers) for _ in range(DUPLICATES)
+            ))
+
+    responses = _run(scenario)
+    assert handler.calls == 1
+    # Duplikat menunggu (IDEMPOTENCY_WAIT_SECONDS > delay) lalu dapat replay
+    assert all(resp.status_code == 201 for resp in responses)
+    assert len({resp.json()["call"] for resp in responses}) == 1
+    assert sum(resp.headers.get("Idempotent-Replayed") == "true" for resp in responses) == DUPLICATES - 1
+
+
+def test_server_error_releases_claim(mysql_engine):
+    handler = Handler(fail_first=True)
+
+    async def scenario():
+        headers = await _headers(mysql_engine)
+        async with _client(handler) as client:
+            failed = await client.post("/orders", json={"qty": 1}, headers=headers)
+            retried = await client.post("/orders", json={"qty": 1}, headers=headers)
+        return failed, retried
+
+    failed, retried = _run(scenario)
+    assert failed.status_code == 502
+    # 5xx tidak disimpan: retry menjalankan handler lagi
+    assert retried.status_code == 201
+    assert "Idempotent-Replayed" not in retried.headers
+    assert handler.calls == 2
+
+
+def test_stale_owner_cannot_complete_or_release_taken_over_claim(mysql_engine):
+    async def scenario():
+        user_id = await create_user(mysql_engine)
+        key = unique("key")
+        fingerprint = b"x" * 32
+        stale_token, _ = await idempotency._claim(user_id, key, fingerprint)
+
+        # Proses pertama macet melewati PROCESSING timeout -> diambil alih
+        async with session.engine.begin() as conn:
+            await conn.execute(
+                update(IdempotencyKey)
+                .where(IdempotencyKey.user_id == user_id, IdempotencyKey.idem_key == key)
+                .values(expires_at=datetime.utcnow() - timedelta(seconds=1))
+            )
+        owner_token, _ = await idempotency._claim(user_id, key, fingerprint)
+        assert owner_token != stale_token
+
+        captured = {"status": 201, "headers": [], "body": bytearray(b"stale")}
+        await idempotency._complete(user_id, key, stale_token, captured)
+        await idempotency._release(user_id, key, stale_token)
+
+        async with session.engine.connect() as conn:
+            row = (await conn.execute(
+                select(IdempotencyKey.status, IdempotencyKey.claim_token)
+                .where(IdempotencyKey.user_id == user_id, IdempotencyKey.idem_key == key)
+            )).one()
+        assert row.status == IdempotencyStatus.PROCESSING
+        assert row.claim_token == owner_token
+
+        await idempotency._complete(user_id, key, owner_token, {**captured, "body": bytearray(b"owner")})
+        async with session.engine.connect() as conn:
+            return await conn.scalar(
+                select(IdempotencyKey.response_body)
+                .where(IdempotencyKey.user_id == user_id, IdempotencyKey.idem_key == key)
+            )
+
+    assert _run(scenario) == b"owner"
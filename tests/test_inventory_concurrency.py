@@ -0,0 +1,190 @@
+"""
+Reservasi paralel ke MySQL sungguhan: kuota tidak boleh oversell maupun
+undersell, baik mode row tunggal maupun sharded.
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select, insert, func
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models.ticket_type import TicketType, TicketStatus
+from app.models.ticket_type_shard import TicketTypeShard
+from app.services.inventory_service import InventoryService
+
+pytestmark = pytest.mark.mysql
+
+QUOTA = 60
+REQUESTS = 150
+# Di bawah max_connections default MySQL (151)
+CONCURRENCY = 50
+DEADLOCK_RETRIES = 5
+ER_LOCK_DEADLOCK = 1213
+
+
+async def _create_ticket_type(sessions, quota: int = QUOTA) -> int:
+    now = datetime.utcnow()
+    async with sessions() as db:
+        # Event induk tidak relevan untuk inventory
+        conn = await db.connection()
+        await conn.exec_driver_sql("SET foreign_key_checks=0")
+        result = await db.execute(
+            insert(TicketType).values(
+                event_id=1,
+                name="Presale",
+                price=100000,
+                quota=quota,
+                sold_count=0,
+                sale_start_at=now - timedelta(days=1),
+                sale_end_at=now + timedelta(days=1),
+                max_per_order=10,
+                inventory_shards=0,
+                status=TicketStatus.ACTIVE,
+                created_at=now,
+                updated_at=now,
+            )
+        )
+        await db.commit()
+        return result.inserted_primary_key[0]
+
+
+async def _reserve(sessions, semaphore, ticket_type_id: int, qty: int) -> bool:
+    """True = dapat kuota; False = ditolak karena habis. Deadlock diulang seperti client."""
+    async with semaphore:
+        for _ in range(DEADLOCK_RETRIES):
+            async with sessions() as db:
+                try:
+                    await InventoryService.reserve(db, ticket_type_id, qty)
+                    await db.commit()
+                    return True
+                except HTTPException as e:
+                    await db.rollback()
+                    assert e.status_code == 409, e.detail
+                    assert e.detail == "Tiket habis" or e.detail.startswith("Sisa tiket"), e.detail
+                    return False
+                except OperationalError as e:
+                    await db.rollback()
+                    if e.orig.args[0] != ER_LOCK_DEADLOCK:
+                        raise
+        raise AssertionError("Deadlock terus-menerus")
+
+
+async def _run_parallel(sessions, ticket_type_id: int, qty: int) -> list[bool]:
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    return await asyncio.gather(*(
+        _reserve(sessions, semaphore, ticket_type_id, qty) for _ in range(REQUESTS)
+    ))
+
+
+async def _sold(sessions, ticket_type_id: int) -> int:
+    async with sessions() as db:
+        shards = await db.scalar(
+            select(TicketType.inventory_shards).where(TicketType.id == ticket_type_id)
+        )
+        if shards:
+            return await db.scalar(
+                select(func.sum(TicketTypeShard.sold_count))
+                .where(TicketTypeShard.ticket_type_id == ticket_type_id)
+            )
+        return await db.scalar(
+            select(TicketType.sold_count).where(TicketType.id == ticket_type_id)
+        )
+
+
+@pytest.mark.parametrize("qty", [1, 3])
+def test_parallel_reserve_sells_exactly_quota(mysql_engine, qty):
+    sessions = async_sessionmaker(mysql_engine, expire_on_commit=False)
+
+    async def scenario():
+        ticket_type_id = await _create_ticket_type(sessions)
+        results = await _run_parallel(sessions, ticket_type_id, qty)
+        assert sum(results) == QUOTA // qty
+        assert await _sold(sessions, ticket_type_id) == QUOTA
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("qty", [1, 3])
+def test_parallel_reserve_sharded_sells_exactly_quota(mysql_engine, qty):
+    sessions = async_sessionmaker(mysql_engine, expire_on_commit=False)
+
+    async def scenario():
+        ticket_type_id = await _create_ticket_type(sessions)
+        async with sessions() as db:
+            await InventoryService.enable_sharding(db, ticket_type_id, 8)
+
+        results = await _run_parallel(sessions, ticket_type_id, qty)
+        assert sum(results) == QUOTA // qty
+        assert await _sold(sessions, ticket_type_id) == QUOTA
+
+        # Rebalance tidak boleh mengubah total kuota
+        async with sessions() as db:
+            total_quota = await db.scalar(
+                select(func.sum(TicketTypeShard.quota))
+                .where(TicketTypeShard.ticket_type_id == ticket_type_id)
+            )
+            assert total_quota == QUOTA
+            await InventoryService.refresh_sold_counts(db)
+            sold_count = await db.scalar(
+                select(TicketType.sold_count).where(TicketType.id == ticket_type_id)
+            )
+            assert sold_count == QUOTA
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("shards", [0, 8])
+def test_parallel_release_returns_quota(mysql_engine, shards):
+    sessions = async_sessionmaker(mysql_engine, expire_on_commit=False)
+    released = 20
+
+    async def release(ticket_type_id: int):
+        async with sessions() as db:
+            await InventoryService.release(db, ticket_type_id, 1)
+            await db.commit()
+
+    async def scenario():
+        ticket_type_id = await _create_ticket_type(sessions)
+        if shards:
+            async with sessions() as db:
+                await InventoryService.enable_sharding(db, ticket_type_id, shards)
+        assert sum(await _run_parallel(sessions, ticket_type_id, 1)) == QUOTA
+
+        await asyncio.gather(*(release(ticket_type_id) for _ in range(released)))
+        assert await _sold(sessions, ticket_type_id) == QUOTA - released
+
+        # Kuota yang dikembalikan bisa dijual lagi, tetap tanpa oversell
+        assert sum(await _run_parallel(sessions, ticket_type_id, 1)) == released
+        assert await _sold(sessions, ticket_type_id) == QUOTA
+
+    asyncio.run(scenario())
+
+
+def test_sold_out_after_stale_snapshot_is_not_busy(mysql_engine):
+    """
+    Snapshot transaksi diambil saat kuota masih ada, lalu transaksi lain
+    menghabiskannya: harus "Tiket habis", bukan "Tiket sedang ramai".
+    """
+    sessions = async_sessionmaker(mysql_engine, expire_on_commit=False)
+
+    async def scenario():
+        ticket_type_id = await _create_ticket_type(sessions, quota=2)
+        async with sessions() as stale:
+            # Consistent read pertama = snapshot REPEATABLE READ transaksi ini
+            await stale.scalar(select(TicketType.sold_count).where(TicketType.id == ticket_type_id))
+
+            async with sessions() as other:
+                await InventoryService.reserve(other, ticket_type_id, 2)
+                await other.commit()
+
+            with pytest.raises(HTTPException) as exc:
+                await InventoryService.reserve(stale, ticket_type_id, 1)
+            await stale.rollback()
+        return exc.value
+
+    error = asyncio.run(scenario())
+    assert error.status_code == 409
+    assert error.detail == "Tiket habis"
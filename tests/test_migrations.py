@@ -0,0 +1,43 @@
+"""
+Schema test dibangun dari migration (lihat conftest.migrate_schema); di sini
+dicek tidak ada tabel / kolom / index model yang tertinggal di migration.
+"""
+import asyncio
+
+import pytest
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+
+from app.db.base import Base
+import app.models  # noqa: F401
+
+pytestmark = pytest.mark.mysql
+
+# Hanya beda struktur; beda tipe / default server tidak dicek di sini
+STRUCTURAL = {
+    "add_table", "remove_table",
+    "add_column", "remove_column",
+    "add_index", "remove_index",
+}
+
+
+def _diff_op(diff):
+    # Diff kolom / index berbentuk tuple; diff modify_* berbentuk list of tuple
+    return diff[0] if isinstance(diff, tuple) else diff[0][0]
+
+
+def test_migrations_match_models(mysql_engine):
+    async def run():
+        async with mysql_engine.connect() as conn:
+            return await conn.run_sync(
+                lambda sync_conn: compare_metadata(
+                    MigrationContext.configure(sync_conn), Base.metadata
+                )
+            )
+
+    diffs = [
+        diff for diff in asyncio.run(run())
+        if _diff_op(diff) in STRUCTURAL
+        and not (_diff_op(diff) == "remove_table" and diff[1].name == "alembic_version")
+    ]
+    assert diffs == []
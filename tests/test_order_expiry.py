@@ -0,0 +1,198 @@
+"""
+Sweeper order expired ke MySQL sungguhan: kuota & pemakaian promo kembali,
+order yang sedang dikunci transaksi lain dilewati (SKIP LOCKED).
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models.order import Order, OrderStatus
+from app.models.order_item import OrderItem
+from app.models.promo_code import PromoCode, PromoCodeStatus, PromoCodeType
+from app.models.ticket_type import TicketStatus, TicketType
+from app.services.order_expiry_service import OrderExpiryService
+from tests.factories import unique
+
+pytestmark = pytest.mark.mysql
+
+BATCH_SIZE = 2
+
+
+async def _reset(sessions):
+    """Order sisa test lain ikut ter-expire kalau dibiarkan; mulai dari kosong."""
+    async with sessions() as db:
+        conn = await db.connection()
+        await conn.exec_driver_sql("SET foreign_key_checks=0")
+        await db.execute(delete(OrderItem))
+        await db.execute(delete(Order))
+        await db.commit()
+
+
+async def _create_ticket_type(sessions, sold_count: int) -> int:
+    now = datetime.utcnow()
+    async with sessions() as db:
+        conn = await db.connection()
+        await conn.exec_driver_sql("SET foreign_key_checks=0")
+        result = await db.execute(insert(TicketType).values(
+            event_id=1,
+            name="Reguler",
+            price=100000,
+            quota=100,
+            sold_count=sold_count,
+            sale_start_at=now - timedelta(days=1),
+            sale_end_at=now + timedelta(days=1),
+            max_per_order=10,
+            inventory_shards=0,
+            status=TicketStatus.ACTIVE,
+            created_at=now,
+            updated_at=now,
+        ))
+        await db.commit()
+        return result.inserted_primary_key[0]
+
+
+async def _create_promo(sessions, used_count: int) -> int:
+    now = datetime.utcnow()
+    async with sessions() as db:
+        conn = await db.connection()
+        await conn.exec_driver_sql("SET foreign_key_checks=0")
+        result = await db.execute(insert(PromoCode).values(
+            organizer_id=1,
+            code=unique("PROMO"),
+            type=PromoCodeType.AMOUNT,
+            value=10000,
+            quota=100,
+            used_count=used_count,
+            valid_from=now - timedelta(days=1),
+            valid_until=now + timedelta(days=1),
+            status=PromoCodeStatus.ACTIVE,
+            created_at=now,
+        ))
+        await db.commit()
+        return result.inserted_primary_key[0]
+
+
+async def _create_order(sessions, items: dict[int, int], expired: bool = True, promo_code_id=None) -> int:
+    now = datetime.utcnow().replace(microsecond=0)
+    async with sessions() as db:
+        conn = await db.connection()
+        await conn.exec_driver_sql("SET foreign_key_checks=0")
+        result = await db.execute(insert(Order).values(
+            event_id=1,
+            organizer_id=1,
+            buyer_user_id=1,
+            promo_code_id=promo_code_id,
+            order_code=unique("ORD"),
+            status=OrderStatus.PENDING,
+            currency="IDR",
+            subtotal=100000,
+            discount_total=0,
+            fee_total=0,
+            grand_total=100000,
+            expires_at=now + timedelta(minutes=-1 if expired else 15),
+            created_at=now,
+            updated_at=now,
+        ))
+        order_id = result.inserted_primary_key[0]
+        await db.execute(insert(OrderItem), [
+            {
+                "order_id": order_id,
+                "ticket_type_id": ticket_type_id,
+                "qty": qty,
+                "unit_price": 100000,
+                "subtotal": 100000 * qty,
+                "created_at": now,
+            }
+            for ticket_type_id, qty in items.items()
+        ])
+        await db.commit()
+        return order_id
+
+
+async def _status(sessions, order_id: int):
+    async with sessions() as db:
+        return await db.scalar(select(Order.status).where(Order.id == order_id))
+
+
+async def _scalar(sessions, column, id_column, row_id: int):
+    async with sessions() as db:
+        return await db.scalar(select(column).where(id_column == row_id))
+
+
+def test_expire_batch_releases_quota(mysql_engine):
+    sessions = async_sessionmaker(mysql_engine, expire_on_commit=False)
+
+    async def scenario():
+        await _reset(sessions)
+        vip = await _create_ticket_type(sessions, sold_count=7)
+        regular = await _create_ticket_type(sessions, sold_count=4)
+        expired = [
+            await _create_order(sessions, {vip: 2, regular: 1}),
+            await _create_order(sessions, {vip: 3}),
+            await _create_order(sessions, {regular: 2}),
+        ]
+        active = await _create_order(sessions, {vip: 1}, expired=False)
+
+        async with sessions() as db:
+            total = await OrderExpiryService.sweep(db, BATCH_SIZE, max_batches=10)
+        assert total == len(expired)
+        for order_id in expired:
+            assert await _status(sessions, order_id) == OrderStatus.EXPIRED
+        assert await _status(sessions, active) == OrderStatus.PENDING
+        # Order aktif (qty 1 vip) masih memegang kuotanya
+        assert await _scalar(sessions, TicketType.sold_count, TicketType.id, vip) == 2
+        assert await _scalar(sessions, TicketType.sold_count, TicketType.id, regular) == 1
+
+    asyncio.run(scenario())
+
+
+def test_expire_batch_rolls_back_promo_usage(mysql_engine):
+    sessions = async_sessionmaker(mysql_engine, expire_on_commit=False)
+
+    async def scenario():
+        await _reset(sessions)
+        ticket_type_id = await _create_ticket_type(sessions, sold_count=3)
+        promo = await _create_promo(sessions, used_count=5)
+        for _ in range(3):
+            await _create_order(sessions, {ticket_type_id: 1}, promo_code_id=promo)
+        await _create_order(sessions, {ticket_type_id: 1}, expired=False, promo_code_id=promo)
+
+        async with sessions() as db:
+            assert await OrderExpiryService.sweep(db, BATCH_SIZE, max_batches=10) == 3
+        assert await _scalar(sessions, PromoCode.used_count, PromoCode.id, promo) == 2
+
+    asyncio.run(scenario())
+
+
+def test_expire_batch_skips_locked_order(mysql_engine):
+    sessions = async_sessionmaker(mysql_engine, expire_on_commit=False)
+
+    async def scenario():
+        await _reset(sessions)
+        ticket_type_id = await _create_ticket_type(sessions, sold_count=3)
+        locked = await _create_order(sessions, {ticket_type_id: 1})
+        free = [await _create_order(sessions, {ticket_type_id: 1}) for _ in range(2)]
+
+        async with sessions() as payment:
+            # Mis. webhook pembayaran sedang memproses order ini
+            await payment.execute(select(Order.id).where(Order.id == locked).with_for_update())
+
+            async with sessions() as db:
+                # Tidak menunggu lock: langsung ambil order lain
+                expired = await asyncio.wait_for(
+                    OrderExpiryService.expire_batch(db, batch_size=10), timeout=5
+                )
+            assert expired == len(free)
+            assert await _status(sessions, locked) == OrderStatus.PENDING
+            assert await _scalar(sessions, TicketType.sold_count, TicketType.id, ticket_type_id) == 1
+            await payment.rollback()
+
+        async with sessions() as db:
+            assert await OrderExpiryService.expire_batch(db, batch_size=10) == 1
+        assert await _status(sessions, locked) == OrderStatus.EXPIRED
+        assert await _scalar(sessions, TicketType.sold_count, TicketType.id, ticket_type_id) == 0
+
+    asyncio.run(scenario())
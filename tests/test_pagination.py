@@ -0,0 +1,91 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.pagination import decode_cursor, encode_cursor, paginate
+from app.models.organizer_member import Role
+from tests.factories import auth_headers, create_organizer, create_user
+
+
+def _rows(n: int) -> list:
+    return [SimpleNamespace(id=i) for i in range(1, n + 1)]
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("my-organizers", [42, "2026-01-01"])
+    assert decode_cursor("my-organizers", cursor) == [42, "2026-01-01"]
+
+
+@pytest.mark.parametrize("cursor", ["", "abc", "!!!"])
+def test_garbage_cursor_rejected(cursor):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor("my-organizers", cursor)
+    assert exc.value.status_code == 400
+
+
+def test_tampered_cursor_rejected():
+    cursor = encode_cursor("my-organizers", [42])
+    tampered = ("B" if cursor[3] != "B" else "C").join((cursor[:3], cursor[4:]))
+    with pytest.raises(HTTPException):
+        decode_cursor("my-organizers", tampered)
+
+
+def test_cursor_bound_to_scope():
+    cursor = encode_cursor("organizer-members:1", [42])
+    with pytest.raises(HTTPException):
+        decode_cursor("organizer-members:2", cursor)
+
+
+def test_paginate_has_more():
+    rows, cursor = paginate(_rows(4), 3, "s", lambda row: [row.id])
+    assert [row.id for row in rows] == [1, 2, 3]
+    assert decode_cursor("s", cursor) == [3]
+
+
+@pytest.mark.parametrize("fetched", [0, 2, 3])
+def test_paginate_last_page_has_no_cursor(fetched):
+    rows, cursor = paginate(_rows(fetched), 3, "s", lambda row: [row.id])
+    assert len(rows) == fetched
+    assert cursor is None
+
+
+def test_paginate_limit_zero():
+    # Handler mengambil limit + 1 = 1 baris
+    assert paginate(_rows(1), 0, "s", lambda row: [row.id]) == ([], None)
+
+
+@pytest.mark.mysql
+def test_list_endpoints_with_limit_zero_and_cursor(api, mysql_engine):
+    async def scenario(client):
+        owner = await create_user(mysql_engine)
+        others = [await create_user(mysql_engine) for _ in range(4)]
+        organizer_id = await create_organizer(
+            mysql_engine, {owner: Role.ORGANIZER_ADMIN, **{u: Role.VIEWER for u in others}}
+        )
+        headers = auth_headers(owner)
+
+        for path in ("/api/v1/organizers/my-organizers", f"/api/v1/organizers/{organizer_id}/members"):
+            resp = await client.get(path, params={"limit": 0}, headers=headers)
+            assert resp.status_code == 200, resp.text
+            assert resp.json() == []
+            assert "x-next-cursor" not in resp.headers
+
+            resp = await client.get(path, params={"limit": -1}, headers=headers)
+            assert resp.status_code == 422
+
+        # Keyset: 5 member, 2 per halaman, tidak ada duplikat / yang terlewat
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+            resp = await client.get(
+                f"/api/v1/organizers/{organizer_id}/members", params=params, headers=headers
+            )
+            assert resp.status_code == 200, resp.text
+            seen += [member["user_id"] for member in resp.json()]
+            cursor = resp.headers.get("x-next-cursor")
+            if cursor is None:
+                break
+        assert seen == sorted([owner, *others])
+
+    api(scenario)
@@ -0,0 +1,62 @@
+"""
+Metrics pool dipasang lewat pool event: harus tetap tercatat setelah
+engine.dispose() membuat pool baru, termasuk waktu tunggu & timeout.
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.pool_metrics import InstrumentedQueuePool, PoolMetrics
+
+pytestmark = pytest.mark.mysql
+
+POOL_TIMEOUT = 0.2
+
+
+async def _checkout(engine, times: int):
+    for _ in range(times):
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+
+def test_metrics_survive_dispose(mysql_engine):
+    async def scenario():
+        engine = create_async_engine(
+            mysql_engine.url,
+            poolclass=InstrumentedQueuePool,
+            pool_pre_ping=True,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=POOL_TIMEOUT,
+        )
+        metrics = PoolMetrics("test", engine)
+        try:
+            await _checkout(engine, 3)
+            before = metrics.snapshot()
+
+            old_pool = engine.sync_engine.pool
+            await engine.dispose()
+            assert engine.sync_engine.pool is not old_pool
+
+            await _checkout(engine, 2)
+            # Pool penuh (size 1, tanpa overflow): checkout kedua timeout
+            async with engine.connect():
+                with pytest.raises(exc.TimeoutError):
+                    async with engine.connect():
+                        pass
+            return before, metrics.snapshot()
+        finally:
+            await engine.dispose()
+
+    before, after = asyncio.run(scenario())
+    assert before["checkout_wait"]["count"] == 3
+    assert before["connects"] == 1
+    # 2 checkout + 1 yang memegang koneksi + 1 yang timeout
+    assert after["checkout_wait"]["count"] == 7
+    assert after["checkout_wait"]["max_ms"] >= POOL_TIMEOUT * 1000
+    assert after["pre_ping"]["count"] == 6
+    assert after["hold"]["count"] == 6
+    assert after["connects"] == 2
+    assert after["timeouts"] == 1
@@ -0,0 +1,100 @@
+import base64
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core import qr
+from app.core.codes import new_ticket_code
+from app.core.config import settings
+from app.models.checkin import CheckinResult
+
+ISSUED_AT = datetime(2026, 10, 1, 12, 30, 0)
+
+
+@pytest.fixture(autouse=True)
+def clean_revocations():
+    qr.revoked_tickets.clear()
+    yield
+    qr.revoked_tickets.clear()
+
+
+def _rotate(monkeypatch, keys: dict[int, str], active_kid: int):
+    monkeypatch.setattr(settings, "QR_SIGNING_KEYS", keys)
+    monkeypatch.setattr(settings, "QR_ACTIVE_KID", active_kid)
+    monkeypatch.setattr(qr, "_keys", qr._load_keys())
+
+
+def _flip_byte(token: str, index: int) -> str:
+    raw = bytearray(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    raw[index] ^= 0x01
+    return base64.urlsafe_b64encode(bytes(raw)).rstrip(b"=").decode("ascii")
+
+
+def test_sign_verify_round_trip():
+    code = new_ticket_code()
+    token = qr.sign_ticket(code, 42, 7, ISSUED_AT)
+    claims = qr.verify_qr_token(token, event_id=42)
+    assert claims.ticket_code == code
+    assert claims.event_id == 42
+    assert claims.ticket_type_id == 7
+    assert claims.issued_at == ISSUED_AT
+    assert len(base64.urlsafe_b64decode(token + "==")) == qr.TOKEN_LENGTH
+
+
+@pytest.mark.parametrize("index", [0, 1, 2, 10, 18, 26, 34, qr.TOKEN_LENGTH - 1])
+def test_tampered_token_rejected(index):
+    token = qr.sign_ticket(new_ticket_code(), 42, 7, ISSUED_AT)
+    with pytest.raises(qr.QrTokenError) as exc:
+        qr.verify_qr_token(_flip_byte(token, index))
+    assert exc.value.result == CheckinResult.INVALID
+
+
+def test_malformed_token_rejected():
+    for token in ("", "not-a-token", "A" * 61):
+        with pytest.raises(qr.QrTokenError) as exc:
+            qr.verify_qr_token(token)
+        assert exc.value.result == CheckinResult.INVALID
+
+
+def test_wrong_event_rejected():
+    token = qr.sign_ticket(new_ticket_code(), 42, 7, ISSUED_AT)
+    with pytest.raises(qr.QrTokenError) as exc:
+        qr.verify_qr_token(token, event_id=43)
+    assert exc.value.result == CheckinResult.INVALID
+
+
+def test_old_key_still_accepted_after_rotation(monkeypatch):
+    _rotate(monkeypatch, {1: "old-key"}, active_kid=1)
+    old_token = qr.sign_ticket(new_ticket_code(), 42, 7, ISSUED_AT)
+
+    _rotate(monkeypatch, {1: "old-key", 2: "new-key"}, active_kid=2)
+    new_token = qr.sign_ticket(new_ticket_code(), 42, 7, ISSUED_AT)
+    assert qr.verify_qr_token(old_token).kid == 1
+    assert qr.verify_qr_token(new_token).kid == 2
+
+    # Key lama dipensiunkan: token lama ditolak
+    _rotate(monkeypatch, {2: "new-key"}, active_kid=2)
+    with pytest.raises(qr.QrTokenError):
+        qr.verify_qr_token(old_token)
+    assert qr.verify_qr_token(new_token).kid == 2
+
+
+def test_revoked_ticket_blocked():
+    code = new_ticket_code()
+    token = qr.sign_ticket(code, 42, 7, ISSUED_AT)
+    qr.revoke_ticket(code)
+    with pytest.raises(qr.QrTokenError) as exc:
+        qr.verify_qr_token(token)
+    assert exc.value.result == CheckinResult.BLOCKED
+
+
+def test_prune_drops_revocations_of_ended_events():
+    now = datetime.utcnow()
+    ended, running = new_ticket_code(), new_ticket_code()
+    qr.revoke_ticket(ended, event_end_at=now - timedelta(hours=1))
+    qr.revoke_ticket(running, event_end_at=now + timedelta(hours=1))
+
+    assert qr.prune_revocations(now) == 1
+    assert qr.verify_qr_token(qr.sign_ticket(ended, 42, 7, ISSUED_AT)).ticket_code == ended
+    with pytest.raises(qr.QrTokenError):
+        qr.verify_qr_token(qr.sign_ticket(running, 42, 7, ISSUED_AT))
@@ -0,0 +1,80 @@
+"""
+Budget query endpoint list: jumlah query tidak boleh ikut naik dengan
+jumlah member / organizer (N+1).
+"""
+import asyncio
+
+import pytest
+
+from app.db import session
+from app.db.query_stats import assert_query_budget, query_budget
+from app.models.organizer_member import Role
+from app.services.organizer_member_service import OrganizerMemberService
+from tests.factories import auth_headers, create_organizer, create_user
+
+pytestmark = pytest.mark.mysql
+
+MEMBERS = 30
+ORGANIZERS = 5
+
+
+def test_members_list_query_budget(api, mysql_engine):
+    async def scenario(client):
+        admin = await create_user(mysql_engine)
+        members = {admin: Role.ORGANIZER_ADMIN}
+        for _ in range(MEMBERS):
+            members[await create_user(mysql_engine)] = Role.VIEWER
+        organizer_id = await create_organizer(mysql_engine, members)
+        headers = auth_headers(admin)
+
+        # Request pertama: + load user (cache principal masih kosong)
+        resp = await client.get(f"/api/v1/organizers/{organizer_id}/members", headers=headers)
+        assert resp.status_code == 200, resp.text
+        assert len(resp.json()) == MEMBERS + 1
+        assert_query_budget(resp, 3)
+
+        # Membership + list
+        resp = await client.get(f"/api/v1/organizers/{organizer_id}/members", headers=headers)
+        assert_query_budget(resp, 2)
+
+    api(scenario)
+
+
+def test_my_organizers_query_budget(api, mysql_engine):
+    async def scenario(client):
+        user_id = await create_user(mysql_engine)
+        for _ in range(ORGANIZERS):
+            others = {await create_user(mysql_engine): Role.VIEWER for _ in range(3)}
+            await create_organizer(mysql_engine, {user_id: Role.FINANCE, **others})
+        headers = auth_headers(user_id)
+
+        resp = await client.get("/api/v1/organizers/my-organizers", headers=headers)
+        assert resp.status_code == 200, resp.text
+        assert len(resp.json()) == ORGANIZERS
+        assert all(row["member_count"] == 4 for row in resp.json())
+        assert_query_budget(resp, 2)
+
+        resp = await client.get("/api/v1/organizers/my-organizers", headers=headers)
+        assert_query_budget(resp, 1)
+
+    api(scenario)
+
+
+def test_members_service_single_query(mysql_engine):
+    async def scenario():
+        admin = await create_user(mysql_engine)
+        organizer_id = await create_organizer(mysql_engine, {admin: Role.ORGANIZER_ADMIN})
+        try:
+            async with session.AsyncSessionLocal() as db:
+                with query_budget(1) as stats:
+                    rows = await OrganizerMemberService.get_organizer_members_with_users(
+                        db, organizer_id
+                    )
+            return stats.count, rows
+        finally:
+            await session.engine.dispose()
+
+    count, rows = asyncio.run(scenario())
+    # count 0 = listener tidak terpasang; budget jadi tidak berarti
+    assert count == 1
+    assert len(rows) == 1
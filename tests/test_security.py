@@ -0,0 +1,81 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.core import security
+from app.core.config import settings
+
+
+@pytest.fixture(autouse=True)
+def _fast_rounds(monkeypatch):
+    # Cukup untuk uji perilaku; benchmark pakai BCRYPT_ROUNDS asli
+    monkeypatch.setattr(security, "BCRYPT_ROUNDS", 8)
+
+
+def test_async_hash_round_trip():
+    async def scenario():
+        hashed = await security.create_bsha256_async("rahasia-123")
+        assert hashed.startswith(security.PREFIX)
+        assert await security.verify_password_async("rahasia-123", hashed)
+        assert not await security.verify_password_async("salah", hashed)
+        assert await security.maybe_upgrade_hash_async("rahasia-123", hashed) is None
+
+    asyncio.run(scenario())
+
+
+def test_legacy_hash_upgraded_async():
+    legacy = security.md5_hex("lama")
+
+    async def scenario():
+        assert await security.verify_password_async("lama", legacy)
+        upgraded = await security.maybe_upgrade_hash_async("lama", legacy)
+        assert await security.verify_password_async("lama", upgraded)
+
+    asyncio.run(scenario())
+
+
+def test_full_queue_returns_503_with_retry_after(monkeypatch):
+    monkeypatch.setattr(settings, "BCRYPT_MAX_PENDING", 2)
+    hashed = security.create_bsha256("x")
+
+    async def scenario():
+        results = await asyncio.gather(
+            *(security.verify_password_async("x", hashed) for _ in range(5)),
+            return_exceptions=True,
+        )
+        rejected = [r for r in results if isinstance(r, HTTPException)]
+        assert [r for r in results if r is True] and len(rejected) == 3
+        for error in rejected:
+            assert error.status_code == 503
+            assert error.headers == {"Retry-After": "1"}
+        # Antrian kosong lagi setelah job selesai
+        assert security._bcrypt_pending == 0
+        assert await security.verify_password_async("x", hashed)
+
+    asyncio.run(scenario())
+
+
+def test_hashing_does_not_block_event_loop(monkeypatch):
+    # ~100 ms per hash: cukup lama untuk diukur
+    monkeypatch.setattr(security, "BCRYPT_ROUNDS", 11)
+
+    async def scenario():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.005)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        start = time.perf_counter()
+        await asyncio.gather(*(security.create_bsha256_async("p") for _ in range(4)))
+        elapsed = time.perf_counter() - start
+        task.cancel()
+        # Loop tetap jalan selama hashing (sync di loop: ticks ~0)
+        assert ticks >= elapsed / 0.005 * 0.5
+
+    asyncio.run(scenario())
@@ -0,0 +1,164 @@
+"""
+Penerbitan tiket ke MySQL sungguhan: dijalankan ulang tidak menggandakan
+tiket, order yang baru terbit sebagian hanya dilengkapi kekurangannya.
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.codes import new_ticket_code
+from app.models.order import Order, OrderStatus
+from app.models.order_item import OrderItem
+from app.models.ticket import Ticket, TicketStatusEnum
+from app.services.ticket_issuance_service import TicketIssuanceService
+from tests.factories import unique
+
+pytestmark = pytest.mark.mysql
+
+
+async def _reset(sessions):
+    async with sessions() as db:
+        conn = await db.connection()
+        await conn.exec_driver_sql("SET foreign_key_checks=0")
+        await db.execute(delete(Ticket))
+        await db.execute(delete(OrderItem))
+        await db.execute(delete(Order))
+        await db.commit()
+
+
+async def _create_order(sessions, quantities: list[int], order_status=OrderStatus.PAID) -> tuple[int, list[int]]:
+    """Return (order_id, [order_item_id per qty])."""
+    now = datetime.utcnow().replace(microsecond=0)
+    async with sessions() as db:
+        conn = await db.connection()
+        await conn.exec_driver_sql("SET foreign_key_checks=0")
+        result = await db.execute(insert(Order).values(
+            event_id=1,
+            organizer_id=1,
+            buyer_user_id=1,
+            order_code=unique("ORD"),
+            status=order_status,
+            currency="IDR",
+            subtotal=100000 * sum(quantities),
+            discount_total=0,
+            fee_total=0,
+            grand_total=100000 * sum(quantities),
+            expires_at=now + timedelta(minutes=15),
+            created_at=now,
+            updated_at=now,
+        ))
+        order_id = result.inserted_primary_key[0]
+        item_ids = []
+        for ticket_type_id, qty in enumerate(quantities, start=1):
+            result = await db.execute(insert(OrderItem).values(
+                order_id=order_id,
+                ticket_type_id=ticket_type_id,
+                qty=qty,
+                unit_price=100000,
+                subtotal=100000 * qty,
+                created_at=now,
+            ))
+            item_ids.append(result.inserted_primary_key[0])
+        await db.commit()
+        return order_id, item_ids
+
+
+async def _issue_manually(sessions, order_item_id: int, count: int) -> None:
+    """Sisa run sebelumnya yang crash di tengah jalan."""
+    now = datetime.utcnow().replace(microsecond=0)
+    async with sessions() as db:
+        for _ in range(count):
+            ticket_code = new_ticket_code()
+            await db.execute(insert(Ticket).values(
+                order_item_id=order_item_id,
+                ticket_code=ticket_code,
+                qr_token=f"partial-{ticket_code}",
+                status=TicketStatusEnum.ISSUED,
+                issued_at=now,
+                created_at=now,
+            ))
+        await db.commit()
+
+
+async def _ticket_counts(sessions, item_ids: list[int]) -> list[int]:
+    async with sessions() as db:
+        result = await db.execute(
+            select(Ticket.order_item_id, func.count(Ticket.id))
+            .where(Ticket.order_item_id.in_(item_ids))
+            .group_by(Ticket.order_item_id)
+        )
+        counts = dict(result.all())
+    return [counts.get(item_id, 0) for item_id in item_ids]
+
+
+async def _issue(sessions, order_id: int) -> int:
+    async with sessions() as db:
+        return await TicketIssuanceService.issue_for_order(db, order_id)
+
+
+def test_issue_twice_does_not_duplicate(mysql_engine):
+    sessions = async_sessionmaker(mysql_engine, expire_on_commit=False)
+
+    async def scenario():
+        await _reset(sessions)
+        order_id, item_ids = await _create_order(sessions, [2, 3])
+
+        assert await _issue(sessions, order_id) == 5
+        assert await _ticket_counts(sessions, item_ids) == [2, 3]
+        assert await _issue(sessions, order_id) == 0
+        assert await _ticket_counts(sessions, item_ids) == [2, 3]
+
+    asyncio.run(scenario())
+
+
+def test_partially_issued_order_is_completed(mysql_engine):
+    sessions = async_sessionmaker(mysql_engine, expire_on_commit=False)
+
+    async def scenario():
+        await _reset(sessions)
+        order_id, item_ids = await _create_order(sessions, [4, 2, 1])
+        # Item pertama terbit sebagian, item kedua sudah lengkap
+        await _issue_manually(sessions, item_ids[0], 1)
+        await _issue_manually(sessions, item_ids[1], 2)
+
+        assert await _issue(sessions, order_id) == 3 + 0 + 1
+        assert await _ticket_counts(sessions, item_ids) == [4, 2, 1]
+        assert await _issue(sessions, order_id) == 0
+        assert await _ticket_counts(sessions, item_ids) == [4, 2, 1]
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_issue_is_serialized(mysql_engine):
+    sessions = async_sessionmaker(mysql_engine, expire_on_commit=False)
+
+    async def scenario():
+        await _reset(sessions)
+        order_id, item_ids = await _create_order(sessions, [3, 2])
+
+        # Dua worker mengambil job yang sama: FOR UPDATE membuat yang kedua
+        # menunggu lalu melihat tiket hasil worker pertama
+        issued = await asyncio.gather(*(_issue(sessions, order_id) for _ in range(2)))
+        assert sorted(issued) == [0, 5]
+        assert await _ticket_counts(sessions, item_ids) == [3, 2]
+
+    asyncio.run(scenario())
+
+
+def test_unpaid_order_is_rejected(mysql_engine):
+    sessions = async_sessionmaker(mysql_engine, expire_on_commit=False)
+
+    async def scenario():
+        await _reset(sessions)
+        order_id, item_ids = await _create_order(sessions, [2], order_status=OrderStatus.PENDING)
+
+        with pytest.raises(HTTPException) as exc:
+            await _issue(sessions, order_id)
+        assert exc.value.status_code == 409
+        assert await _ticket_counts(sessions, item_ids) == [0]
+
+    asyncio.run(scenario())
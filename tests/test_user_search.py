@@ -0,0 +1,51 @@
+import asyncio
+import random
+import string
+
+import pytest
+from fastapi import HTTPException
+
+from app.models.organizer_member import Role
+from app.services.user_service import UserService
+from tests.factories import auth_headers, create_organizer, create_user
+
+
+@pytest.mark.parametrize("q", ["", "  ", " a ", "\t\n"])
+def test_blank_query_rejected_before_db(q):
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(UserService.search_users(None, q))
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.mysql
+def test_search_ranking_and_organizer_exclusion(api, mysql_engine):
+    token = "".join(random.choices(string.ascii_lowercase, k=8))
+
+    async def scenario(client):
+        searcher = await create_user(mysql_engine)
+        substring = await create_user(mysql_engine, email=f"budi{token}@example.com", full_name=f"Budi {token}")
+        prefix = await create_user(mysql_engine, email=f"{token}.b@example.com", full_name="Prefix")
+        exact = await create_user(mysql_engine, email=f"{token}@example.com", full_name="Exact")
+        member = await create_user(mysql_engine, email=f"{token}.member@example.com")
+        organizer_id = await create_organizer(mysql_engine, {searcher: Role.ORGANIZER_ADMIN, member: Role.VIEWER})
+        headers = auth_headers(searcher)
+
+        resp = await client.get("/api/v1/user/search", params={"q": f"{token}@example.com"}, headers=headers)
+        assert resp.status_code == 200, resp.text
+        assert resp.json()[0]["id"] == exact
+
+        resp = await client.get("/api/v1/user/search", params={"q": token}, headers=headers)
+        ids = [row["id"] for row in resp.json()]
+        assert set(ids) == {exact, prefix, member, substring}
+        # Prefix (email / nama) di atas substring
+        assert ids.index(substring) == len(ids) - 1
+
+        resp = await client.get(
+            "/api/v1/user/search", params={"q": token, "organizer_id": organizer_id}, headers=headers
+        )
+        assert member not in [row["id"] for row in resp.json()]
+
+        resp = await client.get("/api/v1/user/search", params={"q": "   "}, headers=headers)
+        assert resp.status_code == 400
+
+    api(scenario)
@@ -0,0 +1,206 @@
+import asyncio
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI, HTTPException
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.waiting_room import InMemoryQueueStore, WaitingRoom
+from app.deps import waiting_room as waiting_room_deps
+from app.deps.auth import get_current_user
+from app.deps.db import get_read_db
+from app.models.event import Event, EventVisibility
+from app.models.organizer_member import Role
+from app.models.ticket_type import TicketStatus, TicketType
+from app.services import event_service
+from app.services.event_service import EventService
+from tests.factories import auth_headers, create_organizer, create_user, unique
+
+RATE = 10
+BURST = 5
+HOUR = 3600
+
+
+def _room(idle_ttl_seconds: float = HOUR) -> WaitingRoom:
+    return WaitingRoom(InMemoryQueueStore(idle_ttl_seconds), rate_per_second=RATE, burst=BURST)
+
+
+def _join(room, user_id, opens_at, closes_at=None, event_id=1) -> dict:
+    closes_at = closes_at or time.time() + HOUR
+    return asyncio.run(room.join(event_id, user_id, opens_at, closes_at))
+
+
+def test_burst_then_rate():
+    room = _room()
+    opens_at = 1000.0
+    assert room.admitted_count(opens_at, opens_at - 1) == 0
+    assert room.admitted_count(opens_at, opens_at) == BURST
+    assert room.admitted_count(opens_at, opens_at + 2) == BURST + 2 * RATE
+    assert room.position(BURST - 1, opens_at, opens_at)["admitted"]
+    waiting = room.position(BURST + RATE, opens_at, opens_at)
+    assert not waiting["admitted"]
+    assert waiting["eta_seconds"] == 2
+
+
+def test_rejoin_keeps_seq_and_follows_rescheduled_sale_start():
+    room = _room()
+    first_open = time.time() + 60
+    first = _join(room, user_id=1, opens_at=first_open)
+    _join(room, user_id=2, opens_at=first_open)
+
+    later_open = first_open + 600
+    again = _join(room, user_id=1, opens_at=later_open)
+    status = room.status(again["token"], 1)
+    assert room.decode(again["token"], 1)["seq"] == room.decode(first["token"], 1)["seq"] == 0
+    assert room.decode(again["token"], 1)["opn"] == later_open
+    assert status["eta_seconds"] >= 600
+
+
+def test_join_after_sale_closed_forgets_queue():
+    room = _room()
+    _join(room, user_id=1, opens_at=time.time() - 60)
+    assert asyncio.run(room.store.length(1)) == 1
+
+    with pytest.raises(HTTPException) as exc:
+        _join(room, user_id=2, opens_at=time.time() - 60, closes_at=time.time() - 1)
+    assert exc.value.status_code == 409
+    assert asyncio.run(room.store.length(1)) == 0
+
+
+def test_idle_queue_is_dropped():
+    room = _room(idle_ttl_seconds=0.05)
+    for event_id in range(1, 4):
+        _join(room, user_id=1, opens_at=time.time(), event_id=event_id)
+    time.sleep(0.1)
+    assert all(asyncio.run(room.store.length(event_id)) == 0 for event_id in range(1, 4))
+
+
+def _admit_app(monkeypatch, window: tuple[float, float]) -> FastAPI:
+    """App kecil dengan endpoint checkout palsu yang memakai dependency admission."""
+    async def fake_window(db, event_id):
+        return window
+
+    monkeypatch.setattr(EventService, "get_sale_window", staticmethod(fake_window))
+    app = FastAPI()
+
+    @app.post("/events/{event_id}/checkout")
+    async def checkout(admission: dict = Depends(waiting_room_deps.require_checkout_admission)):
+        return {"seq": admission["seq"]}
+
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1)
+    app.dependency_overrides[get_read_db] = lambda: None
+    return app
+
+
+def _checkout(app, token: str | None) -> httpx.Response:
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            headers = {"X-Queue-Token": token} if token else {}
+            return await client.post("/events/1/checkout", headers=headers)
+
+    return asyncio.run(run())
+
+
+def test_checkout_admission_dependency(monkeypatch):
+    room = _room()
+    monkeypatch.setattr(waiting_room_deps, "waiting_room", room)
+    opens_at = time.time() - 1
+    app = _admit_app(monkeypatch, (opens_at, opens_at + HOUR))
+
+    resp = _checkout(app, None)
+    assert resp.status_code == 403
+
+    admitted = _join(room, user_id=1, opens_at=opens_at)["token"]
+    resp = _checkout(app, admitted)
+    assert resp.status_code == 200
+    assert resp.json() == {"seq": 0}
+
+    other_user = _join(room, user_id=2, opens_at=opens_at)["token"]
+    assert _checkout(app, other_user).status_code == 403
+
+
+def test_checkout_admission_waits_for_turn(monkeypatch):
+    room = _room()
+    monkeypatch.setattr(waiting_room_deps, "waiting_room", room)
+    opens_at = time.time() + 60
+    app = _admit_app(monkeypatch, (opens_at, opens_at + HOUR))
+
+    token = _join(room, user_id=1, opens_at=opens_at)["token"]
+    resp = _checkout(app, token)
+    assert resp.status_code == 403
+    assert int(resp.headers["Retry-After"]) >= 59
+
+
+def test_checkout_admission_rejects_token_from_old_schedule(monkeypatch):
+    room = _room()
+    monkeypatch.setattr(waiting_room_deps, "waiting_room", room)
+    old_open = time.time() - 10
+    token = _join(room, user_id=1, opens_at=old_open)["token"]
+
+    # Penjualan dimundurkan setelah token dibuat
+    app = _admit_app(monkeypatch, (old_open + 600, old_open + HOUR))
+    resp = _checkout(app, token)
+    assert resp.status_code == 409
+
+
+@pytest.mark.mysql
+def test_join_waits_for_ticket_types(api, mysql_engine):
+    sessions = async_sessionmaker(mysql_engine, expire_on_commit=False)
+
+    async def scenario(client):
+        user_id = await create_user(mysql_engine)
+        organizer_id = await create_organizer(mysql_engine, {user_id: Role.ORGANIZER_ADMIN})
+        now = datetime.utcnow().replace(microsecond=0)
+        async with sessions() as db:
+            result = await db.execute(insert(Event).values(
+                organizer_id=organizer_id,
+                created_by=user_id,
+                title="Konser",
+                slug=unique("konser"),
+                start_at=now + timedelta(days=30),
+                end_at=now + timedelta(days=30, hours=4),
+                visibility=EventVisibility.PUBLISHED,
+                is_free=False,
+                currency="IDR",
+                created_at=now,
+                updated_at=now,
+            ))
+            event_id = result.inserted_primary_key[0]
+            await db.commit()
+        headers = auth_headers(user_id)
+
+        resp = await client.post(f"/api/v1/events/{event_id}/queue", headers=headers)
+        assert resp.status_code == 409, resp.text
+
+        sale_start = now + timedelta(hours=1)
+        async with sessions() as db:
+            await db.execute(insert(TicketType).values(
+                event_id=event_id,
+                name="Presale",
+                price=100000,
+                quota=100,
+                sold_count=0,
+                sale_start_at=sale_start,
+                sale_end_at=sale_start + timedelta(days=1),
+                max_per_order=4,
+                inventory_shards=0,
+                status=TicketStatus.ACTIVE,
+                created_at=now,
+                updated_at=now,
+            ))
+            await db.commit()
+
+        resp = await client.post(f"/api/v1/events/{event_id}/queue", headers=headers)
+        assert resp.status_code == 200, resp.text
+        assert not resp.json()["admitted"]
+        assert resp.json()["eta_seconds"] >= 3500
+
+    try:
+        api(scenario)
+    finally:
+        event_service._sale_window_cache.clear()